@@ -17,6 +17,7 @@ import time
 
 from tempest import clients
 from tempest.common.utils import data_utils
+from tempest.common import waiters
 from tempest import config
 from tempest import exceptions
 from tempest.openstack.common import excutils
@@ -114,12 +115,13 @@ class BaseComputeTest(tempest.test.BaseTestCase):
             except Exception:
                 LOG.exception('Deleting server %s failed' % server['id'])
 
-        for server in cls.servers:
-            try:
-                cls.servers_client.wait_for_server_termination(server['id'])
-            except Exception:
-                LOG.exception('Waiting for deletion of server %s failed'
-                              % server['id'])
+        server_ids = [server['id'] for server in cls.servers]
+        try:
+            waiters.wait_for_servers_termination(cls.servers_client,
+                                                 server_ids)
+        except Exception:
+            LOG.exception('Waiting for deletion of servers %s failed'
+                          % ','.join(server_ids))
 
     @classmethod
     def server_check_teardown(cls):
@@ -210,20 +212,20 @@ class BaseComputeTest(tempest.test.BaseTestCase):
             servers = [s for s in b['servers'] if s['name'].startswith(name)]
 
         if 'wait_until' in kwargs:
-            for server in servers:
-                try:
-                    cls.servers_client.wait_for_server_status(
-                        server['id'], kwargs['wait_until'])
-                except Exception:
-                    with excutils.save_and_reraise_exception():
-                        if ('preserve_server_on_error' not in kwargs
-                            or kwargs['preserve_server_on_error'] is False):
-                            for server in servers:
-                                try:
-                                    cls.servers_client.delete_server(
-                                        server['id'])
-                                except Exception:
-                                    pass
+            try:
+                waiters.wait_for_servers_status(
+                    cls.servers_client, [server['id'] for server in servers],
+                    kwargs['wait_until'])
+            except Exception:
+                with excutils.save_and_reraise_exception():
+                    if ('preserve_server_on_error' not in kwargs
+                        or kwargs['preserve_server_on_error'] is False):
+                        for server in servers:
+                            try:
+                                cls.servers_client.delete_server(
+                                    server['id'])
+                            except Exception:
+                                pass
 
         cls.servers.extend(servers)
 
@@ -17,7 +17,11 @@ import abc
 import copy
 import datetime
 import exceptions
+import hashlib
+import json
+import os
 import re
+import threading
 import urlparse
 
 import six
@@ -32,6 +36,109 @@ CONF = config.CONF
 LOG = logging.getLogger(__name__)
 
 
+class TokenCache(object):
+    """
+    Process wide cache of the auth data of keystone auth providers
+
+    Auth data is stored by (auth URL, credentials hash, auth version), so
+    that all the auth providers using the same credentials share the same
+    token and service catalog. When persistent_token_cache is set, auth data
+    is also stored in files under lock_path, so that concurrent test
+    processes on the same host reuse it.
+    """
+
+    def __init__(self):
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _get_path(key):
+        if not CONF.identity.persistent_token_cache:
+            return None
+        file_name = hashlib.sha1("|".join(key)).hexdigest()
+        return os.path.join(CONF.lock_path, 'token_cache', file_name)
+
+    def _read(self, key):
+        path = self._get_path(key)
+        if path is None or not os.path.isfile(path):
+            return None
+        try:
+            with open(path) as cache_file:
+                token, auth_data = json.load(cache_file)
+        except (IOError, ValueError):
+            LOG.warning("Invalid token cache file %s" % path)
+            return None
+        return token, auth_data
+
+    def _write(self, key, auth_data):
+        path = self._get_path(key)
+        if path is None:
+            return
+        cache_dir = os.path.dirname(path)
+        if not os.path.isdir(cache_dir):
+            try:
+                os.makedirs(cache_dir)
+            except OSError:
+                # Created concurrently by another process
+                if not os.path.isdir(cache_dir):
+                    raise
+        # Write then rename, so readers never see a partial file
+        tmp_path = "%s.%s" % (path, os.getpid())
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as cache_file:
+            json.dump(auth_data, cache_file)
+        os.rename(tmp_path, path)
+
+    def _remove(self, key):
+        path = self._get_path(key)
+        if path is not None and os.path.isfile(path):
+            try:
+                os.remove(path)
+            except OSError:
+                # Removed concurrently by another process
+                pass
+
+    def get(self, key):
+        """
+        Returns the cached auth data for key, or None
+        Expiry is not checked, that is up to the auth provider.
+        """
+        auth_data = self._cache.get(key)
+        if auth_data is None:
+            auth_data = self._read(key)
+            if auth_data is not None:
+                with self._lock:
+                    auth_data = self._cache.setdefault(key, auth_data)
+        return auth_data
+
+    def set(self, key, auth_data):
+        with self._lock:
+            self._cache[key] = auth_data
+        self._write(key, auth_data)
+
+    def invalidate(self, key, token):
+        """
+        Drops the auth data for key, if its token is the given one.
+        A token which was already refreshed by another provider is kept.
+        """
+        with self._lock:
+            auth_data = self._cache.get(key)
+            if auth_data is not None and auth_data[0] != token:
+                return
+            self._cache.pop(key, None)
+        auth_data = self._read(key)
+        if auth_data is not None and auth_data[0] == token:
+            self._remove(key)
+
+    def clear(self):
+        """Drops all the auth data cached in memory"""
+        with self._lock:
+            self._cache = {}
+
+
+token_cache = TokenCache()
+
+
 @six.add_metaclass(abc.ABCMeta)
 class AuthProvider(object):
     """
@@ -201,9 +308,51 @@ class KeystoneAuthProvider(AuthProvider):
 
     token_expiry_threshold = datetime.timedelta(seconds=60)
 
+    AUTH_VERSION = None
+
     def __init__(self, credentials, interface=None):
         super(KeystoneAuthProvider, self).__init__(credentials, interface)
         self.auth_client = self._auth_client()
+        self._token_cache_key = None
+        # Base URLs resolved from the catalog, by token and then by filters
+        self._base_urls = {}
+
+    def token_cache_key(self):
+        """
+        Key of the auth data in the shared token cache
+        It is computed once, from the credentials used for the first auth.
+        """
+        if self._token_cache_key is None:
+            params = json.dumps(self._auth_params(), sort_keys=True)
+            self._token_cache_key = (self.auth_client.auth_url,
+                                     hashlib.sha1(params).hexdigest(),
+                                     self.AUTH_VERSION)
+        return self._token_cache_key
+
+    def get_auth(self):
+        """
+        Returns auth from the shared token cache if available, else auth
+        first and store the result in the shared cache
+        """
+        if not CONF.identity.shared_token_cache:
+            return super(KeystoneAuthProvider, self).get_auth()
+        auth_data = token_cache.get(self.token_cache_key())
+        if auth_data is None or self.is_expired(auth_data):
+            self.set_auth()
+        elif auth_data is not self.cache:
+            self.cache = auth_data
+            self._fill_credentials(self.cache[1])
+        return self.cache
+
+    def set_auth(self):
+        super(KeystoneAuthProvider, self).set_auth()
+        if CONF.identity.shared_token_cache:
+            token_cache.set(self.token_cache_key(), self.cache)
+
+    def clear_auth(self):
+        if CONF.identity.shared_token_cache and self.cache is not None:
+            token_cache.invalidate(self.token_cache_key(), self.cache[0])
+        super(KeystoneAuthProvider, self).clear_auth()
 
     def _decorate_request(self, filters, method, url, headers=None, body=None,
                           auth_data=None):
@@ -220,12 +369,46 @@ class KeystoneAuthProvider(AuthProvider):
         else:
             # Join base URL and url, and remove multiple contiguous slashes
             _url = "/".join([base_url, url])
-            parts = [x for x in urlparse.urlparse(_url)]
-            parts[2] = re.sub("/{2,}", "/", parts[2])
-            _url = urlparse.urlunparse(parts)
+            if '//' in _url.partition('://')[2]:
+                parts = [x for x in urlparse.urlparse(_url)]
+                parts[2] = re.sub("/{2,}", "/", parts[2])
+                _url = urlparse.urlunparse(parts)
         # no change to method or body
         return str(_url), _headers, body
 
+    def base_url(self, filters, auth_data=None):
+        """
+        Filters can be:
+        - service: compute, image, etc
+        - region: the service region
+        - endpoint_type: adminURL, publicURL, internalURL
+        - api_version: replace catalog version with this
+        - skip_path: take just the base URL
+
+        The URL is looked up in the catalog once per token and filters.
+        """
+        if auth_data is None:
+            auth_data = self.auth_data
+        token, _auth_data = auth_data
+        key = (filters.get('service'), filters.get('endpoint_type'),
+               filters.get('region'), filters.get('api_version'),
+               filters.get('skip_path'))
+        base_urls = self._base_urls.get(token)
+        if base_urls is None:
+            # A new token may come with a new catalog, drop the old URLs
+            base_urls = {}
+            self._base_urls = {token: base_urls}
+        if key not in base_urls:
+            base_urls[key] = self._get_base_url(filters, _auth_data)
+        return base_urls[key]
+
+    @abc.abstractmethod
+    def _get_base_url(self, filters, auth_data_body):
+        """
+        Extracts the base_url from the catalog based on provided filters
+        """
+        return
+
     @abc.abstractmethod
     def _auth_client(self):
         return
@@ -250,6 +433,7 @@ class KeystoneAuthProvider(AuthProvider):
 class KeystoneV2AuthProvider(KeystoneAuthProvider):
 
     EXPIRY_DATE_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+    AUTH_VERSION = 'v2'
 
     def _auth_client(self):
         return json_id.TokenClientJSON()
@@ -273,18 +457,7 @@ class KeystoneV2AuthProvider(KeystoneAuthProvider):
         if self.credentials.user_id is None:
             self.credentials.user_id = user['id']
 
-    def base_url(self, filters, auth_data=None):
-        """
-        Filters can be:
-        - service: compute, image, etc
-        - region: the service region
-        - endpoint_type: adminURL, publicURL, internalURL
-        - api_version: replace catalog version with this
-        - skip_path: take just the base URL
-        """
-        if auth_data is None:
-            auth_data = self.auth_data
-        token, _auth_data = auth_data
+    def _get_base_url(self, filters, auth_data_body):
         service = filters.get('service')
         region = filters.get('region')
         endpoint_type = filters.get('endpoint_type', 'publicURL')
@@ -293,7 +466,7 @@ class KeystoneV2AuthProvider(KeystoneAuthProvider):
             raise exceptions.EndpointNotFound("No service provided")
 
         _base_url = None
-        for ep in _auth_data['serviceCatalog']:
+        for ep in auth_data_body['serviceCatalog']:
             if ep["type"] == service:
                 for _ep in ep['endpoints']:
                     if region is not None and _ep['region'] == region:
@@ -328,6 +501,7 @@ class KeystoneV2AuthProvider(KeystoneAuthProvider):
 class KeystoneV3AuthProvider(KeystoneAuthProvider):
 
     EXPIRY_DATE_FORMAT = '%Y-%m-%dT%H:%M:%S.%fZ'
+    AUTH_VERSION = 'v3'
 
     def _auth_client(self):
         return json_v3id.V3TokenClientJSON()
@@ -373,18 +547,7 @@ class KeystoneV3AuthProvider(KeystoneAuthProvider):
         if self.credentials.user_domain_name is None:
             self.credentials.user_domain_name = user['domain']['name']
 
-    def base_url(self, filters, auth_data=None):
-        """
-        Filters can be:
-        - service: compute, image, etc
-        - region: the service region
-        - endpoint_type: adminURL, publicURL, internalURL
-        - api_version: replace catalog version with this
-        - skip_path: take just the base URL
-        """
-        if auth_data is None:
-            auth_data = self.auth_data
-        token, _auth_data = auth_data
+    def _get_base_url(self, filters, auth_data_body):
         service = filters.get('service')
         region = filters.get('region')
         endpoint_type = filters.get('endpoint_type', 'public')
@@ -395,7 +558,7 @@ class KeystoneV3AuthProvider(KeystoneAuthProvider):
         if 'URL' in endpoint_type:
             endpoint_type = endpoint_type.replace('URL', '')
         _base_url = None
-        catalog = _auth_data['catalog']
+        catalog = auth_data_body['catalog']
         # Select entries with matching service type
         service_catalog = [ep for ep in catalog if ep['type'] == service]
         if len(service_catalog) > 0:
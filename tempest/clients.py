@@ -133,143 +133,326 @@ class Manager(manager.Manager):
 
     """
     Top level manager for OpenStack tempest clients
+
+    Clients are built on first access. The list of the available clients
+    is in client_attr_names, and instantiated_clients() returns the ones
+    which have been built so far.
     """
 
     def __init__(self, credentials=None, interface='json', service=None):
         # Set interface and client type first
         self.interface = interface
+        self.service = service
         # super cares for credentials validation
         super(Manager, self).__init__(credentials=credentials)
 
-        self._set_compute_clients(self.interface)
-        self._set_identity_clients(self.interface)
-        self._set_volume_clients(self.interface)
-
-        self.baremetal_client = BaremetalClientJSON(self.auth_provider)
-        self.network_client = NetworkClientJSON(self.auth_provider)
-        self.database_flavors_client = DatabaseFlavorsClientJSON(
-            self.auth_provider)
-        self.database_versions_client = DatabaseVersionsClientJSON(
-            self.auth_provider)
-        self.messaging_client = MessagingClientJSON(self.auth_provider)
-        if CONF.service_available.ceilometer:
-            self.telemetry_client = TelemetryClientJSON(
-                self.auth_provider)
-        self.monitoring_client = MonitoringClientJSON(
-                    self.auth_provider)
-        self.negative_client = negative_rest_client.NegativeRestClient(
-            self.auth_provider, service)
-
+    def _ec2_client_args(self):
         # TODO(andreaf) EC2 client still do their auth, v2 only
-        ec2_client_args = (self.credentials.username,
-                           self.credentials.password,
-                           CONF.identity.uri,
-                           self.credentials.tenant_name)
-
-        # common clients
-        self.account_client = AccountClient(self.auth_provider)
-        if CONF.service_available.glance:
-            self.image_client = ImageClientJSON(self.auth_provider)
-            self.image_client_v2 = ImageClientV2JSON(self.auth_provider)
-        self.container_client = ContainerClient(self.auth_provider)
-        self.object_client = ObjectClient(self.auth_provider)
-        self.orchestration_client = OrchestrationClient(
-            self.auth_provider)
-        self.ec2api_client = botoclients.APIClientEC2(*ec2_client_args)
-        self.s3_client = botoclients.ObjectClientS3(*ec2_client_args)
-        self.data_processing_client = DataProcessingClient(
-            self.auth_provider)
-
-    def _set_compute_clients(self, type):
-        self._set_compute_json_clients()
-
-        # Common compute clients
-        self.agents_client = AgentsClientJSON(self.auth_provider)
-        self.networks_client = NetworksClientJSON(self.auth_provider)
-        self.migrations_client = MigrationsClientJSON(self.auth_provider)
-        self.security_group_default_rules_client = (
-            SecurityGroupDefaultRulesClientJSON(self.auth_provider))
-
-    def _set_compute_json_clients(self):
-        self.certificates_client = CertificatesClientJSON(self.auth_provider)
-        self.servers_client = ServersClientJSON(self.auth_provider)
-        self.limits_client = LimitsClientJSON(self.auth_provider)
-        self.images_client = ImagesClientJSON(self.auth_provider)
-        self.keypairs_client = KeyPairsClientJSON(self.auth_provider)
-        self.quotas_client = QuotasClientJSON(self.auth_provider)
-        self.quota_classes_client = QuotaClassesClientJSON(self.auth_provider)
-        self.flavors_client = FlavorsClientJSON(self.auth_provider)
-        self.extensions_client = ExtensionsClientJSON(self.auth_provider)
-        self.volumes_extensions_client = VolumesExtensionsClientJSON(
-            self.auth_provider)
-        self.floating_ips_client = FloatingIPsClientJSON(self.auth_provider)
-        self.security_groups_client = SecurityGroupsClientJSON(
-            self.auth_provider)
-        self.interfaces_client = InterfacesClientJSON(self.auth_provider)
-        self.fixed_ips_client = FixedIPsClientJSON(self.auth_provider)
-        self.availability_zone_client = AvailabilityZoneClientJSON(
-            self.auth_provider)
-        self.aggregates_client = AggregatesClientJSON(self.auth_provider)
-        self.services_client = ServicesClientJSON(self.auth_provider)
-        self.tenant_usages_client = TenantUsagesClientJSON(self.auth_provider)
-        self.hosts_client = HostsClientJSON(self.auth_provider)
-        self.hypervisor_client = HypervisorClientJSON(self.auth_provider)
-        self.instance_usages_audit_log_client = \
-            InstanceUsagesAuditLogClientJSON(self.auth_provider)
-
-    def _set_identity_clients(self, type):
-        self._set_identity_json_clients()
-
-    def _set_identity_json_clients(self):
-        self.identity_client = IdentityClientJSON(self.auth_provider)
-        self.identity_v3_client = IdentityV3ClientJSON(self.auth_provider)
-        self.endpoints_client = EndPointClientJSON(self.auth_provider)
-        self.service_client = ServiceClientJSON(self.auth_provider)
-        self.policy_client = PolicyClientJSON(self.auth_provider)
-        self.region_client = RegionClientJSON(self.auth_provider)
-        self.token_client = TokenClientJSON()
-        if CONF.identity_feature_enabled.api_v3:
-            self.token_v3_client = V3TokenClientJSON()
-        self.credentials_client = CredentialsClientJSON(self.auth_provider)
-
-    def _set_volume_clients(self, type):
-        self._set_volume_json_clients()
-        # Common volume clients
-        # NOTE : As XML clients are not implemented for Qos-specs.
-        # So, setting the qos_client here. Once client are implemented,
-        # qos_client would be moved to its respective if/else.
-        # Bug : 1312553
-        self.volume_qos_client = QosSpecsClientJSON(self.auth_provider)
-        self.volume_qos_v2_client = QosSpecsV2ClientJSON(
-            self.auth_provider)
-        self.volume_services_v2_client = VolumesServicesV2ClientJSON(
-            self.auth_provider)
-
-    def _set_volume_json_clients(self):
-        self.backups_client = BackupsClientJSON(self.auth_provider)
-        self.backups_v2_client = BackupsClientV2JSON(self.auth_provider)
-        self.snapshots_client = SnapshotsClientJSON(self.auth_provider)
-        self.snapshots_v2_client = SnapshotsV2ClientJSON(self.auth_provider)
-        self.volumes_client = VolumesClientJSON(self.auth_provider)
-        self.volumes_v2_client = VolumesV2ClientJSON(self.auth_provider)
-        self.volume_types_client = VolumeTypesClientJSON(self.auth_provider)
-        self.volume_services_client = VolumesServicesClientJSON(
-            self.auth_provider)
-        self.volume_hosts_client = VolumeHostsClientJSON(self.auth_provider)
-        self.volume_hosts_v2_client = VolumeHostsV2ClientJSON(
-            self.auth_provider)
-        self.volume_quotas_client = VolumeQuotasClientJSON(self.auth_provider)
-        self.volume_quotas_v2_client = VolumeQuotasV2Client(self.auth_provider)
-        self.volumes_extension_client = VolumeExtensionClientJSON(
-            self.auth_provider)
-        self.volumes_v2_extension_client = VolumeV2ExtensionClientJSON(
-            self.auth_provider)
-        self.volume_availability_zone_client = \
-            VolumeAvailabilityZoneClientJSON(self.auth_provider)
-        self.volume_v2_availability_zone_client = \
-            VolumeV2AvailabilityZoneClientJSON(self.auth_provider)
-        self.volume_types_v2_client = VolumeTypesV2ClientJSON(
-            self.auth_provider)
+        return (self.credentials.username,
+                self.credentials.password,
+                CONF.identity.uri,
+                self.credentials.tenant_name)
+
+    # Common clients
+
+    @manager.lazy_client
+    def baremetal_client(self):
+        return BaremetalClientJSON(self.auth_provider)
+
+    @manager.lazy_client
+    def network_client(self):
+        return NetworkClientJSON(self.auth_provider)
+
+    @manager.lazy_client
+    def database_flavors_client(self):
+        return DatabaseFlavorsClientJSON(self.auth_provider)
+
+    @manager.lazy_client
+    def database_versions_client(self):
+        return DatabaseVersionsClientJSON(self.auth_provider)
+
+    @manager.lazy_client
+    def messaging_client(self):
+        return MessagingClientJSON(self.auth_provider)
+
+    @manager.lazy_client
+    def telemetry_client(self):
+        if not CONF.service_available.ceilometer:
+            raise AttributeError('Ceilometer is not available')
+        return TelemetryClientJSON(self.auth_provider)
+
+    @manager.lazy_client
+    def monitoring_client(self):
+        return MonitoringClientJSON(self.auth_provider)
+
+    @manager.lazy_client
+    def negative_client(self):
+        return negative_rest_client.NegativeRestClient(
+            self.auth_provider, self.service)
+
+    @manager.lazy_client
+    def account_client(self):
+        return AccountClient(self.auth_provider)
+
+    @manager.lazy_client
+    def image_client(self):
+        if not CONF.service_available.glance:
+            raise AttributeError('Glance is not available')
+        return ImageClientJSON(self.auth_provider)
+
+    @manager.lazy_client
+    def image_client_v2(self):
+        if not CONF.service_available.glance:
+            raise AttributeError('Glance is not available')
+        return ImageClientV2JSON(self.auth_provider)
+
+    @manager.lazy_client
+    def container_client(self):
+        return ContainerClient(self.auth_provider)
+
+    @manager.lazy_client
+    def object_client(self):
+        return ObjectClient(self.auth_provider)
+
+    @manager.lazy_client
+    def orchestration_client(self):
+        return OrchestrationClient(self.auth_provider)
+
+    @manager.lazy_client
+    def ec2api_client(self):
+        return botoclients.APIClientEC2(*self._ec2_client_args())
+
+    @manager.lazy_client
+    def s3_client(self):
+        return botoclients.ObjectClientS3(*self._ec2_client_args())
+
+    @manager.lazy_client
+    def data_processing_client(self):
+        return DataProcessingClient(self.auth_provider)
+
+    # Compute clients
+
+    @manager.lazy_client
+    def agents_client(self):
+        return AgentsClientJSON(self.auth_provider)
+
+    @manager.lazy_client
+    def networks_client(self):
+        return NetworksClientJSON(self.auth_provider)
+
+    @manager.lazy_client
+    def migrations_client(self):
+        return MigrationsClientJSON(self.auth_provider)
+
+    @manager.lazy_client
+    def security_group_default_rules_client(self):
+        return SecurityGroupDefaultRulesClientJSON(self.auth_provider)
+
+    @manager.lazy_client
+    def certificates_client(self):
+        return CertificatesClientJSON(self.auth_provider)
+
+    @manager.lazy_client
+    def servers_client(self):
+        return ServersClientJSON(self.auth_provider)
+
+    @manager.lazy_client
+    def limits_client(self):
+        return LimitsClientJSON(self.auth_provider)
+
+    @manager.lazy_client
+    def images_client(self):
+        return ImagesClientJSON(self.auth_provider)
+
+    @manager.lazy_client
+    def keypairs_client(self):
+        return KeyPairsClientJSON(self.auth_provider)
+
+    @manager.lazy_client
+    def quotas_client(self):
+        return QuotasClientJSON(self.auth_provider)
+
+    @manager.lazy_client
+    def quota_classes_client(self):
+        return QuotaClassesClientJSON(self.auth_provider)
+
+    @manager.lazy_client
+    def flavors_client(self):
+        return FlavorsClientJSON(self.auth_provider)
+
+    @manager.lazy_client
+    def extensions_client(self):
+        return ExtensionsClientJSON(self.auth_provider)
+
+    @manager.lazy_client
+    def volumes_extensions_client(self):
+        return VolumesExtensionsClientJSON(self.auth_provider)
+
+    @manager.lazy_client
+    def floating_ips_client(self):
+        return FloatingIPsClientJSON(self.auth_provider)
+
+    @manager.lazy_client
+    def security_groups_client(self):
+        return SecurityGroupsClientJSON(self.auth_provider)
+
+    @manager.lazy_client
+    def interfaces_client(self):
+        return InterfacesClientJSON(self.auth_provider)
+
+    @manager.lazy_client
+    def fixed_ips_client(self):
+        return FixedIPsClientJSON(self.auth_provider)
+
+    @manager.lazy_client
+    def availability_zone_client(self):
+        return AvailabilityZoneClientJSON(self.auth_provider)
+
+    @manager.lazy_client
+    def aggregates_client(self):
+        return AggregatesClientJSON(self.auth_provider)
+
+    @manager.lazy_client
+    def services_client(self):
+        return ServicesClientJSON(self.auth_provider)
+
+    @manager.lazy_client
+    def tenant_usages_client(self):
+        return TenantUsagesClientJSON(self.auth_provider)
+
+    @manager.lazy_client
+    def hosts_client(self):
+        return HostsClientJSON(self.auth_provider)
+
+    @manager.lazy_client
+    def hypervisor_client(self):
+        return HypervisorClientJSON(self.auth_provider)
+
+    @manager.lazy_client
+    def instance_usages_audit_log_client(self):
+        return InstanceUsagesAuditLogClientJSON(self.auth_provider)
+
+    # Identity clients
+
+    @manager.lazy_client
+    def identity_client(self):
+        return IdentityClientJSON(self.auth_provider)
+
+    @manager.lazy_client
+    def identity_v3_client(self):
+        return IdentityV3ClientJSON(self.auth_provider)
+
+    @manager.lazy_client
+    def endpoints_client(self):
+        return EndPointClientJSON(self.auth_provider)
+
+    @manager.lazy_client
+    def service_client(self):
+        return ServiceClientJSON(self.auth_provider)
+
+    @manager.lazy_client
+    def policy_client(self):
+        return PolicyClientJSON(self.auth_provider)
+
+    @manager.lazy_client
+    def region_client(self):
+        return RegionClientJSON(self.auth_provider)
+
+    @manager.lazy_client
+    def token_client(self):
+        return TokenClientJSON()
+
+    @manager.lazy_client
+    def token_v3_client(self):
+        if not CONF.identity_feature_enabled.api_v3:
+            raise AttributeError('Identity v3 API is not enabled')
+        return V3TokenClientJSON()
+
+    @manager.lazy_client
+    def credentials_client(self):
+        return CredentialsClientJSON(self.auth_provider)
+
+    # Volume clients
+
+    @manager.lazy_client
+    def volume_qos_client(self):
+        return QosSpecsClientJSON(self.auth_provider)
+
+    @manager.lazy_client
+    def volume_qos_v2_client(self):
+        return QosSpecsV2ClientJSON(self.auth_provider)
+
+    @manager.lazy_client
+    def volume_services_v2_client(self):
+        return VolumesServicesV2ClientJSON(self.auth_provider)
+
+    @manager.lazy_client
+    def backups_client(self):
+        return BackupsClientJSON(self.auth_provider)
+
+    @manager.lazy_client
+    def backups_v2_client(self):
+        return BackupsClientV2JSON(self.auth_provider)
+
+    @manager.lazy_client
+    def snapshots_client(self):
+        return SnapshotsClientJSON(self.auth_provider)
+
+    @manager.lazy_client
+    def snapshots_v2_client(self):
+        return SnapshotsV2ClientJSON(self.auth_provider)
+
+    @manager.lazy_client
+    def volumes_client(self):
+        return VolumesClientJSON(self.auth_provider)
+
+    @manager.lazy_client
+    def volumes_v2_client(self):
+        return VolumesV2ClientJSON(self.auth_provider)
+
+    @manager.lazy_client
+    def volume_types_client(self):
+        return VolumeTypesClientJSON(self.auth_provider)
+
+    @manager.lazy_client
+    def volume_services_client(self):
+        return VolumesServicesClientJSON(self.auth_provider)
+
+    @manager.lazy_client
+    def volume_hosts_client(self):
+        return VolumeHostsClientJSON(self.auth_provider)
+
+    @manager.lazy_client
+    def volume_hosts_v2_client(self):
+        return VolumeHostsV2ClientJSON(self.auth_provider)
+
+    @manager.lazy_client
+    def volume_quotas_client(self):
+        return VolumeQuotasClientJSON(self.auth_provider)
+
+    @manager.lazy_client
+    def volume_quotas_v2_client(self):
+        return VolumeQuotasV2Client(self.auth_provider)
+
+    @manager.lazy_client
+    def volumes_extension_client(self):
+        return VolumeExtensionClientJSON(self.auth_provider)
+
+    @manager.lazy_client
+    def volumes_v2_extension_client(self):
+        return VolumeV2ExtensionClientJSON(self.auth_provider)
+
+    @manager.lazy_client
+    def volume_availability_zone_client(self):
+        return VolumeAvailabilityZoneClientJSON(self.auth_provider)
+
+    @manager.lazy_client
+    def volume_v2_availability_zone_client(self):
+        return VolumeV2AvailabilityZoneClientJSON(self.auth_provider)
+
+    @manager.lazy_client
+    def volume_types_v2_client(self):
+        return VolumeTypesV2ClientJSON(self.auth_provider)
 
 
 class AdminManager(Manager):
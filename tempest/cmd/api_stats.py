@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Report the latency of the API requests made during a tempest run.
+
+Set **api_stats_dir** in the **[debug]** section of tempest.conf to have
+every test worker dump the statistics of the requests it made in that
+directory when it exits, then run::
+
+    tempest-api-stats <api_stats_dir>
+
+to print the count, error count and p50/p95/p99 latencies of each API of
+each service, merged across all the workers. Dumps of different runs can be
+merged with **--output** and compared to find the APIs which regressed.
+"""
+
+import argparse
+import os
+import sys
+
+from tempest.common import api_stats
+
+SORT_KEYS = {
+    'api': lambda key, stats: key,
+    'count': lambda key, stats: -stats.count,
+    'p50': lambda key, stats: -stats.percentiles()[50],
+    'p95': lambda key, stats: -stats.percentiles()[95],
+    'p99': lambda key, stats: -stats.percentiles()[99],
+}
+
+
+def load_stats(paths):
+    """Merge the stats dumped in the given files or directories."""
+    collector = api_stats.ApiStatsCollector()
+    for path in paths:
+        if os.path.isdir(path):
+            files = [os.path.join(path, f) for f in sorted(os.listdir(path))
+                     if f.endswith('.json')]
+        else:
+            files = [path]
+        for stats_file in files:
+            collector.merge(api_stats.ApiStatsCollector.load(stats_file))
+    return collector
+
+
+def format_report(collector, sort='api'):
+    rows = sorted(collector.stats.items(),
+                  key=lambda item: SORT_KEYS[sort](*item))
+    lines = ['%-12s %-7s %-60s %7s %6s %8s %8s %8s' % (
+        'Service', 'Method', 'API', 'Count', 'Errors', 'p50', 'p95', 'p99')]
+    for (service, method, url), stats in rows:
+        errors = sum(count for status, count in stats.statuses.items()
+                     if int(status) >= 400)
+        percentiles = stats.percentiles()
+        lines.append('%-12s %-7s %-60s %7d %6d %8.3f %8.3f %8.3f' % (
+            service, method, url, stats.count, errors,
+            percentiles[50], percentiles[95], percentiles[99]))
+    return '\n'.join(lines)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Report the latency of the API requests made by tempest')
+    parser.add_argument('paths', nargs='+',
+                        help="Stats files, or directories containing them, "
+                             "as dumped in the [debug] api_stats_dir")
+    parser.add_argument('--sort', choices=sorted(SORT_KEYS), default='api',
+                        help="Sort the APIs by name (default) or by "
+                             "decreasing count or latency")
+    parser.add_argument('-o', '--output',
+                        help="Also write the merged stats to this file")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    collector = load_stats(args.paths)
+    if args.output:
+        collector.dump(args.output)
+    print(format_report(collector, args.sort))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -33,6 +33,16 @@ that will be removed (tenants, users, flavors and images).  Once
 cleanup is executed in normal mode, running it again with **--dry-run**
 should yield an empty report.
 
+**--diff**: Only considers the resources created since the saved state was
+initialized, as far as the APIs report when resources were created. Servers
+are listed with nova's changes-since filter. It can be combined with
+**--dry-run** to only report the new resources.
+
+**Resuming**: The services already processed, per tenant, by an interrupted
+**--init-saved-state** or normal mode run are recorded in
+./cleanup_journal.json. Running the same mode again resumes where it
+stopped. The journal is removed once a run completes.
+
 **NOTE**: The _tenants_to_clean array in dry-run.json lists the
 tenants that cleanup will loop through and delete child objects, not
 delete the tenant itself. This may differ from the tenants array as you
@@ -52,26 +62,95 @@ Please run with **--help** to see full list of options.
 """
 import argparse
 import json
+import os
 import sys
+import threading
 
 from tempest import auth
 from tempest import clients
 from tempest.cmd import cleanup_service
+from tempest.common.utils import misc
 from tempest import config
 from tempest.openstack.common import log as logging
+from tempest.openstack.common import timeutils
 
 SAVED_STATE_JSON = "saved_state.json"
 DRY_RUN_JSON = "dry_run.json"
+JOURNAL_JSON = "cleanup_journal.json"
+# Scope of the journal entries of the global services
+GLOBAL_SCOPE = "_global"
 LOG = logging.getLogger(__name__)
 CONF = config.CONF
 
 
+class Journal(object):
+    """Records the services run so far, to resume an interrupted run.
+
+    The services are recorded per scope, a tenant id or GLOBAL_SCOPE, with
+    the ids of the resources they deleted, and so are the tenants the admin
+    role was added to. For --init-saved-state, the state saved so far is
+    recorded as well.
+    """
+
+    def __init__(self, path, mode):
+        self.path = path
+        self._lock = threading.Lock()
+        self.data = {'mode': mode, 'done': {}, 'saved_state': {}}
+        self.resumed = False
+        if os.path.exists(path):
+            try:
+                with open(path) as f:
+                    data = json.load(f)
+            except (IOError, ValueError) as ex:
+                LOG.warning("Ignoring unreadable journal %s: %s" % (path, ex))
+            else:
+                if data.get('mode') == mode:
+                    LOG.info("Resuming interrupted %s from %s" % (mode, path))
+                    self.data = data
+                    self.resumed = True
+
+    @property
+    def saved_state(self):
+        return self.data['saved_state']
+
+    def is_done(self, scope, service):
+        return service.__name__ in self.data['done'].get(scope, {})
+
+    @property
+    def admin_role_added(self):
+        return self.data.setdefault('admin_role_added', [])
+
+    def add_admin_role(self, tenant_id):
+        with self._lock:
+            self.admin_role_added.append(tenant_id)
+            self._write()
+
+    def mark_done(self, scope, service, resource_ids=None):
+        with self._lock:
+            done = self.data['done'].setdefault(scope, {})
+            done[service.__name__] = resource_ids or []
+            self._write()
+
+    def _write(self):
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.data, f)
+        os.rename(tmp_path, self.path)
+
+    def remove(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
 class Cleanup(object):
 
     def __init__(self):
         self.admin_mgr = clients.AdminManager()
         self.dry_run_data = {}
         self.json_data = {}
+        self.journal = None
+        self.since = None
+        self.inventory = None
         self._init_options()
 
         self.admin_id = ""
@@ -103,6 +182,11 @@ class Cleanup(object):
         if is_dry_run:
             self.dry_run_data["_tenants_to_clean"] = {}
             f = open(DRY_RUN_JSON, 'w+')
+        else:
+            self.journal = Journal(JOURNAL_JSON, 'cleanup')
+            # the admin role added by an interrupted run is still to remove
+            self.admin_role_added = list(self.journal.admin_role_added)
+        self.since = self._get_since() if self.options.diff else None
 
         admin_mgr = self.admin_mgr
         # Always cleanup tempest and alt tempest tenants unless
@@ -115,20 +199,24 @@ class Cleanup(object):
         tenant_service = cleanup_service.TenantService(admin_mgr, **kwargs)
         tenants = tenant_service.list()
         LOG.debug("Process %s tenants" % len(tenants))
+        if cleanup_service.IS_NEUTRON and len(tenants) > 1:
+            # list the network resources once rather than once per tenant
+            self.inventory = cleanup_service.Inventory(
+                admin_mgr.network_client, self.options.page_size)
 
-        # Loop through list of tenants and clean them up.
-        for tenant in tenants:
-            self._add_admin(tenant['id'])
-            self._clean_tenant(tenant)
+        # Clean up the tenants, several of them at once.
+        misc.run_concurrently(self._clean_tenant, tenants,
+                              self.options.workers)
 
         kwargs = {'data': self.dry_run_data,
                   'is_dry_run': is_dry_run,
                   'saved_state_json': self.json_data,
                   'is_preserve': is_preserve,
-                  'is_save_state': is_save_state}
-        for service in self.global_services:
-            svc = service(admin_mgr, **kwargs)
-            svc.run()
+                  'is_save_state': is_save_state,
+                  'workers': self.options.workers,
+                  'since': self.since}
+        self._run_services(self.global_services, admin_mgr, kwargs,
+                           GLOBAL_SCOPE)
 
         if is_dry_run:
             f.write(json.dumps(self.dry_run_data, sort_keys=True,
@@ -136,6 +224,8 @@ class Cleanup(object):
             f.close()
 
         self._remove_admin_user_roles()
+        if self.journal:
+            self.journal.remove()
 
     def _remove_admin_user_roles(self):
         tenant_ids = self.admin_role_added
@@ -144,7 +234,43 @@ class Cleanup(object):
         for tenant_id in tenant_ids:
             self._remove_admin_role(tenant_id)
 
+    def _get_since(self):
+        saved_at = self.json_data.get('_saved_at')
+        if not saved_at:
+            msg = ("%s doesn't record when it was initialized, run cleanup "
+                   "with --init-saved-state again to use --diff"
+                   % SAVED_STATE_JSON)
+            LOG.error(msg)
+            sys.exit(msg)
+        return timeutils.normalize_time(timeutils.parse_isotime(saved_at))
+
+    def _run_services(self, services, mgr, kwargs, scope, workers=None):
+        """Runs the services, up to workers or --workers of them at once
+        when they don't depend on each other. See
+        cleanup_service.CLEANUP_DEPENDENCIES.
+
+        The services already run in scope by an interrupted run are skipped.
+        """
+        journal = self.journal
+
+        def _run(svc):
+            svc.run()
+            if journal:
+                journal.mark_done(scope, type(svc),
+                                  getattr(svc, 'deleted_ids', None))
+
+        for level in cleanup_service.get_cleanup_levels(services):
+            svcs = [service(mgr, **kwargs) for service in level
+                    if not (journal and journal.is_done(scope, service))]
+            misc.run_concurrently(_run, svcs,
+                                  workers or self.options.workers)
+
     def _clean_tenant(self, tenant):
+        if self.journal and all(self.journal.is_done(tenant['id'], service)
+                                for service in self.tenant_services):
+            LOG.debug("Tenant %s already cleaned up" % tenant['name'])
+            return
+        self._add_admin(tenant['id'])
         LOG.debug("Cleaning tenant:  %s " % tenant['name'])
         is_dry_run = self.options.dry_run
         dry_run_data = self.dry_run_data
@@ -165,10 +291,12 @@ class Cleanup(object):
                   'saved_state_json': None,
                   'is_preserve': is_preserve,
                   'is_save_state': False,
-                  'tenant_id': tenant_id}
-        for service in self.tenant_services:
-            svc = service(mgr, **kwargs)
-            svc.run()
+                  'tenant_id': tenant_id,
+                  'workers': self.options.workers,
+                  'since': self.since,
+                  'inventory': self.inventory,
+                  'page_size': self.options.page_size}
+        self._run_services(self.tenant_services, mgr, kwargs, tenant_id)
 
     def _init_admin_ids(self):
         id_cl = self.admin_mgr.identity_client
@@ -210,6 +338,22 @@ class Cleanup(object):
                             ", that reports the objects that would have "
                             "been deleted had a full cleanup been run.")
 
+        parser.add_argument('--diff', action="store_true",
+                            dest='diff', default=False,
+                            help="Only consider the resources created since "
+                            "the saved state was initialized, as far as the "
+                            "APIs tell when resources were created.")
+        parser.add_argument('--workers', type=int, default=8,
+                            help="Maximum number of tenants, of services "
+                            "of a tenant, and of resources of a given type, "
+                            "being cleaned up concurrently. Defaults to 8, "
+                            "1 cleans up everything sequentially.")
+        parser.add_argument('--page-size', type=int, default=500,
+                            dest='page_size',
+                            help="Number of network resources requested "
+                            "per list call, when neutron paginates. "
+                            "Defaults to 500, 0 lists everything at once.")
+
         self.options = parser.parse_args()
 
     def _add_admin(self, tenant_id):
@@ -222,6 +366,8 @@ class Cleanup(object):
                 LOG.debug("User already had admin privilege for this tenant")
         if needs_role:
             LOG.debug("Adding admin priviledge for : %s" % tenant_id)
+            if self.journal:
+                self.journal.add_admin_role(tenant_id)
             id_cl.assign_user_role(tenant_id, self.admin_id,
                                    self.admin_role_id)
             self.admin_role_added.append(tenant_id)
@@ -251,21 +397,26 @@ class Cleanup(object):
 
     def _init_state(self):
         LOG.debug("Initializing saved state.")
-        data = {}
+        self.journal = Journal(JOURNAL_JSON, 'init_saved_state')
+        # The state saved by an interrupted run is kept, with its time
+        data = self.journal.saved_state
+        data.setdefault('_saved_at', timeutils.isotime())
         admin_mgr = self.admin_mgr
         kwargs = {'data': data,
                   'is_dry_run': False,
                   'saved_state_json': data,
                   'is_preserve': False,
                   'is_save_state': True}
-        for service in self.global_services:
-            svc = service(admin_mgr, **kwargs)
-            svc.run()
+        # The services fill data in while the journal is written, so they
+        # run one at a time
+        self._run_services(self.global_services, admin_mgr, kwargs,
+                           GLOBAL_SCOPE, workers=1)
 
         f = open(SAVED_STATE_JSON, 'w+')
         f.write(json.dumps(data,
                            sort_keys=True, indent=2, separators=(',', ': ')))
         f.close()
+        self.journal.remove()
 
     def _load_json(self):
         try:
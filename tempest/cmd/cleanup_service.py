@@ -14,9 +14,14 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import threading
+
 from tempest import clients
+from tempest.common.utils import misc
+from tempest.common import waiters
 from tempest import config
 from tempest.openstack.common import log as logging
+from tempest.openstack.common import timeutils
 from tempest import test
 
 LOG = logging.getLogger(__name__)
@@ -85,40 +90,134 @@ def _get_priv_net_id(prv_net_name, tenant_name):
     net_cl = am.network_client
     id_cl = am.identity_client
 
-    networks = net_cl.list_networks()
     tenant = id_cl.get_tenant_by_name(tenant_name)
-    t_id = tenant['id']
-    n_id = None
-    for net in networks['networks']:
-        if (net['tenant_id'] == t_id and net['name'] == prv_net_name):
-            n_id = net['id']
-            break
-    return n_id
+    networks = net_cl.list_networks(tenant_id=tenant['id'],
+                                    name=prv_net_name)['networks']
+    return networks[0]['id'] if networks else None
+
+
+def list_pages(list_func, key, page_size=None, **filters):
+    """Yields the resources listed by a neutron lister, page by page.
+
+    Each page of up to page_size resources is requested with the id of the
+    last resource of the previous page as marker. A single request is made
+    without page_size, or when the API doesn't paginate.
+    """
+    if not page_size:
+        for resource in list_func(**filters)[key]:
+            yield resource
+        return
+
+    seen = set()
+    while True:
+        page = list_func(limit=page_size, **filters)[key]
+        new = [resource for resource in page if resource['id'] not in seen]
+        for resource in new:
+            seen.add(resource['id'])
+            yield resource
+        # the limit is ignored when pagination is disabled in neutron
+        if len(page) != page_size or not new:
+            return
+        filters['marker'] = page[-1]['id']
+
+
+class Inventory(object):
+    """Resources of all the tenants, grouped by tenant.
+
+    Each type of resource is listed once, with an admin client, the first
+    time the resources of a tenant are asked for.
+    """
+
+    def __init__(self, client, page_size=None):
+        self.client = client
+        self.page_size = page_size
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self._resources = {}
+
+    def get(self, key, tenant_id):
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            if key not in self._resources:
+                by_tenant = {}
+                for resource in list_pages(
+                        getattr(self.client, 'list_' + key), key,
+                        self.page_size):
+                    by_tenant.setdefault(resource.get('tenant_id'),
+                                         []).append(resource)
+                LOG.debug("Inventory of %s: %d tenants" %
+                          (key, len(by_tenant)))
+                self._resources[key] = by_tenant
+        return list(self._resources[key].get(tenant_id, []))
 
 
 class BaseService(object):
+    # Maximum number of resources deleted concurrently
+    workers = 1
+    # Only the resources created since this (naive UTC) datetime are to be
+    # cleaned up, when set
+    since = None
+    # Whether delete waits for the resources to be actually gone, because
+    # the deletion of the resources of other services depends on it
+    wait_deleted = False
+
     def __init__(self, kwargs):
         self.client = None
         for key, value in kwargs.items():
             setattr(self, key, value)
 
-    def _filter_by_tenant_id(self, item_list):
-        if (item_list is None
-                or len(item_list) == 0
-                or not hasattr(self, 'tenant_id')
-                or self.tenant_id is None
-                or 'tenant_id' not in item_list[0]):
-            return item_list
-
-        return [item for item in item_list
-                if item['tenant_id'] == self.tenant_id]
-
     def list(self):
         pass
 
+    def list_to_clean(self):
+        """Lists the resources to clean up.
+
+        When since is set, the resources known to be created before it are
+        left out, from their created_at or created attribute.
+        """
+        resources = self.list()
+        if self.since is None or not resources:
+            return resources
+        return [resource for resource in resources
+                if not self._created_before_since(resource)]
+
+    def _created_before_since(self, resource):
+        created = None
+        if isinstance(resource, dict):
+            created = resource.get('created_at') or resource.get('created')
+        if not created:
+            return False
+        try:
+            created = timeutils.normalize_time(
+                timeutils.parse_isotime(created))
+        except ValueError:
+            return False
+        return created < self.since
+
     def delete(self):
+        resources = self.list_to_clean()
+        self.deleted_ids = [resource.get('id') for resource in resources or []
+                            if isinstance(resource, dict)]
+        misc.run_concurrently(self.delete_resource, resources, self.workers)
+        if self.wait_deleted and resources:
+            self.wait_for_deletion(resources)
+
+    def delete_resource(self, resource):
         pass
 
+    def wait_for_deletion(self, resources):
+        """Waits for the resources to be gone, with one list per interval."""
+        try:
+            waiters.wait_for_resources(
+                self.client, [resource['id'] for resource in resources],
+                lambda: dict((resource['id'], resource)
+                             for resource in self.list()),
+                lambda resource_id, resource: resource is None,
+                'Deletion')
+        except Exception as e:
+            LOG.exception("Wait for deletion exception: %s" % e)
+
     def dry_run(self):
         pass
 
@@ -135,6 +234,7 @@ class BaseService(object):
 
 
 class SnapshotService(BaseService):
+    wait_deleted = True
 
     def __init__(self, manager, **kwargs):
         super(SnapshotService, self).__init__(kwargs)
@@ -146,49 +246,56 @@ class SnapshotService(BaseService):
         LOG.debug("List count, %s Snapshots" % len(snaps))
         return snaps
 
-    def delete(self):
-        snaps = self.list()
+    def delete_resource(self, snap):
         client = self.client
-        for snap in snaps:
-            try:
-                client.delete_snapshot(snap['id'])
-            except Exception as e:
-                LOG.exception("Delete Snapshot exception: %s" % e)
-                pass
+        try:
+            client.delete_snapshot(snap['id'])
+        except Exception as e:
+            LOG.exception("Delete Snapshot exception: %s" % e)
+            pass
 
     def dry_run(self):
-        snaps = self.list()
+        snaps = self.list_to_clean()
         self.data['snapshots'] = snaps
 
 
 class ServerService(BaseService):
+    wait_deleted = True
+
     def __init__(self, manager, **kwargs):
         super(ServerService, self).__init__(kwargs)
         self.client = manager.servers_client
 
     def list(self):
         client = self.client
-        _, servers_body = client.list_servers()
+        if self.since is None:
+            _, servers_body = client.list_servers()
+        else:
+            # let nova only return the servers changed since then
+            _, servers_body = client.list_servers_with_detail(
+                {'changes-since': timeutils.isotime(self.since)})
+            servers_body['servers'] = [
+                server for server in servers_body['servers']
+                if server['status'] != 'DELETED']
         servers = servers_body['servers']
         LOG.debug("List count, %s Servers" % len(servers))
         return servers
 
-    def delete(self):
+    def delete_resource(self, server):
         client = self.client
-        servers = self.list()
-        for server in servers:
-            try:
-                client.delete_server(server['id'])
-            except Exception as e:
-                LOG.exception("Delete Server exception: %s" % e)
-                pass
+        try:
+            client.delete_server(server['id'])
+        except Exception as e:
+            LOG.exception("Delete Server exception: %s" % e)
+            pass
 
     def dry_run(self):
-        servers = self.list()
+        servers = self.list_to_clean()
         self.data['servers'] = servers
 
 
 class ServerGroupService(ServerService):
+    wait_deleted = False
 
     def list(self):
         client = self.client
@@ -196,18 +303,16 @@ class ServerGroupService(ServerService):
         LOG.debug("List count, %s Server Groups" % len(sgs))
         return sgs
 
-    def delete(self):
+    def delete_resource(self, sg):
         client = self.client
-        sgs = self.list()
-        for sg in sgs:
-            try:
-                client.delete_server_group(sg['id'])
-            except Exception as e:
-                LOG.exception("Delete Server Group exception: %s" % e)
-                pass
+        try:
+            client.delete_server_group(sg['id'])
+        except Exception as e:
+            LOG.exception("Delete Server Group exception: %s" % e)
+            pass
 
     def dry_run(self):
-        sgs = self.list()
+        sgs = self.list_to_clean()
         self.data['server_groups'] = sgs
 
 
@@ -222,18 +327,16 @@ class StackService(BaseService):
         LOG.debug("List count, %s Stacks" % len(stacks))
         return stacks
 
-    def delete(self):
+    def delete_resource(self, stack):
         client = self.client
-        stacks = self.list()
-        for stack in stacks:
-            try:
-                client.delete_stack(stack['id'])
-            except Exception as e:
-                LOG.exception("Delete Stack exception: %s " % e)
-                pass
+        try:
+            client.delete_stack(stack['id'])
+        except Exception as e:
+            LOG.exception("Delete Stack exception: %s " % e)
+            pass
 
     def dry_run(self):
-        stacks = self.list()
+        stacks = self.list_to_clean()
         self.data['stacks'] = stacks
 
 
@@ -248,19 +351,17 @@ class KeyPairService(BaseService):
         LOG.debug("List count, %s Keypairs" % len(keypairs))
         return keypairs
 
-    def delete(self):
+    def delete_resource(self, k):
         client = self.client
-        keypairs = self.list()
-        for k in keypairs:
-            try:
-                name = k['keypair']['name']
-                client.delete_keypair(name)
-            except Exception as e:
-                LOG.exception("Delete Keypairs exception: %s" % e)
-                pass
+        try:
+            name = k['keypair']['name']
+            client.delete_keypair(name)
+        except Exception as e:
+            LOG.exception("Delete Keypairs exception: %s" % e)
+            pass
 
     def dry_run(self):
-        keypairs = self.list()
+        keypairs = self.list_to_clean()
         self.data['keypairs'] = keypairs
 
 
@@ -276,17 +377,15 @@ class SecurityGroupService(BaseService):
         LOG.debug("List count, %s Security Groups" % len(secgrp_del))
         return secgrp_del
 
-    def delete(self):
+    def delete_resource(self, g):
         client = self.client
-        secgrp_del = self.list()
-        for g in secgrp_del:
-            try:
-                client.delete_security_group(g['id'])
-            except Exception as e:
-                LOG.exception("Delete Security Groups exception: %s" % e)
+        try:
+            client.delete_security_group(g['id'])
+        except Exception as e:
+            LOG.exception("Delete Security Groups exception: %s" % e)
 
     def dry_run(self):
-        secgrp_del = self.list()
+        secgrp_del = self.list_to_clean()
         self.data['security_groups'] = secgrp_del
 
 
@@ -301,18 +400,16 @@ class FloatingIpService(BaseService):
         LOG.debug("List count, %s Floating IPs" % len(floating_ips))
         return floating_ips
 
-    def delete(self):
+    def delete_resource(self, f):
         client = self.client
-        floating_ips = self.list()
-        for f in floating_ips:
-            try:
-                client.delete_floating_ip(f['id'])
-            except Exception as e:
-                LOG.exception("Delete Floating IPs exception: %s" % e)
-                pass
+        try:
+            client.delete_floating_ip(f['id'])
+        except Exception as e:
+            LOG.exception("Delete Floating IPs exception: %s" % e)
+            pass
 
     def dry_run(self):
-        floating_ips = self.list()
+        floating_ips = self.list_to_clean()
         self.data['floating_ips'] = floating_ips
 
 
@@ -327,27 +424,43 @@ class VolumeService(BaseService):
         LOG.debug("List count, %s Volumes" % len(vols))
         return vols
 
-    def delete(self):
+    def delete_resource(self, v):
         client = self.client
-        vols = self.list()
-        for v in vols:
-            try:
-                client.delete_volume(v['id'])
-            except Exception as e:
-                LOG.exception("Delete Volume exception: %s" % e)
-                pass
+        try:
+            client.delete_volume(v['id'])
+        except Exception as e:
+            LOG.exception("Delete Volume exception: %s" % e)
+            pass
 
     def dry_run(self):
-        vols = self.list()
+        vols = self.list_to_clean()
         self.data['volumes'] = vols
 
 
 # Begin network service classes
 class NetworkService(BaseService):
+    # Inventory of the resources of all the tenants, when cleaning many
+    inventory = None
+    # Whether the resources are taken from the inventory, if any
+    use_inventory = True
+    # Number of resources per list request
+    page_size = None
+
     def __init__(self, manager, **kwargs):
         super(NetworkService, self).__init__(kwargs)
         self.client = manager.network_client
 
+    def _list(self, key):
+        """Lists the resources of the tenant named key in the API."""
+        tenant_id = getattr(self, 'tenant_id', None)
+        if tenant_id is None:
+            return list(list_pages(getattr(self.client, 'list_' + key), key,
+                                   self.page_size))
+        if self.inventory is not None and self.use_inventory:
+            return self.inventory.get(key, tenant_id)
+        return list(list_pages(getattr(self.client, 'list_' + key), key,
+                               self.page_size, tenant_id=tenant_id))
+
     def _filter_by_conf_networks(self, item_list):
         if not item_list or not all(('network_id' in i for i in item_list)):
             return item_list
@@ -356,188 +469,151 @@ class NetworkService(BaseService):
                 not in CONF_NETWORKS]
 
     def list(self):
-        client = self.client
-        networks = client.list_networks()
-        networks = self._filter_by_tenant_id(networks['networks'])
+        networks = self._list('networks')
         # filter out networks declared in tempest.conf
         if self.is_preserve:
             networks = [network for network in networks
                         if network['id'] not in CONF_NETWORKS]
-        LOG.debug("List count, %s Networks" % networks)
+        LOG.debug("List count, %s Networks" % len(networks))
         return networks
 
-    def delete(self):
+    def delete_resource(self, n):
         client = self.client
-        networks = self.list()
-        for n in networks:
-            try:
-                client.delete_network(n['id'])
-            except Exception as e:
-                LOG.exception("Delete Network exception: %s" % e)
-                pass
+        try:
+            client.delete_network(n['id'])
+        except Exception as e:
+            LOG.exception("Delete Network exception: %s" % e)
+            pass
 
     def dry_run(self):
-        networks = self.list()
+        networks = self.list_to_clean()
         self.data['networks'] = networks
 
 
 class NetworkIpSecPolicyService(NetworkService):
 
     def list(self):
-        client = self.client
-        ipsecpols = client.list_ipsecpolicies()
-        ipsecpols = ipsecpols['ipsecpolicies']
-        ipsecpols = self._filter_by_tenant_id(ipsecpols)
+        ipsecpols = self._list('ipsecpolicies')
         LOG.debug("List count, %s IP Security Policies" % len(ipsecpols))
         return ipsecpols
 
-    def delete(self):
+    def delete_resource(self, ipsecpol):
         client = self.client
-        ipsecpols = self.list()
-        for ipsecpol in ipsecpols:
-            try:
-                client.delete_ipsecpolicy(ipsecpol['id'])
-            except Exception as e:
-                LOG.exception("Delete IP Securty Policy exception: %s" % e)
-                pass
+        try:
+            client.delete_ipsecpolicy(ipsecpol['id'])
+        except Exception as e:
+            LOG.exception("Delete IP Securty Policy exception: %s" % e)
+            pass
 
     def dry_run(self):
-        ipsecpols = self.list()
+        ipsecpols = self.list_to_clean()
         self.data['ip_security_policies'] = ipsecpols
 
 
 class NetworkFwPolicyService(NetworkService):
 
     def list(self):
-        client = self.client
-        fwpols = client.list_firewall_policies()
-        fwpols = fwpols['firewall_policies']
-        fwpols = self._filter_by_tenant_id(fwpols)
+        fwpols = self._list('firewall_policies')
         LOG.debug("List count, %s Firewall Policies" % len(fwpols))
         return fwpols
 
-    def delete(self):
+    def delete_resource(self, fwpol):
         client = self.client
-        fwpols = self.list()
-        for fwpol in fwpols:
-            try:
-                client.delete_firewall_policy(fwpol['id'])
-            except Exception as e:
-                LOG.exception("Delete Firewall Policy exception: %s" % e)
-                pass
+        try:
+            client.delete_firewall_policy(fwpol['id'])
+        except Exception as e:
+            LOG.exception("Delete Firewall Policy exception: %s" % e)
+            pass
 
     def dry_run(self):
-        fwpols = self.list()
+        fwpols = self.list_to_clean()
         self.data['firewall_policies'] = fwpols
 
 
 class NetworkFwRulesService(NetworkService):
 
     def list(self):
-        client = self.client
-        fwrules = client.list_firewall_rules()
-        fwrules = fwrules['firewall_rules']
-        fwrules = self._filter_by_tenant_id(fwrules)
+        fwrules = self._list('firewall_rules')
         LOG.debug("List count, %s Firewall Rules" % len(fwrules))
         return fwrules
 
-    def delete(self):
+    def delete_resource(self, fwrule):
         client = self.client
-        fwrules = self.list()
-        for fwrule in fwrules:
-            try:
-                client.delete_firewall_rule(fwrule['id'])
-            except Exception as e:
-                LOG.exception("Delete Firewall Rule exception: %s" % e)
-                pass
+        try:
+            client.delete_firewall_rule(fwrule['id'])
+        except Exception as e:
+            LOG.exception("Delete Firewall Rule exception: %s" % e)
+            pass
 
     def dry_run(self):
-        fwrules = self.list()
+        fwrules = self.list_to_clean()
         self.data['firewall_rules'] = fwrules
 
 
 class NetworkIkePolicyService(NetworkService):
 
     def list(self):
-        client = self.client
-        ikepols = client.list_ikepolicies()
-        ikepols = ikepols['ikepolicies']
-        ikepols = self._filter_by_tenant_id(ikepols)
+        ikepols = self._list('ikepolicies')
         LOG.debug("List count, %s IKE Policies" % len(ikepols))
         return ikepols
 
-    def delete(self):
+    def delete_resource(self, ikepol):
         client = self.client
-        ikepols = self.list()
-        for ikepol in ikepols:
-            try:
-                client.delete_firewall_rule(ikepol['id'])
-            except Exception as e:
-                LOG.exception("Delete IKE Policy exception: %s" % e)
-                pass
+        try:
+            client.delete_firewall_rule(ikepol['id'])
+        except Exception as e:
+            LOG.exception("Delete IKE Policy exception: %s" % e)
+            pass
 
     def dry_run(self):
-        ikepols = self.list()
+        ikepols = self.list_to_clean()
         self.data['ike_policies'] = ikepols
 
 
 class NetworkVpnServiceService(NetworkService):
 
     def list(self):
-        client = self.client
-        vpnsrvs = client.list_vpnservices()
-        vpnsrvs = vpnsrvs['vpnservices']
-        vpnsrvs = self._filter_by_tenant_id(vpnsrvs)
+        vpnsrvs = self._list('vpnservices')
         LOG.debug("List count, %s VPN Services" % len(vpnsrvs))
         return vpnsrvs
 
-    def delete(self):
+    def delete_resource(self, vpnsrv):
         client = self.client
-        vpnsrvs = self.list()
-        for vpnsrv in vpnsrvs:
-            try:
-                client.delete_vpnservice(vpnsrv['id'])
-            except Exception as e:
-                LOG.exception("Delete VPN Service exception: %s" % e)
-                pass
+        try:
+            client.delete_vpnservice(vpnsrv['id'])
+        except Exception as e:
+            LOG.exception("Delete VPN Service exception: %s" % e)
+            pass
 
     def dry_run(self):
-        vpnsrvs = self.list()
+        vpnsrvs = self.list_to_clean()
         self.data['vpn_services'] = vpnsrvs
 
 
 class NetworkFloatingIpService(NetworkService):
 
     def list(self):
-        client = self.client
-        flips = client.list_floatingips()
-        flips = flips['floatingips']
-        flips = self._filter_by_tenant_id(flips)
+        flips = self._list('floatingips')
         LOG.debug("List count, %s Network Floating IPs" % len(flips))
         return flips
 
-    def delete(self):
+    def delete_resource(self, flip):
         client = self.client
-        flips = self.list()
-        for flip in flips:
-            try:
-                client.delete_floatingip(flip['id'])
-            except Exception as e:
-                LOG.exception("Delete Network Floating IP exception: %s" % e)
-                pass
+        try:
+            client.delete_floatingip(flip['id'])
+        except Exception as e:
+            LOG.exception("Delete Network Floating IP exception: %s" % e)
+            pass
 
     def dry_run(self):
-        flips = self.list()
+        flips = self.list_to_clean()
         self.data['floating_ips'] = flips
 
 
 class NetworkRouterService(NetworkService):
 
     def list(self):
-        client = self.client
-        routers = client.list_routers()
-        routers = routers['routers']
-        routers = self._filter_by_tenant_id(routers)
+        routers = self._list('routers')
         if self.is_preserve:
             routers = [router for router in routers
                        if router['id'] != CONF_PUB_ROUTER]
@@ -545,228 +621,189 @@ class NetworkRouterService(NetworkService):
         LOG.debug("List count, %s Routers" % len(routers))
         return routers
 
-    def delete(self):
+    def delete_resource(self, router):
         client = self.client
-        routers = self.list()
-        for router in routers:
-            try:
-                rid = router['id']
-                ports = client.list_router_interfaces(rid)
-                ports = ports['ports']
-                for port in ports:
-                    subid = port['fixed_ips'][0]['subnet_id']
-                    client.remove_router_interface_with_subnet_id(rid, subid)
-                client.delete_router(rid)
-            except Exception as e:
-                LOG.exception("Delete Router exception: %s" % e)
-                pass
+        try:
+            rid = router['id']
+            ports = client.list_router_interfaces(rid)
+            ports = ports['ports']
+            for port in ports:
+                subid = port['fixed_ips'][0]['subnet_id']
+                client.remove_router_interface_with_subnet_id(rid, subid)
+            client.delete_router(rid)
+        except Exception as e:
+            LOG.exception("Delete Router exception: %s" % e)
+            pass
 
     def dry_run(self):
-        routers = self.list()
+        routers = self.list_to_clean()
         self.data['routers'] = routers
 
 
 class NetworkHealthMonitorService(NetworkService):
 
     def list(self):
-        client = self.client
-        hms = client.list_health_monitors()
-        hms = hms['health_monitors']
-        hms = self._filter_by_tenant_id(hms)
+        hms = self._list('health_monitors')
         LOG.debug("List count, %s Health Monitors" % len(hms))
         return hms
 
-    def delete(self):
+    def delete_resource(self, hm):
         client = self.client
-        hms = self.list()
-        for hm in hms:
-            try:
-                client.delete_health_monitor(hm['id'])
-            except Exception as e:
-                LOG.exception("Delete Health Monitor exception: %s" % e)
-                pass
+        try:
+            client.delete_health_monitor(hm['id'])
+        except Exception as e:
+            LOG.exception("Delete Health Monitor exception: %s" % e)
+            pass
 
     def dry_run(self):
-        hms = self.list()
+        hms = self.list_to_clean()
         self.data['health_monitors'] = hms
 
 
 class NetworkMemberService(NetworkService):
 
     def list(self):
-        client = self.client
-        members = client.list_members()
-        members = members['members']
-        members = self._filter_by_tenant_id(members)
+        members = self._list('members')
         LOG.debug("List count, %s Members" % len(members))
         return members
 
-    def delete(self):
+    def delete_resource(self, member):
         client = self.client
-        members = self.list()
-        for member in members:
-            try:
-                client.delete_member(member['id'])
-            except Exception as e:
-                LOG.exception("Delete Member exception: %s" % e)
-                pass
+        try:
+            client.delete_member(member['id'])
+        except Exception as e:
+            LOG.exception("Delete Member exception: %s" % e)
+            pass
 
     def dry_run(self):
-        members = self.list()
+        members = self.list_to_clean()
         self.data['members'] = members
 
 
 class NetworkVipService(NetworkService):
 
     def list(self):
-        client = self.client
-        vips = client.list_vips()
-        vips = vips['vips']
-        vips = self._filter_by_tenant_id(vips)
+        vips = self._list('vips')
         LOG.debug("List count, %s VIPs" % len(vips))
         return vips
 
-    def delete(self):
+    def delete_resource(self, vip):
         client = self.client
-        vips = self.list()
-        for vip in vips:
-            try:
-                client.delete_vip(vip['id'])
-            except Exception as e:
-                LOG.exception("Delete VIP exception: %s" % e)
-                pass
+        try:
+            client.delete_vip(vip['id'])
+        except Exception as e:
+            LOG.exception("Delete VIP exception: %s" % e)
+            pass
 
     def dry_run(self):
-        vips = self.list()
+        vips = self.list_to_clean()
         self.data['vips'] = vips
 
 
 class NetworkPoolService(NetworkService):
 
     def list(self):
-        client = self.client
-        pools = client.list_pools()
-        pools = pools['pools']
-        pools = self._filter_by_tenant_id(pools)
+        pools = self._list('pools')
         LOG.debug("List count, %s Pools" % len(pools))
         return pools
 
-    def delete(self):
+    def delete_resource(self, pool):
         client = self.client
-        pools = self.list()
-        for pool in pools:
-            try:
-                client.delete_pool(pool['id'])
-            except Exception as e:
-                LOG.exception("Delete Pool exception: %s" % e)
-                pass
+        try:
+            client.delete_pool(pool['id'])
+        except Exception as e:
+            LOG.exception("Delete Pool exception: %s" % e)
+            pass
 
     def dry_run(self):
-        pools = self.list()
+        pools = self.list_to_clean()
         self.data['pools'] = pools
 
 
 class NetworMeteringLabelRuleService(NetworkService):
 
     def list(self):
-        client = self.client
-        rules = client.list_metering_label_rules()
-        rules = rules['metering_label_rules']
-        rules = self._filter_by_tenant_id(rules)
+        rules = self._list('metering_label_rules')
         LOG.debug("List count, %s Metering Label Rules" % len(rules))
         return rules
 
-    def delete(self):
+    def delete_resource(self, rule):
         client = self.client
-        rules = self.list()
-        for rule in rules:
-            try:
-                client.delete_metering_label_rule(rule['id'])
-            except Exception as e:
-                LOG.exception("Delete Metering Label Rule exception: %s" % e)
-                pass
+        try:
+            client.delete_metering_label_rule(rule['id'])
+        except Exception as e:
+            LOG.exception("Delete Metering Label Rule exception: %s" % e)
+            pass
 
     def dry_run(self):
-        rules = self.list()
+        rules = self.list_to_clean()
         self.data['rules'] = rules
 
 
 class NetworMeteringLabelService(NetworkService):
 
     def list(self):
-        client = self.client
-        labels = client.list_metering_labels()
-        labels = labels['metering_labels']
-        labels = self._filter_by_tenant_id(labels)
+        labels = self._list('metering_labels')
         LOG.debug("List count, %s Metering Labels" % len(labels))
         return labels
 
-    def delete(self):
+    def delete_resource(self, label):
         client = self.client
-        labels = self.list()
-        for label in labels:
-            try:
-                client.delete_metering_label(label['id'])
-            except Exception as e:
-                LOG.exception("Delete Metering Label exception: %s" % e)
-                pass
+        try:
+            client.delete_metering_label(label['id'])
+        except Exception as e:
+            LOG.exception("Delete Metering Label exception: %s" % e)
+            pass
 
     def dry_run(self):
-        labels = self.list()
+        labels = self.list_to_clean()
         self.data['labels'] = labels
 
 
 class NetworkPortService(NetworkService):
+    # ports are also deleted along with servers and router interfaces, so
+    # they are listed when the other resources are gone
+    use_inventory = False
 
     def list(self):
-        client = self.client
-        ports = client.list_ports()
-        ports = ports['ports']
-        ports = self._filter_by_tenant_id(ports)
+        ports = self._list('ports')
         if self.is_preserve:
             ports = self._filter_by_conf_networks(ports)
         LOG.debug("List count, %s Ports" % len(ports))
         return ports
 
-    def delete(self):
+    def delete_resource(self, port):
         client = self.client
-        ports = self.list()
-        for port in ports:
-            try:
-                client.delete_port(port['id'])
-            except Exception as e:
-                LOG.exception("Delete Port exception: %s" % e)
-                pass
+        try:
+            client.delete_port(port['id'])
+        except Exception as e:
+            LOG.exception("Delete Port exception: %s" % e)
+            pass
 
     def dry_run(self):
-        ports = self.list()
+        ports = self.list_to_clean()
         self.data['ports'] = ports
 
 
 class NetworkSubnetService(NetworkService):
 
     def list(self):
-        client = self.client
-        subnets = client.list_subnets()
-        subnets = subnets['subnets']
-        subnets = self._filter_by_tenant_id(subnets)
+        subnets = self._list('subnets')
         if self.is_preserve:
             subnets = self._filter_by_conf_networks(subnets)
         LOG.debug("List count, %s Subnets" % len(subnets))
         return subnets
 
-    def delete(self):
+    def delete_resource(self, subnet):
         client = self.client
-        subnets = self.list()
-        for subnet in subnets:
-            try:
-                client.delete_subnet(subnet['id'])
-            except Exception as e:
-                LOG.exception("Delete Subnet exception: %s" % e)
-                pass
+        try:
+            client.delete_subnet(subnet['id'])
+        except Exception as e:
+            LOG.exception("Delete Subnet exception: %s" % e)
+            pass
 
     def dry_run(self):
-        subnets = self.list()
+        subnets = self.list_to_clean()
         self.data['subnets'] = subnets
 
 
@@ -782,18 +819,16 @@ class TelemetryAlarmService(BaseService):
         LOG.debug("List count, %s Alarms" % len(alarms))
         return alarms
 
-    def delete(self):
+    def delete_resource(self, alarm):
         client = self.client
-        alarms = self.list()
-        for alarm in alarms:
-            try:
-                client.delete_alarm(alarm['id'])
-            except Exception as e:
-                LOG.exception("Delete Alarms exception: %s" % e)
-                pass
+        try:
+            client.delete_alarm(alarm['id'])
+        except Exception as e:
+            LOG.exception("Delete Alarms exception: %s" % e)
+            pass
 
     def dry_run(self):
-        alarms = self.list()
+        alarms = self.list_to_clean()
         self.data['alarms'] = alarms
 
 
@@ -817,18 +852,16 @@ class FlavorService(BaseService):
         LOG.debug("List count, %s Flavors after reconcile" % len(flavors))
         return flavors
 
-    def delete(self):
+    def delete_resource(self, flavor):
         client = self.client
-        flavors = self.list()
-        for flavor in flavors:
-            try:
-                client.delete_flavor(flavor['id'])
-            except Exception as e:
-                LOG.exception("Delete Flavor exception: %s" % e)
-                pass
+        try:
+            client.delete_flavor(flavor['id'])
+        except Exception as e:
+            LOG.exception("Delete Flavor exception: %s" % e)
+            pass
 
     def dry_run(self):
-        flavors = self.list()
+        flavors = self.list_to_clean()
         self.data['flavors'] = flavors
 
     def save_state(self):
@@ -855,18 +888,16 @@ class ImageService(BaseService):
         LOG.debug("List count, %s Images after reconcile" % len(images))
         return images
 
-    def delete(self):
+    def delete_resource(self, image):
         client = self.client
-        images = self.list()
-        for image in images:
-            try:
-                client.delete_image(image['id'])
-            except Exception as e:
-                LOG.exception("Delete Image exception: %s" % e)
-                pass
+        try:
+            client.delete_image(image['id'])
+        except Exception as e:
+            LOG.exception("Delete Image exception: %s" % e)
+            pass
 
     def dry_run(self):
-        images = self.list()
+        images = self.list_to_clean()
         self.data['images'] = images
 
     def save_state(self):
@@ -903,18 +934,16 @@ class UserService(IdentityService):
         LOG.debug("List count, %s Users after reconcile" % len(users))
         return users
 
-    def delete(self):
+    def delete_resource(self, user):
         client = self.client
-        users = self.list()
-        for user in users:
-            try:
-                client.delete_user(user['id'])
-            except Exception as e:
-                LOG.exception("Delete User exception: %s" % e)
-                pass
+        try:
+            client.delete_user(user['id'])
+        except Exception as e:
+            LOG.exception("Delete User exception: %s" % e)
+            pass
 
     def dry_run(self):
-        users = self.list()
+        users = self.list_to_clean()
         self.data['users'] = users
 
     def save_state(self):
@@ -942,18 +971,16 @@ class RoleService(IdentityService):
             LOG.exception("Cannot retrieve Roles, exception: %s" % ex)
             return []
 
-    def delete(self):
+    def delete_resource(self, role):
         client = self.client
-        roles = self.list()
-        for role in roles:
-            try:
-                client.delete_role(role['id'])
-            except Exception as e:
-                LOG.exception("Delete Role exception: %s" % e)
-                pass
+        try:
+            client.delete_role(role['id'])
+        except Exception as e:
+            LOG.exception("Delete Role exception: %s" % e)
+            pass
 
     def dry_run(self):
-        roles = self.list()
+        roles = self.list_to_clean()
         self.data['roles'] = roles
 
     def save_state(self):
@@ -980,18 +1007,16 @@ class TenantService(IdentityService):
         LOG.debug("List count, %s Tenants after reconcile" % len(tenants))
         return tenants
 
-    def delete(self):
+    def delete_resource(self, tenant):
         client = self.client
-        tenants = self.list()
-        for tenant in tenants:
-            try:
-                client.delete_tenant(tenant['id'])
-            except Exception as e:
-                LOG.exception("Delete Tenant exception: %s" % e)
-                pass
+        try:
+            client.delete_tenant(tenant['id'])
+        except Exception as e:
+            LOG.exception("Delete Tenant exception: %s" % e)
+            pass
 
     def dry_run(self):
-        tenants = self.list()
+        tenants = self.list_to_clean()
         self.data['tenants'] = tenants
 
     def save_state(self):
@@ -1017,19 +1042,17 @@ class DomainService(BaseService):
         LOG.debug("List count, %s Domains after reconcile" % len(domains))
         return domains
 
-    def delete(self):
+    def delete_resource(self, domain):
         client = self.client
-        domains = self.list()
-        for domain in domains:
-            try:
-                client.update_domain(domain['id'], enabled=False)
-                client.delete_domain(domain['id'])
-            except Exception as e:
-                LOG.exception("Delete Domain exception: %s" % e)
-                pass
+        try:
+            client.update_domain(domain['id'], enabled=False)
+            client.delete_domain(domain['id'])
+        except Exception as e:
+            LOG.exception("Delete Domain exception: %s" % e)
+            pass
 
     def dry_run(self):
-        domains = self.list()
+        domains = self.list_to_clean()
         self.data['domains'] = domains
 
     def save_state(self):
@@ -1039,6 +1062,57 @@ class DomainService(BaseService):
             domain_data[domain['id']] = domain['name']
 
 
+# The services which resources must be deleted before the ones of a service
+CLEANUP_DEPENDENCIES = {
+    SecurityGroupService: (ServerService,),
+    ServerGroupService: (ServerService,),
+    NetworkIpSecPolicyService: (NetworkVpnServiceService,),
+    NetworkIkePolicyService: (NetworkVpnServiceService,),
+    NetworkFwRulesService: (NetworkFwPolicyService,),
+    NetworkPoolService: (NetworkHealthMonitorService, NetworkMemberService,
+                         NetworkVipService),
+    NetworMeteringLabelService: (NetworMeteringLabelRuleService,),
+    NetworkRouterService: (NetworkVpnServiceService, ServerService,
+                           NetworkFloatingIpService),
+    NetworkPortService: (ServerService, NetworkVipService,
+                         NetworkRouterService, NetworkFloatingIpService),
+    NetworkSubnetService: (NetworkVpnServiceService, NetworkPoolService,
+                           NetworkRouterService, NetworkPortService),
+    NetworkService: (NetworkSubnetService, NetworkPortService),
+    VolumeService: (ServerService, SnapshotService),
+    DomainService: (UserService, TenantService),
+}
+
+# The services cleaned up in a level of their own, before all the others:
+# the stacks delete their own servers, networks and volumes
+CLEANUP_FIRST = (StackService,)
+
+
+def get_cleanup_levels(services):
+    """Groups services in levels which can be cleaned concurrently.
+
+    The services of a level only depend on the services of the previous
+    levels, as per CLEANUP_DEPENDENCIES, and the services of CLEANUP_FIRST
+    are alone in the first level. The order of the services is kept within
+    a level.
+    """
+    first = [service for service in services if service in CLEANUP_FIRST]
+    levels = [first] if first else []
+    done = set(first)
+    remaining = [service for service in services if service not in done]
+    while remaining:
+        level = [service for service in remaining
+                 if all(dependency in done or dependency not in services
+                        for dependency in
+                        CLEANUP_DEPENDENCIES.get(service, ()))]
+        # a dependency loop would otherwise never end, break it in order
+        level = level or remaining[:1]
+        levels.append(level)
+        done.update(level)
+        remaining = [service for service in remaining if service not in done]
+    return levels
+
+
 def get_tenant_cleanup_services():
     tenant_services = []
 
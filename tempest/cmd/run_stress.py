@@ -79,7 +79,8 @@ parser.add_argument('-s', '--serial', action='store_true',
 parser.add_argument('-S', '--stop', action='store_true',
                     default=False, help="Stop on first error")
 parser.add_argument('-n', '--number', type=int,
-                    help="How often an action is executed for each process")
+                    help="How often an action is executed for each process, "
+                         "or each greenthread with green concurrency")
 group = parser.add_mutually_exclusive_group(required=True)
 group.add_argument('-a', '--all', action='store_true',
                    help="Execute all stress tests")
@@ -90,6 +91,10 @@ parser.add_argument('-i', '--call-inherited', action='store_true',
                     help="Call also inherited function with stress attribute")
 group.add_argument('-t', "--tests", nargs='?',
                    help="Name of the file with test description")
+parser.add_argument('-r', '--rate', type=float,
+                    help="Number of runs started per second for each "
+                    "action without a rate or a profile in its "
+                    "description, rather than running them back to back")
 
 
 def main():
@@ -100,6 +105,10 @@ def main():
     else:
         tests = discover_stress_tests(filter_attr=ns.type,
                                       call_inherited=ns.call_inherited)
+    if ns.rate is not None:
+        for test in tests:
+            if 'rate' not in test and 'profile' not in test:
+                test['rate'] = ns.rate
 
     if ns.serial:
         # Duration is total time
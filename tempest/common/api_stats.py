@@ -0,0 +1,275 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Per API latency statistics of the requests made by the rest clients.
+
+When [debug] api_stats_dir is set, every request made by a RestClient is
+recorded in a process wide collector, which is dumped as JSON in that
+directory when the process exits. The dumps of all the test workers can then
+be merged and reported with tempest-api-stats.
+"""
+
+import atexit
+import json
+import math
+import os
+import re
+import threading
+import urlparse
+
+from tempest import config
+from tempest.openstack.common import log as logging
+
+CONF = config.CONF
+LOG = logging.getLogger(__name__)
+
+# Path segments which are resource ids rather than part of the API
+ID_RE = re.compile(r'^([0-9a-fA-F-]{32,36}|\d+|req-[0-9a-fA-F-]{36})$')
+# Swift account segment, the reseller prefix followed by the project id.
+# The segments after it are the container then the object name.
+ACCOUNT_RE = re.compile(r'^[A-Za-z]+_[0-9a-fA-F-]{32,36}$')
+
+PERCENTILES = (50, 95, 99)
+
+# Upper bound of the first latency bucket, in seconds, and ratio between the
+# bounds of consecutive buckets: the percentiles are at most 5% too high.
+BUCKET_MIN = 0.001
+BUCKET_GROWTH = 1.05
+
+
+def url_template(url):
+    """Return the path of url with the resource ids replaced by {id}, and
+    the Swift account, container and object names by {account}, {container}
+    and {object}.
+    """
+    segments = urlparse.urlparse(url).path.split('/')
+    template = []
+    for index, segment in enumerate(segments):
+        if ACCOUNT_RE.match(segment):
+            template.append('{account}')
+            if ''.join(segments[index + 1:index + 2]):
+                template.append('{container}')
+            # object names may contain slashes
+            if ''.join(segments[index + 2:]):
+                template.append('{object}')
+            break
+        template.append('{id}' if ID_RE.match(segment) else segment)
+    return '/'.join(template)
+
+
+def percentile(sorted_values, percent):
+    """Nearest rank percentile of an already sorted list of values."""
+    if not sorted_values:
+        return None
+    rank = int(math.ceil(percent / 100.0 * len(sorted_values))) - 1
+    return sorted_values[max(0, min(rank, len(sorted_values) - 1))]
+
+
+class LatencyHistogram(object):
+    """Count of latencies in fixed, logarithmically sized buckets.
+
+    The memory used does not grow with the number of latencies added, and
+    the percentiles are the upper bound of the bucket they fall in, capped
+    by the largest latency added.
+    """
+
+    def __init__(self):
+        # bucket index -> count
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = None
+
+    @staticmethod
+    def bucket(secs):
+        if secs <= BUCKET_MIN:
+            return 0
+        return int(math.ceil(math.log(secs / BUCKET_MIN) /
+                             math.log(BUCKET_GROWTH)))
+
+    @staticmethod
+    def upper_bound(bucket):
+        return BUCKET_MIN * BUCKET_GROWTH ** bucket
+
+    def add(self, secs):
+        bucket = self.bucket(secs)
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += secs
+        self.max = secs if self.max is None else max(self.max, secs)
+
+    def merge(self, other):
+        for bucket, count in other.buckets.items():
+            self.buckets[bucket] = self.buckets.get(bucket, 0) + count
+        self.count += other.count
+        self.total += other.total
+        if self.max is None or other.max > self.max:
+            self.max = other.max
+
+    def percentile(self, percent):
+        """Nearest rank percentile of the latencies added."""
+        if not self.count:
+            return None
+        rank = max(1, int(math.ceil(percent / 100.0 * self.count)))
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min(self.upper_bound(bucket), self.max)
+
+    def to_dict(self):
+        return {'buckets': dict((str(bucket), count)
+                                for bucket, count in self.buckets.items()),
+                'count': self.count,
+                'total': self.total,
+                'max': self.max}
+
+    @classmethod
+    def from_dict(cls, data):
+        histogram = cls()
+        histogram.buckets = dict((int(bucket), count)
+                                 for bucket, count in data['buckets'].items())
+        histogram.count = data['count']
+        histogram.total = data['total']
+        histogram.max = data['max']
+        return histogram
+
+
+class ApiStats(object):
+    """Latency histogram of the requests made to a single API."""
+
+    def __init__(self):
+        self.latencies = LatencyHistogram()
+        self.statuses = {}
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.retries = 0
+
+    @property
+    def count(self):
+        return self.latencies.count
+
+    def add(self, status, secs, request_bytes=0, response_bytes=0, retry=0):
+        self.latencies.add(secs)
+        status = str(status)
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        self.request_bytes += request_bytes
+        self.response_bytes += response_bytes
+        if retry:
+            self.retries += 1
+
+    def merge(self, other):
+        self.latencies.merge(other.latencies)
+        for status, count in other.statuses.items():
+            self.statuses[status] = self.statuses.get(status, 0) + count
+        self.request_bytes += other.request_bytes
+        self.response_bytes += other.response_bytes
+        self.retries += other.retries
+
+    def percentiles(self):
+        return dict((p, self.latencies.percentile(p)) for p in PERCENTILES)
+
+    def to_dict(self):
+        return {'latencies': self.latencies.to_dict(),
+                'statuses': self.statuses,
+                'request_bytes': self.request_bytes,
+                'response_bytes': self.response_bytes,
+                'retries': self.retries}
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls()
+        stats.latencies = LatencyHistogram.from_dict(data['latencies'])
+        stats.statuses = dict(data['statuses'])
+        stats.request_bytes = data['request_bytes']
+        stats.response_bytes = data['response_bytes']
+        stats.retries = data['retries']
+        return stats
+
+
+class ApiStatsCollector(object):
+    """Thread safe collector of ApiStats per (service, method, url)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stats = {}
+
+    def record(self, service, method, url, status, secs, request_bytes=0,
+               response_bytes=0, retry=0):
+        key = (service or '', method, url_template(url))
+        with self._lock:
+            stats = self.stats.get(key)
+            if stats is None:
+                stats = self.stats[key] = ApiStats()
+            stats.add(status, secs, request_bytes, response_bytes, retry)
+
+    def merge(self, other):
+        with self._lock:
+            for key, stats in other.stats.items():
+                self.stats.setdefault(key, ApiStats()).merge(stats)
+
+    def to_dict(self):
+        with self._lock:
+            return [{'service': service, 'method': method, 'url': url,
+                     'stats': stats.to_dict()}
+                    for (service, method, url), stats in self.stats.items()]
+
+    @classmethod
+    def from_dict(cls, data):
+        collector = cls()
+        for api in data:
+            key = (api['service'], api['method'], api['url'])
+            collector.stats[key] = ApiStats.from_dict(api['stats'])
+        return collector
+
+    def dump(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+
+_collector = None
+_collector_lock = threading.Lock()
+
+
+def set_collector(collector):
+    """Replace the collector which the rest clients report to."""
+    global _collector
+    _collector = collector
+
+
+def get_collector():
+    """Return the process wide collector, None if stats are not enabled."""
+    global _collector
+    if _collector is None and CONF.debug.api_stats_dir:
+        with _collector_lock:
+            if _collector is None:
+                _collector = ApiStatsCollector()
+                atexit.register(_dump_collector, _collector,
+                                CONF.debug.api_stats_dir)
+    return _collector
+
+
+def _dump_collector(collector, stats_dir):
+    if not collector.stats:
+        return
+    path = os.path.join(stats_dir, 'api-stats-%d.json' % os.getpid())
+    try:
+        if not os.path.isdir(stats_dir):
+            os.makedirs(stats_dir)
+        collector.dump(path)
+    except (IOError, OSError) as e:
+        LOG.warning("Unable to dump the API stats to %s: %s" % (path, e))
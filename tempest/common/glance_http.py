@@ -106,11 +106,8 @@ class HTTPClient(object):
                 for header, value in kwargs['headers'].items():
                     conn.putheader(header, value)
                 conn.endheaders()
-                chunk = kwargs['body'].read(CHUNKSIZE)
-                # Chunk it, baby...
-                while chunk:
-                    conn.send('%x\r\n%s\r\n' % (len(chunk), chunk))
-                    chunk = kwargs['body'].read(CHUNKSIZE)
+                for chunk in _iter_chunks(kwargs['body']):
+                    conn.send(chunk)
                 conn.send('0\r\n\r\n')
             else:
                 conn.request(method, conn_url, **kwargs)
@@ -124,14 +121,12 @@ class HTTPClient(object):
                        {'endpoint': self.endpoint, 'e': e})
             raise exc.TimeoutException(message)
 
-        body_iter = ResponseBodyIterator(resp)
         # Read body into string if it isn't obviously image data
         if resp.getheader('content-type', None) != 'application/octet-stream':
-            body_str = ''.join([body_chunk for body_chunk in body_iter])
-            body_iter = StringIO.StringIO(body_str)
-            self._log_response(resp, None)
+            body_iter = StringIO.StringIO(resp.read())
         else:
-            self._log_response(resp, body_iter)
+            body_iter = ResponseBodyIterator(resp)
+        self._log_response(resp, None)
 
         return resp, body_iter
 
@@ -202,6 +197,53 @@ class HTTPClient(object):
         return self._http_request(req_url, method, **kwargs)
 
 
+# room for the size line of a chunk
+CHUNK_HEADER_SIZE = 18
+
+
+def _iter_chunks(body):
+    """Yields the chunks of the chunked transfer encoding of the file-like
+    body, as views of one buffer reused for all the chunks.
+
+    The data is read into the buffer between the size line and the end of
+    the chunk, with readinto when body has it, so the chunks are neither
+    formatted nor concatenated.
+    """
+    buf = bytearray(CHUNK_HEADER_SIZE + CHUNKSIZE + 2)
+    view = memoryview(buf)
+    data = view[CHUNK_HEADER_SIZE:CHUNK_HEADER_SIZE + CHUNKSIZE]
+    readinto = getattr(body, 'readinto', None)
+    while True:
+        if readinto is not None:
+            size = readinto(data)
+        else:
+            chunk = body.read(CHUNKSIZE)
+            size = len(chunk)
+            data[:size] = chunk
+        if not size:
+            return
+        header = '%x\r\n' % size
+        start = CHUNK_HEADER_SIZE - len(header)
+        end = CHUNK_HEADER_SIZE + size
+        view[start:CHUNK_HEADER_SIZE] = header
+        view[end:end + 2] = '\r\n'
+        yield view[start:end + 2]
+
+
+def write_body(body_iter, dest):
+    """Writes the chunks of a response body to the file-like dest.
+
+    :returns: the size and the md5 checksum of the body.
+    """
+    checksum = hashlib.md5()
+    size = 0
+    for chunk in body_iter:
+        checksum.update(chunk)
+        dest.write(chunk)
+        size += len(chunk)
+    return size, checksum.hexdigest()
+
+
 class OpenSSLConnectionDelegator(object):
     """
     An OpenSSL.SSL.Connection delegator.
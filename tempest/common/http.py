@@ -14,6 +14,10 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import threading
+import time
+import urlparse
+
 import httplib2
 
 
@@ -23,3 +27,122 @@ class ClosingHttp(httplib2.Http):
         new_headers = dict(original_headers, connection='close')
         new_kwargs = dict(kwargs, headers=new_headers)
         return super(ClosingHttp, self).request(*args, **new_kwargs)
+
+
+class KeepAliveHttp(object):
+    """Thread safe pool of persistent HTTP connections.
+
+    httplib2.Http objects keep their connections open between requests,
+    but they are not safe to share between threads. This class keeps a
+    bounded list of idle httplib2.Http objects per endpoint (scheme and
+    network location) and hands one out for the duration of each request.
+    Connections idle for longer than idle_timeout are closed instead of
+    being reused, and connections returned to a full pool are closed.
+
+    The request() signature is the same as httplib2.Http.request, so this
+    can be used anywhere a ClosingHttp object is expected.
+    """
+
+    def __init__(self, pool_size=10, idle_timeout=60, **kwargs):
+        """
+        :param pool_size: max number of idle connections kept per endpoint
+        :param idle_timeout: seconds after which an idle connection is closed
+        :param kwargs: passed as-is to httplib2.Http
+        """
+        self.pool_size = pool_size
+        self.idle_timeout = idle_timeout
+        self._http_kwargs = kwargs
+        self._pools = {}
+        self._lock = threading.Lock()
+
+    def _new_http(self):
+        return httplib2.Http(**self._http_kwargs)
+
+    @staticmethod
+    def _get_endpoint(uri):
+        parts = urlparse.urlsplit(uri)
+        return parts.scheme.lower(), parts.netloc.lower()
+
+    @staticmethod
+    def _close_http(http_obj):
+        for conn in http_obj.connections.values():
+            conn.close()
+        http_obj.connections.clear()
+
+    def _acquire(self, endpoint):
+        now = time.time()
+        stale = []
+        http_obj = None
+        with self._lock:
+            idle = self._pools.get(endpoint, [])
+            while idle:
+                candidate, last_used = idle.pop()
+                if now - last_used < self.idle_timeout:
+                    http_obj = candidate
+                    break
+                stale.append(candidate)
+        for candidate in stale:
+            self._close_http(candidate)
+        if http_obj is None:
+            http_obj = self._new_http()
+        return http_obj
+
+    def _release(self, endpoint, http_obj):
+        with self._lock:
+            idle = self._pools.setdefault(endpoint, [])
+            if len(idle) < self.pool_size:
+                idle.append((http_obj, time.time()))
+                return
+        self._close_http(http_obj)
+
+    def request(self, uri, *args, **kwargs):
+        endpoint = self._get_endpoint(uri)
+        http_obj = self._acquire(endpoint)
+        try:
+            resp, body = http_obj.request(uri, *args, **kwargs)
+        except Exception:
+            # Do not put back a connection in an unknown state
+            self._close_http(http_obj)
+            raise
+        self._release(endpoint, http_obj)
+        return resp, body
+
+    def evict_idle(self):
+        """Close all the connections idle for longer than idle_timeout."""
+        now = time.time()
+        stale = []
+        with self._lock:
+            for endpoint, idle in self._pools.items():
+                fresh = [(h, t) for h, t in idle
+                         if now - t < self.idle_timeout]
+                stale.extend(h for h, t in idle
+                             if now - t >= self.idle_timeout)
+                self._pools[endpoint] = fresh
+        for http_obj in stale:
+            self._close_http(http_obj)
+
+    def close(self):
+        """Close all the idle connections in the pool."""
+        with self._lock:
+            pools = self._pools
+            self._pools = {}
+        for idle in pools.values():
+            for http_obj, _ in idle:
+                self._close_http(http_obj)
+
+
+def get_http_obj(disable_ssl_certificate_validation=False, ca_certs=None,
+                 keepalive=True, pool_size=10, idle_timeout=60):
+    """Build the HTTP transport used by the rest clients
+
+    :param keepalive: if False, a new connection is opened for each request
+    """
+    if keepalive:
+        return KeepAliveHttp(
+            pool_size=pool_size, idle_timeout=idle_timeout,
+            disable_ssl_certificate_validation=(
+                disable_ssl_certificate_validation),
+            ca_certs=ca_certs)
+    return ClosingHttp(
+        disable_ssl_certificate_validation=disable_ssl_certificate_validation,
+        ca_certs=ca_certs)
@@ -12,20 +12,66 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import atexit
+import sys
+import threading
+
 import netaddr
+import six
+from six import moves
 
 from tempest import auth
 from tempest import clients
 from tempest.common import cred_provider
 from tempest.common.utils import data_utils
+from tempest.common.utils import misc
 from tempest import config
 from tempest import exceptions
+from tempest.openstack.common import excutils
 from tempest.openstack.common import log as logging
 
 CONF = config.CONF
 LOG = logging.getLogger(__name__)
 
 
+class Reaper(object):
+    """Runs the cleanups deferred by the test classes from a background
+    thread, one after the other, and waits for them at exit.
+    """
+
+    def __init__(self):
+        self._queue = moves.queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def _run(self):
+        while True:
+            func, args = self._queue.get()
+            try:
+                func(*args)
+            except Exception:
+                LOG.exception("Deferred cleanup failed")
+            finally:
+                self._queue.task_done()
+
+    def add(self, func, *args):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run)
+                self._thread.daemon = True
+                self._thread.start()
+                atexit.register(self.wait)
+        self._queue.put((func, args))
+
+    def wait(self):
+        """Waits for the cleanups added so far to be done."""
+        self._queue.join()
+
+
+# the deferred cleanups of the process
+_reaper = Reaper()
+
+
 class IsolatedCreds(cred_provider.CredentialProvider):
 
     def __init__(self, name, interface='json', password='pass',
@@ -150,17 +196,19 @@ class IsolatedCreds(cred_provider.CredentialProvider):
             elif self.network_resources['dhcp']:
                 raise exceptions.InvalidConfiguration('DHCP requires a subnet')
 
-        data_utils.rand_name_root = data_utils.rand_name(self.name)
+        # NOTE: not a module global, the credentials of a pool are created
+        # from another thread
+        rand_name_root = data_utils.rand_name(self.name)
         if not self.network_resources or self.network_resources['network']:
-            network_name = data_utils.rand_name_root + "-network"
+            network_name = rand_name_root + "-network"
             network = self._create_network(network_name, tenant_id)
         try:
             if not self.network_resources or self.network_resources['subnet']:
-                subnet_name = data_utils.rand_name_root + "-subnet"
+                subnet_name = rand_name_root + "-subnet"
                 subnet = self._create_subnet(subnet_name, tenant_id,
                                              network['id'])
             if not self.network_resources or self.network_resources['router']:
-                router_name = data_utils.rand_name_root + "-router"
+                router_name = rand_name_root + "-router"
                 router = self._create_router(router_name, tenant_id)
                 self._add_router_interface(router['id'], subnet['id'])
         except Exception:
@@ -312,47 +360,218 @@ class IsolatedCreds(cred_provider.CredentialProvider):
                 LOG.warn('Security group %s, id %s not found for clean-up' %
                          (secgroup['name'], secgroup['id']))
 
-    def _clear_isolated_net_resources(self):
+    def _clear_isolated_net_resource(self, network, subnet, router):
         net_client = self.network_admin_client
+        LOG.debug("Clearing network: %(network)s, "
+                  "subnet: %(subnet)s, router: %(router)s",
+                  {'network': network, 'subnet': subnet, 'router': router})
+        if (not self.network_resources or
+            self.network_resources.get('router')):
+            try:
+                net_client.remove_router_interface_with_subnet_id(
+                    router['id'], subnet['id'])
+            except exceptions.NotFound:
+                LOG.warn('router with name: %s not found for delete' %
+                         router['name'])
+            self._clear_isolated_router(router['id'], router['name'])
+        if (not self.network_resources or
+            self.network_resources.get('subnet')):
+            self._clear_isolated_subnet(subnet['id'], subnet['name'])
+        if (not self.network_resources or
+            self.network_resources.get('network')):
+            self._clear_isolated_network(network['id'], network['name'])
+
+    def _clear_isolated_net_resources(self):
         for cred in self.isolated_net_resources:
-            network, subnet, router = self.isolated_net_resources.get(cred)
-            LOG.debug("Clearing network: %(network)s, "
-                      "subnet: %(subnet)s, router: %(router)s",
-                      {'network': network, 'subnet': subnet, 'router': router})
-            if (not self.network_resources or
-                self.network_resources.get('router')):
-                try:
-                    net_client.remove_router_interface_with_subnet_id(
-                        router['id'], subnet['id'])
-                except exceptions.NotFound:
-                    LOG.warn('router with name: %s not found for delete' %
-                             router['name'])
-                self._clear_isolated_router(router['id'], router['name'])
-            if (not self.network_resources or
-                self.network_resources.get('subnet')):
-                self._clear_isolated_subnet(subnet['id'], subnet['name'])
-            if (not self.network_resources or
-                self.network_resources.get('network')):
-                self._clear_isolated_network(network['id'], network['name'])
+            self._clear_isolated_net_resource(
+                *self.isolated_net_resources.get(cred))
+
+    def _clear_credential_set(self, creds, net_resources):
+        """Deletes isolated credentials, after their network resources."""
+        if net_resources:
+            self._clear_isolated_net_resource(*net_resources)
+        try:
+            self._delete_user(creds.user_id)
+        except exceptions.NotFound:
+            LOG.warn("user with name: %s not found for delete" %
+                     creds.username)
+        try:
+            self._delete_tenant(creds.tenant_id)
+        except exceptions.NotFound:
+            LOG.warn("tenant with name: %s not found for delete" %
+                     creds.tenant_name)
+
+    def _clear_credential_sets(self, isolated_creds, isolated_net_resources):
+        """Deletes the credential sets, several of them at once."""
+        credential_sets = [(creds, isolated_net_resources.get(cred))
+                           for cred, creds in isolated_creds.items()]
+        errors = []
+
+        def _clear(credential_set):
+            try:
+                self._clear_credential_set(*credential_set)
+            except Exception:
+                LOG.exception("Unable to delete isolated creds: %s" %
+                              credential_set[0])
+                errors.append(sys.exc_info())
+        misc.run_concurrently(_clear, credential_sets, len(credential_sets))
+        if errors:
+            six.reraise(*errors[0])
 
     def clear_isolated_creds(self):
         if not self.isolated_creds:
             return
-        self._clear_isolated_net_resources()
-        for creds in self.isolated_creds.itervalues():
-            try:
-                self._delete_user(creds.user_id)
-            except exceptions.NotFound:
-                LOG.warn("user with name: %s not found for delete" %
-                         creds.username)
-            try:
-                self._delete_tenant(creds.tenant_id)
-            except exceptions.NotFound:
-                LOG.warn("tenant with name: %s not found for delete" %
-                         creds.tenant_name)
+        if CONF.auth.defer_isolated_creds_cleanup:
+            _reaper.add(self._clear_credential_sets, self.isolated_creds,
+                        self.isolated_net_resources)
+        else:
+            self._clear_credential_sets(self.isolated_creds,
+                                        self.isolated_net_resources)
+        self.isolated_creds = {}
+        self.isolated_net_resources = {}
 
     def is_multi_user(self):
         return True
 
     def is_multi_tenant(self):
         return True
+
+
+class CredentialPool(object):
+    """Isolated credentials, with their network resources, created ahead of
+    time by a background thread.
+
+    The pool keeps up to size unused credentials ready for each kind of
+    credentials requested so far, a kind being admin or not with some
+    network resources. The credentials handed out are not taken back: the
+    resources of a test class may be left in their tenant, so they are
+    deleted with the class isolated credentials.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        # kind -> IsolatedCreds creating the credentials of that kind
+        self._creators = {}
+        # kind -> [(credentials, network resources)]
+        self._ready = {}
+        self._failed = set()
+        self._stopped = False
+        self._cond = threading.Condition()
+        self._thread = None
+
+    @staticmethod
+    def _kind(admin, network_resources):
+        return admin, tuple(sorted((network_resources or {}).items()))
+
+    def _credential_type(self, kind):
+        return 'admin' if kind[0] else 'primary'
+
+    def _next_kind(self):
+        for kind in self._creators:
+            if kind not in self._failed and (
+                    len(self._ready[kind]) < self.size):
+                return kind
+
+    def _create(self, kind):
+        creator = self._creators[kind]
+        credential_type = self._credential_type(kind)
+        try:
+            credentials = creator.get_credentials(credential_type)
+        except Exception:
+            # the tenant and the user are created before the network
+            # resources, which may have failed
+            with excutils.save_and_reraise_exception():
+                try:
+                    creator.clear_isolated_creds()
+                except Exception:
+                    LOG.exception("Unable to delete the isolated creds of "
+                                  "a failed pool credential set")
+        del creator.isolated_creds[credential_type]
+        return (credentials,
+                creator.isolated_net_resources.pop(credential_type, None))
+
+    def _fill(self):
+        while True:
+            with self._cond:
+                kind = self._next_kind()
+                while kind is None and not self._stopped:
+                    self._cond.wait()
+                    kind = self._next_kind()
+                if self._stopped:
+                    return
+            try:
+                credential_set = self._create(kind)
+            except Exception:
+                LOG.exception("Unable to create pooled isolated credentials,"
+                              " they will be created on demand instead")
+                with self._cond:
+                    self._failed.add(kind)
+                continue
+            with self._cond:
+                self._ready[kind].append(credential_set)
+
+    def get(self, admin, network_resources=None):
+        """Returns ready (credentials, network resources) of a kind, None
+        when there are none yet.
+        """
+        kind = self._kind(admin, network_resources)
+        with self._cond:
+            if kind not in self._creators:
+                self._creators[kind] = IsolatedCreds(
+                    'pool', network_resources=network_resources)
+                self._ready[kind] = []
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._fill)
+                self._thread.daemon = True
+                self._thread.start()
+                atexit.register(self.close)
+            self._cond.notify()
+            if self._ready[kind]:
+                return self._ready[kind].pop(0)
+
+    def close(self):
+        """Stops filling the pool and deletes the unused credentials."""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+        for kind, creator in self._creators.items():
+            credential_sets = dict(enumerate(self._ready.pop(kind)))
+            creator._clear_credential_sets(
+                dict((i, creds) for i, (creds, _) in credential_sets.items()),
+                dict((i, net) for i, (_, net) in credential_sets.items()
+                     if net is not None))
+        self._creators = {}
+
+
+# the pool shared by the pooled isolated credentials of the process
+_pool = None
+
+
+def get_pool():
+    global _pool
+    if _pool is None:
+        _pool = CredentialPool(CONF.auth.isolated_creds_pool_size)
+    return _pool
+
+
+class PooledIsolatedCreds(IsolatedCreds):
+    """Isolated credentials taken from the process pool when it has some
+    ready, created on demand otherwise.
+    """
+
+    def get_credentials(self, credential_type):
+        if not self.isolated_creds.get(credential_type):
+            credential_set = get_pool().get(credential_type == 'admin',
+                                            self.network_resources)
+            if credential_set is not None:
+                credentials, net_resources = credential_set
+                self.isolated_creds[credential_type] = credentials
+                if net_resources is not None:
+                    self.isolated_net_resources[credential_type] = (
+                        net_resources)
+                LOG.info("Acquired pooled isolated creds:\n credentials: %s"
+                         % credentials)
+        return super(PooledIsolatedCreds, self).get_credentials(
+            credential_type)
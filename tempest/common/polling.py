@@ -0,0 +1,178 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import atexit
+import random
+import threading
+import time
+
+import six
+
+from tempest import config
+from tempest.openstack.common import log as logging
+
+CONF = config.CONF
+LOG = logging.getLogger(__name__)
+
+
+class PollingStats(object):
+    """Number of polls and time spent by the waits of each waiter.
+
+    The stats are logged when the process exits, once a wait was recorded.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._registered = False
+
+    def record(self, name, polls, secs):
+        with self._lock:
+            if not self._registered:
+                atexit.register(self.log_summary)
+                self._registered = True
+            stats = self._stats.setdefault(
+                name, {'waits': 0, 'polls': 0, 'max_polls': 0,
+                       'wait_time': 0.0})
+            stats['waits'] += 1
+            stats['polls'] += polls
+            stats['max_polls'] = max(stats['max_polls'], polls)
+            stats['wait_time'] += secs
+
+    def summary(self):
+        """Returns a copy of the stats, by waiter name."""
+        with self._lock:
+            return dict((name, dict(stats, avg_polls=(float(stats['polls']) /
+                                                      stats['waits'])))
+                        for name, stats in self._stats.items())
+
+    def log_summary(self):
+        summary = self.summary()
+        if not summary:
+            return
+        lines = ['%-50s %6s %6s %9s %9s %10s' % (
+            'Waiter', 'Waits', 'Polls', 'Max polls', 'Avg polls',
+            'Wait time')]
+        for name, stats in sorted(summary.items()):
+            lines.append('%-50s %6d %6d %9d %9.1f %10.1f' % (
+                name, stats['waits'], stats['polls'], stats['max_polls'],
+                stats['avg_polls'], stats['wait_time']))
+        LOG.info('Polling stats:\n%s', '\n'.join(lines))
+
+    def clear(self):
+        with self._lock:
+            self._stats.clear()
+
+
+stats = PollingStats()
+
+
+class PollingPolicy(object):
+    """How often, and for how long, a waiter checks the resource status.
+
+    The first check is done right away, then the waiter sleeps interval
+    seconds before the next one, the interval being multiplied by factor
+    after each check up to max_interval. jitter is the random fraction of
+    the interval added or removed at each sleep, to spread concurrent
+    waiters. Waiting stops after timeout seconds.
+    """
+
+    def __init__(self, interval=1, timeout=60, factor=1.0, max_interval=None,
+                 jitter=0.0, group=None):
+        self.interval = interval
+        self.timeout = timeout
+        self.factor = factor
+        self.max_interval = max(max_interval or interval, interval)
+        self.jitter = jitter
+        self.group = group
+
+    @classmethod
+    def for_client(cls, client):
+        """Policy of the service group of a client.
+
+        The build_interval and build_timeout of the client are used as
+        the default interval and timeout, and as the interval cap.
+        """
+        kwargs = dict(interval=client.build_interval,
+                      timeout=client.build_timeout)
+        group = getattr(client, 'polling_group', None)
+        if isinstance(group, six.string_types):
+            conf = getattr(CONF, group)
+            initial_interval = (conf.polling_initial_interval or
+                                client.build_interval)
+            kwargs.update(interval=initial_interval,
+                          factor=conf.polling_backoff_factor,
+                          max_interval=(conf.polling_max_interval or
+                                        client.build_interval),
+                          jitter=conf.polling_jitter,
+                          group=group)
+        return cls(**kwargs)
+
+    def start(self, name):
+        """Returns a Poll, to be used by the waiter named name as a context
+        manager around its wait.
+        """
+        if self.group:
+            name = '%s.%s' % (self.group, name)
+        return Poll(self, name)
+
+
+class Poll(object):
+    """The state of a single wait, following a PollingPolicy.
+
+    The stats of the wait are recorded when the with block using the poll
+    exits, however the waiter returns or raises.
+    """
+
+    def __init__(self, policy, name):
+        self.policy = policy
+        self.name = name
+        self.start_time = time.time()
+        self.interval = policy.interval
+        self.polls = 1
+        self._done = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.done()
+
+    @property
+    def elapsed(self):
+        return time.time() - self.start_time
+
+    def expired(self):
+        return self.elapsed >= self.policy.timeout
+
+    def sleep(self):
+        """Sleeps until the next status check."""
+        delay = self.interval
+        if self.policy.jitter:
+            delay *= 1 + random.uniform(-self.policy.jitter,
+                                        self.policy.jitter)
+        # don't oversleep the deadline, the last check would be wasted
+        delay = max(0, min(delay, self.policy.timeout - self.elapsed))
+        time.sleep(delay)
+        self.polls += 1
+        self.interval = min(self.interval * self.policy.factor,
+                            self.policy.max_interval)
+
+    def done(self):
+        """Records the stats of this wait, once."""
+        if self._done:
+            return
+        self._done = True
+        elapsed = self.elapsed
+        stats.record(self.name, self.polls, elapsed)
+        LOG.debug('%s done after %d polls in %.3fs',
+                  self.name, self.polls, elapsed)
@@ -23,7 +23,10 @@ import time
 import jsonschema
 import six
 
+from tempest.common import api_stats
 from tempest.common import http
+from tempest.common import polling
+from tempest.common import schema_validator
 from tempest.common.utils import misc as misc_utils
 from tempest import config
 from tempest import exceptions
@@ -72,10 +75,30 @@ class ResponseBodyList(list):
         return "response: %s\nBody: %s" % (self.response, body)
 
 
+def build_http_obj():
+    """Build an HTTP transport as set in the identity config section"""
+    dscv = CONF.identity.disable_ssl_certificate_validation
+    ca_certs = CONF.identity.ca_certificates_file
+    return http.get_http_obj(
+        disable_ssl_certificate_validation=dscv, ca_certs=ca_certs,
+        keepalive=CONF.identity.http_keepalive,
+        pool_size=CONF.identity.http_pool_size,
+        idle_timeout=CONF.identity.http_pool_idle_timeout)
+
+
+def _body_size(body):
+    if isinstance(body, six.string_types):
+        return len(body)
+    return 0
+
+
 class RestClient(object):
 
     TYPE = "json"
 
+    # The config group of the polling options used by the waiters
+    polling_group = None
+
     LOG = logging.getLogger(__name__)
 
     def __init__(self, auth_provider, service, region,
@@ -99,10 +122,19 @@ class RestClient(object):
                                        'location', 'proxy-authenticate',
                                        'retry-after', 'server',
                                        'vary', 'www-authenticate'))
-        dscv = CONF.identity.disable_ssl_certificate_validation
-        ca_certs = CONF.identity.ca_certificates_file
-        self.http_obj = http.ClosingHttp(
-            disable_ssl_certificate_validation=dscv, ca_certs=ca_certs)
+        # NOTE: the HTTP transport is built on first use, unless one is
+        # shared by the manager which created this client
+        self._http_obj = None
+
+    @property
+    def http_obj(self):
+        if self._http_obj is None:
+            self._http_obj = build_http_obj()
+        return self._http_obj
+
+    @http_obj.setter
+    def http_obj(self, http_obj):
+        self._http_obj = http_obj
 
     def _get_type(self):
         return self.TYPE
@@ -238,6 +270,9 @@ class RestClient(object):
 
     def _safe_body(self, body, maxlen=4096):
         # convert a structure into a string safely
+        if isinstance(body, six.string_types):
+            # don't decode more than what is going to be logged
+            body = body[:maxlen]
         try:
             text = six.text_type(body)
         except UnicodeDecodeError:
@@ -250,20 +285,21 @@ class RestClient(object):
 
     def _log_request_start(self, method, req_url, req_headers=None,
                            req_body=None):
-        if req_headers is None:
-            req_headers = {}
-        caller_name = misc_utils.find_test_caller()
         trace_regex = CONF.debug.trace_requests
-        if trace_regex and re.search(trace_regex, caller_name):
-            self.LOG.debug('Starting Request (%s): %s %s' %
-                           (caller_name, method, req_url))
+        if not trace_regex:
+            return
+        caller_name = misc_utils.find_test_caller()
+        if caller_name and re.search(trace_regex, caller_name):
+            self.LOG.debug('Starting Request (%s): %s %s',
+                           caller_name, method, req_url)
 
     def _log_request_full(self, method, req_url, resp,
                           secs="", req_headers=None,
                           req_body=None, resp_body=None,
                           caller_name=None, extra=None):
-        if 'X-Auth-Token' in req_headers:
-            req_headers['X-Auth-Token'] = '<omitted>'
+        if req_headers and 'X-Auth-Token' in req_headers:
+            # don't leak the token, nor change the headers of the caller
+            req_headers = dict(req_headers, **{'X-Auth-Token': '<omitted>'})
         log_fmt = """Request (%s): %s %s %s%s
     Request - Headers: %s
         Body: %s
@@ -288,8 +324,15 @@ class RestClient(object):
                      req_body=None, resp_body=None):
         if req_headers is None:
             req_headers = {}
-        # if we have the request id, put it in the right part of the log
-        extra = dict(request_id=self._get_request_id(resp))
+        # if we have the request id, put it in the right part of the log,
+        # timing and sizes are exposed as attributes of the log record
+        extra = dict(request_id=self._get_request_id(resp),
+                     request_method=method,
+                     request_url=req_url,
+                     response_status=resp['status'],
+                     request_time=secs or None,
+                     request_body_size=_body_size(req_body),
+                     response_body_size=_body_size(resp_body))
         # NOTE(sdague): while we still have 6 callers to this function
         # we're going to just provide work around on who is actually
         # providing timings by gracefully adding no content if they don't.
@@ -298,17 +341,13 @@ class RestClient(object):
         if secs:
             secs = " %.3fs" % secs
         if not self.LOG.isEnabledFor(real_logging.DEBUG):
-            self.LOG.info(
-                'Request (%s): %s %s %s%s' % (
-                    caller_name,
-                    resp['status'],
-                    method,
-                    req_url,
-                    secs),
-                extra=extra)
+            self.LOG.info('Request (%s): %s %s %s%s',
+                          caller_name, resp['status'], method, req_url, secs,
+                          extra=extra)
+            return
 
         # Also look everything at DEBUG if you want to filter this
-        # out, don't run at debug.
+        # out, don't run at debug. The full message is only built here.
         self._log_request_full(method, req_url, resp, secs, req_headers,
                                req_body, resp_body, caller_name, extra)
 
@@ -366,7 +405,7 @@ class RestClient(object):
         if method != 'HEAD' and not resp_body and resp.status >= 400:
             self.LOG.warning("status >= 400 response with empty body")
 
-    def _request(self, method, url, headers=None, body=None):
+    def _request(self, method, url, headers=None, body=None, retry=0):
         """A simple HTTP request interface."""
         # Authenticate the request with the auth provider
         req_url, req_headers, req_body = self.auth_provider.auth_request(
@@ -381,6 +420,11 @@ class RestClient(object):
         self._log_request(method, req_url, resp, secs=(end - start),
                           req_headers=req_headers, req_body=req_body,
                           resp_body=resp_body)
+        collector = api_stats.get_collector()
+        if collector is not None:
+            collector.record(self.service, method, req_url, resp.status,
+                             end - start, _body_size(req_body),
+                             _body_size(resp_body), retry)
 
         # Verify HTTP response codes
         self.response_checker(method, resp, resp_body)
@@ -416,7 +460,8 @@ class RestClient(object):
             delay = int(resp['retry-after'])
             time.sleep(delay)
             resp, resp_body = self._request(method, url,
-                                            headers=headers, body=body)
+                                            headers=headers, body=body,
+                                            retry=retry)
         self._error_checker(method, url, headers, body,
                             resp, resp_body)
         return resp, resp_body
@@ -426,9 +471,8 @@ class RestClient(object):
 
         # NOTE(mtreinish): Check for httplib response from glance_http. The
         # object can't be used here because importing httplib breaks httplib2.
-        # If another object from a class not imported were passed here as
-        # resp this could possibly fail
-        if str(type(resp)) == "<type 'instance'>":
+        # httplib responses have a getheader method, httplib2 ones don't.
+        if hasattr(resp, 'getheader'):
             ctype = resp.getheader('content-type')
         else:
             try:
@@ -536,20 +580,21 @@ class RestClient(object):
 
     def wait_for_resource_deletion(self, id):
         """Waits for a resource to be deleted."""
-        start_time = int(time.time())
-        while True:
-            if self.is_resource_deleted(id):
-                return
-            if int(time.time()) - start_time >= self.build_timeout:
-                message = ('Failed to delete %(resource_type)s %(id)s within '
-                           'the required time (%(timeout)s s).' %
-                           {'resource_type': self.resource_type, 'id': id,
-                            'timeout': self.build_timeout})
-                caller = misc_utils.find_test_caller()
-                if caller:
-                    message = '(%s) %s' % (caller, message)
-                raise exceptions.TimeoutException(message)
-            time.sleep(self.build_interval)
+        policy = polling.PollingPolicy.for_client(self)
+        with policy.start('wait_for_resource_deletion') as poll:
+            while True:
+                if self.is_resource_deleted(id):
+                    return
+                if poll.expired():
+                    message = ('Failed to delete %(resource_type)s %(id)s '
+                               'within the required time (%(timeout)s s).' %
+                               {'resource_type': self.resource_type, 'id': id,
+                                'timeout': policy.timeout})
+                    caller = misc_utils.find_test_caller()
+                    if caller:
+                        message = '(%s) %s' % (caller, message)
+                    raise exceptions.TimeoutException(message)
+                poll.sleep()
 
     def is_resource_deleted(self, id):
         """
@@ -574,11 +619,17 @@ class RestClient(object):
         if resp.status in HTTP_SUCCESS:
             cls.expected_success(schema['status_code'], resp.status)
 
+            # Only check a sample of the responses when configured so
+            sampler = schema_validator.get_sampler()
+            if sampler is not None and not sampler.sample(schema):
+                return
+
             # Check the body of a response
             body_schema = schema.get('response_body')
             if body_schema:
+                validator = schema_validator.get_validator(body_schema)
                 try:
-                    jsonschema.validate(body, body_schema)
+                    validator.validate(body)
                 except jsonschema.ValidationError as ex:
                     msg = ("HTTP response body is invalid (%s)") % ex
                     raise exceptions.InvalidHTTPResponseBody(msg)
@@ -590,8 +641,9 @@ class RestClient(object):
             # Check the header of a response
             header_schema = schema.get('response_header')
             if header_schema:
+                validator = schema_validator.get_validator(header_schema)
                 try:
-                    jsonschema.validate(resp, header_schema)
+                    validator.validate(resp)
                 except jsonschema.ValidationError as ex:
                     msg = ("HTTP response header is invalid (%s)") % ex
                     raise exceptions.InvalidHTTPResponseHeader(msg)
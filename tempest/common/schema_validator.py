@@ -0,0 +1,315 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Validators of the response schemas, built once per schema.
+
+jsonschema.validate checks the schema and builds a validator on each call.
+get_validator builds them once per schema object, and checks the instances
+with a compiled function for the keywords the response schemas mostly use.
+The subschemas using other keywords are checked by jsonschema itself. When
+the compiled function rejects an instance, jsonschema validates it again to
+raise the same ValidationError as jsonschema.validate.
+
+When [debug] schema_validation_rate is below 1, the rest clients only
+validate a sample of the responses, picked by a ValidationSampler.
+"""
+
+import atexit
+import numbers
+import random
+import re
+import threading
+
+import jsonschema
+import six
+
+from tempest import config
+from tempest.openstack.common import log as logging
+
+CONF = config.CONF
+LOG = logging.getLogger(__name__)
+
+# schema keywords which do not constrain the instances, as the validators
+# have no format checker
+ANNOTATIONS = frozenset(['description', 'title', 'format'])
+
+TYPES = {
+    'array': list,
+    'boolean': bool,
+    'integer': six.integer_types,
+    'null': type(None),
+    'number': numbers.Number,
+    'object': dict,
+    'string': six.string_types,
+}
+
+# id(schema) -> (schema, validator), the schema being kept alive so that
+# its id is not reused
+_validators = {}
+
+
+def _compile_type(type_names):
+    if isinstance(type_names, six.string_types):
+        type_names = [type_names]
+    types = tuple(TYPES[type_name] for type_name in type_names)
+    # bool is an int, but not a JSON number
+    allow_bool = 'boolean' in type_names
+
+    def check(instance):
+        return (isinstance(instance, types) and
+                (allow_bool or not isinstance(instance, bool)))
+    return check
+
+
+def _compile_properties(cls, properties, pattern_properties, additional):
+    checks = [(name, _compile(cls, subschema))
+              for name, subschema in properties.items()]
+    pattern_checks = [(re.compile(pattern), _compile(cls, subschema))
+                      for pattern, subschema in pattern_properties.items()]
+    names = frozenset(properties)
+
+    def check(instance):
+        if not isinstance(instance, dict):
+            return True
+        for name, check_property in checks:
+            if name in instance and not check_property(instance[name]):
+                return False
+        if additional and not pattern_checks:
+            return True
+        for name, value in instance.items():
+            matched = name in names
+            for pattern, check_property in pattern_checks:
+                if pattern.search(name):
+                    matched = True
+                    if not check_property(value):
+                        return False
+            if not (matched or additional):
+                return False
+        return True
+    return check
+
+
+def _compile_required(required):
+    def check(instance):
+        if isinstance(instance, dict):
+            for name in required:
+                if name not in instance:
+                    return False
+        return True
+    return check
+
+
+def _compile_items(cls, items):
+    check_item = _compile(cls, items)
+
+    def check(instance):
+        if isinstance(instance, list):
+            for item in instance:
+                if not check_item(item):
+                    return False
+        return True
+    return check
+
+
+def _compile_length(min_items, max_items):
+    def check(instance):
+        return (not isinstance(instance, list) or
+                (min_items is None or len(instance) >= min_items) and
+                (max_items is None or len(instance) <= max_items))
+    return check
+
+
+def _compile_minimum(minimum, exclusive):
+    def check(instance):
+        if isinstance(instance, bool) or not isinstance(instance,
+                                                        numbers.Number):
+            return True
+        return instance > minimum if exclusive else instance >= minimum
+    return check
+
+
+def _compile_pattern(pattern):
+    pattern = re.compile(pattern)
+
+    def check(instance):
+        return (not isinstance(instance, six.string_types) or
+                pattern.search(instance) is not None)
+    return check
+
+
+def _compile_alternatives(cls, subschemas, exactly_one):
+    checks = [_compile(cls, subschema) for subschema in subschemas]
+
+    def check(instance):
+        valid = sum(1 for check_subschema in checks
+                    if check_subschema(instance))
+        return valid == 1 if exactly_one else valid > 0
+    return check
+
+
+def _compile_enum(enum):
+    def check(instance):
+        return instance in enum
+    return check
+
+
+COMPILED_KEYWORDS = ANNOTATIONS | frozenset([
+    'type', 'properties', 'patternProperties', 'additionalProperties',
+    'required', 'items', 'minItems', 'maxItems', 'minimum',
+    'exclusiveMinimum', 'pattern', 'enum', 'oneOf', 'anyOf'])
+
+
+def _compile(cls, schema):
+    """Returns a function checking whether an instance is valid."""
+    if (not isinstance(schema, dict) or
+            not COMPILED_KEYWORDS.issuperset(schema) or
+            not isinstance(schema.get('items', {}), dict) or
+            not isinstance(schema.get('additionalProperties', True), bool)):
+        # NOTE: the keyword is checked by jsonschema, which has no $ref to
+        # resolve in a subschema as there are none in the root schema
+        return cls(schema).is_valid
+    checks = []
+    if 'type' in schema:
+        checks.append(_compile_type(schema['type']))
+    if ('properties' in schema or 'patternProperties' in schema or
+            'additionalProperties' in schema):
+        checks.append(_compile_properties(
+            cls, schema.get('properties', {}),
+            schema.get('patternProperties', {}),
+            schema.get('additionalProperties', True)))
+    if 'required' in schema:
+        checks.append(_compile_required(schema['required']))
+    if 'items' in schema:
+        checks.append(_compile_items(cls, schema['items']))
+    if 'minItems' in schema or 'maxItems' in schema:
+        checks.append(_compile_length(schema.get('minItems'),
+                                      schema.get('maxItems')))
+    if 'minimum' in schema:
+        checks.append(_compile_minimum(schema['minimum'],
+                                       schema.get('exclusiveMinimum', False)))
+    if 'pattern' in schema:
+        checks.append(_compile_pattern(schema['pattern']))
+    if 'enum' in schema:
+        checks.append(_compile_enum(schema['enum']))
+    if 'oneOf' in schema:
+        checks.append(_compile_alternatives(cls, schema['oneOf'], True))
+    if 'anyOf' in schema:
+        checks.append(_compile_alternatives(cls, schema['anyOf'], False))
+
+    if len(checks) == 1:
+        return checks[0]
+
+    def check(instance):
+        for check_keyword in checks:
+            if not check_keyword(instance):
+                return False
+        return True
+    return check
+
+
+def _has_ref(schema):
+    if isinstance(schema, dict):
+        return '$ref' in schema or any(_has_ref(value)
+                                       for value in schema.values())
+    if isinstance(schema, list):
+        return any(_has_ref(value) for value in schema)
+    return False
+
+
+class SchemaValidator(object):
+    """Validates instances against a schema checked once."""
+
+    def __init__(self, schema, compiled=True):
+        cls = jsonschema.validators.validator_for(schema)
+        cls.check_schema(schema)
+        self.validator = cls(schema)
+        self.is_valid = self.validator.is_valid
+        # NOTE: the compiled keywords follow draft 4
+        if (compiled and cls is jsonschema.Draft4Validator and
+                not _has_ref(schema)):
+            self.is_valid = _compile(cls, schema)
+
+    def validate(self, instance):
+        """Raises a jsonschema.ValidationError if instance is invalid."""
+        if not self.is_valid(instance):
+            self.validator.validate(instance)
+
+
+def get_validator(schema):
+    """Returns the validator of schema, built on its first use."""
+    entry = _validators.get(id(schema))
+    if entry is None or entry[0] is not schema:
+        entry = (schema, SchemaValidator(schema))
+        _validators[id(schema)] = entry
+    return entry[1]
+
+
+class ValidationSampler(object):
+    """Picks the responses to validate, and counts the validated and the
+    skipped ones.
+
+    The first `first` responses of each response schema are validated, then
+    a `rate` fraction of the others, picked at random.
+    """
+
+    def __init__(self, rate=1.0, first=0):
+        self.rate = rate
+        self.first = first
+        self.validated = 0
+        self.skipped = 0
+        # id(schema) -> [schema, validated responses]
+        self._schemas = {}
+        self._lock = threading.Lock()
+
+    def sample(self, schema):
+        """Returns whether a response of schema is to be validated."""
+        with self._lock:
+            entry = self._schemas.get(id(schema))
+            if entry is None or entry[0] is not schema:
+                entry = self._schemas[id(schema)] = [schema, 0]
+            validate = entry[1] < self.first or random.random() < self.rate
+            if validate:
+                entry[1] += 1
+                self.validated += 1
+            else:
+                self.skipped += 1
+        return validate
+
+
+_sampler = None
+_sampler_lock = threading.Lock()
+
+
+def set_sampler(sampler):
+    """Replace the sampler of the responses the rest clients validate."""
+    global _sampler
+    _sampler = sampler
+
+
+def get_sampler():
+    """Return the process wide sampler, None if all the responses are
+    validated.
+    """
+    global _sampler
+    if _sampler is None and CONF.debug.schema_validation_rate < 1:
+        with _sampler_lock:
+            if _sampler is None:
+                _sampler = ValidationSampler(
+                    CONF.debug.schema_validation_rate,
+                    CONF.debug.schema_validation_first)
+                atexit.register(_log_sampler, _sampler)
+    return _sampler
+
+
+def _log_sampler(sampler):
+    LOG.info("Response schema validation: %d responses validated, %d "
+             "skipped" % (sampler.validated, sampler.skipped))
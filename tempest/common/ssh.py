@@ -17,6 +17,7 @@
 import cStringIO
 import select
 import socket
+import threading
 import time
 import warnings
 
@@ -33,11 +34,116 @@ with warnings.catch_warnings():
 
 LOG = logging.getLogger(__name__)
 
+# size of the reads of the streamed command outputs
+STREAM_BUF_SIZE = 64 * 1024
+# bytes of stderr kept for the error of a streamed command
+STDERR_LIMIT = 64 * 1024
+
+
+class ConnectionCache(object):
+    """Authenticated ssh connections shared by the clients of a process.
+
+    The clients connecting to the same host with the same user and
+    credentials share one connection, and open a channel on it for each
+    command. A connection idle for more than idle_timeout seconds, with no
+    channel open, is closed and replaced on its next use.
+    """
+
+    def __init__(self, idle_timeout=60):
+        self.idle_timeout = idle_timeout
+        # key -> [connection, time its last channel was opened or closed]
+        self._connections = {}
+        # connection -> number of channels open on it
+        self._channels = {}
+        # connections no longer cached, closed once their channels are
+        self._retired = set()
+        self._lock = threading.Lock()
+
+    def _is_usable(self, entry):
+        transport = entry[0].get_transport()
+        return (transport is not None and transport.is_active() and
+                (entry[0] in self._channels or
+                 time.time() - entry[1] <= self.idle_timeout))
+
+    def _retire(self, ssh):
+        """Returns ssh if it can be closed now, else closes it later."""
+        if ssh in self._channels:
+            self._retired.add(ssh)
+            return None
+        return ssh
+
+    def _open_channel(self, entry):
+        entry[1] = time.time()
+        ssh = entry[0]
+        self._channels[ssh] = self._channels.get(ssh, 0) + 1
+        return ssh
+
+    def get(self, key, connect):
+        """Returns the connection of key, calling connect to create it.
+
+        The connection is counted as used by one more channel, until
+        release is called.
+        """
+        with self._lock:
+            entry = self._connections.get(key)
+            if entry is not None and self._is_usable(entry):
+                return self._open_channel(entry)
+            self._connections.pop(key, None)
+            stale = entry and self._retire(entry[0])
+        if stale:
+            stale.close()
+        # NOTE: connect outside of the lock, the connections to other
+        # hosts are not held up by a slow one
+        ssh = connect()
+        with self._lock:
+            entry = self._connections.setdefault(key, [ssh, time.time()])
+            cached = self._open_channel(entry)
+        if cached is not ssh:
+            ssh.close()
+        return cached
+
+    def release(self, key, ssh):
+        """Records that a channel opened on the connection ssh of key was
+        closed.
+        """
+        with self._lock:
+            entry = self._connections.get(key)
+            if entry is not None and entry[0] is ssh:
+                entry[1] = time.time()
+            channels = self._channels.pop(ssh, 0) - 1
+            if channels > 0:
+                self._channels[ssh] = channels
+                return
+            if ssh not in self._retired:
+                return
+            self._retired.discard(ssh)
+        ssh.close()
+
+    def close(self, key):
+        """Closes the connection of key, if any, once its channels are."""
+        with self._lock:
+            entry = self._connections.pop(key, None)
+            ssh = entry and self._retire(entry[0])
+        if ssh:
+            ssh.close()
+
+    def close_all(self):
+        """Closes all the connections, even those with channels open."""
+        with self._lock:
+            connections = ([entry[0] for entry in self._connections.values()]
+                           + list(self._retired))
+            self._connections = {}
+            self._channels = {}
+            self._retired = set()
+        for ssh in connections:
+            ssh.close()
+
 
 class Client(object):
 
     def __init__(self, host, username, password=None, timeout=300, pkey=None,
-                 channel_timeout=10, look_for_keys=False, key_filename=None):
+                 channel_timeout=10, look_for_keys=False, key_filename=None,
+                 keep_connection=False, connection_cache=None, buf_size=1024):
         self.host = host
         self.username = username
         self.password = password
@@ -49,7 +155,13 @@ class Client(object):
         self.key_filename = key_filename
         self.timeout = int(timeout)
         self.channel_timeout = float(channel_timeout)
-        self.buf_size = 1024
+        self.buf_size = buf_size
+        # when keep_connection is set, the commands share one connection
+        self.keep_connection = keep_connection
+        self._ssh = None
+        # when connection_cache is set, the connection is shared with the
+        # other clients of the cache
+        self.connection_cache = connection_cache
 
     def _get_ssh_connection(self, sleep=1.5, backoff=1):
         """Returns an ssh connection to the specified host."""
@@ -94,57 +206,169 @@ class Client(object):
                             self.username, self.host, e, attempts, bsleep)
                 time.sleep(bsleep)
 
+    def _cache_key(self):
+        pkey = self.pkey and self.pkey.get_base64()
+        return (self.host, self.username, self.password, pkey,
+                self.key_filename, self.look_for_keys)
+
+    def _reuses_connection(self):
+        return self.keep_connection or self.connection_cache is not None
+
+    def _get_connection(self):
+        """Returns the connection to open a channel on, to be released with
+        _release_connection once the channel is closed.
+        """
+        if self.connection_cache is not None:
+            return self.connection_cache.get(self._cache_key(),
+                                             self._get_ssh_connection)
+        if not self.keep_connection:
+            return self._get_ssh_connection()
+        transport = self._ssh and self._ssh.get_transport()
+        if transport is None or not transport.is_active():
+            if self._ssh is not None:
+                LOG.info("ssh connection to %s@%s was closed, reconnecting",
+                         self.username, self.host)
+            self._ssh = self._get_ssh_connection()
+        return self._ssh
+
+    def close(self):
+        """Closes the connection kept open between commands, if any."""
+        if self.connection_cache is not None:
+            self.connection_cache.close(self._cache_key())
+        if self._ssh is not None:
+            self._ssh.close()
+            self._ssh = None
+
     def _is_timed_out(self, start_time):
         return (time.time() - self.timeout) > start_time
 
+    def _release_connection(self, ssh):
+        """Records that the channel opened on ssh was closed."""
+        if self.connection_cache is not None:
+            self.connection_cache.release(self._cache_key(), ssh)
+
+    def _open_channel(self):
+        ssh = self._get_connection()
+        try:
+            return ssh, ssh.get_transport().open_session()
+        except Exception:
+            self._release_connection(ssh)
+            raise
+
+    def _open_session(self):
+        """Returns a new channel, with the connection it is opened on."""
+        try:
+            return self._open_channel()
+        except (paramiko.SSHException, socket.error, EOFError) as e:
+            if not self._reuses_connection():
+                raise
+            # NOTE: the server may have dropped a connection which looked
+            # alive, e.g. when it was rebooted
+            LOG.info("Unable to open a channel on the ssh connection to "
+                     "%s@%s (%s), reconnecting", self.username, self.host, e)
+            self.close()
+            return self._open_channel()
+
+    def _read_command(self, cmd, buf_size, stderr_limit=None,
+                      idle_timeout=False):
+        """
+        Execute the specified command on the server and yield the chunks of
+        its standard output as they are read.
+
+        At most the last stderr_limit bytes of the standard error are kept
+        for the error message, all of them when it is None. With
+        idle_timeout, the command times out when it gives no output for
+        timeout seconds rather than when it runs for timeout seconds.
+        """
+        ssh, channel = self._open_session()
+        try:
+            channel.fileno()  # Register event pipe
+            channel.exec_command(cmd)
+            channel.shutdown_write()
+            err_data = []
+            err_size = 0
+            poll = select.poll()
+            poll.register(channel, select.POLLIN)
+            start_time = time.time()
+
+            while True:
+                ready = poll.poll(self.channel_timeout)
+                if not any(ready):
+                    if not self._is_timed_out(start_time):
+                        continue
+                    raise exceptions.TimeoutException(
+                        "Command: '{0}' executed on host '{1}'.".format(
+                            cmd, self.host))
+                if not ready[0]:  # If there is nothing to read.
+                    continue
+                out_chunk = err_chunk = None
+                if channel.recv_ready():
+                    out_chunk = channel.recv(buf_size)
+                    if out_chunk:
+                        yield out_chunk
+                if channel.recv_stderr_ready():
+                    err_chunk = channel.recv_stderr(buf_size)
+                    err_data += err_chunk,
+                    err_size += len(err_chunk)
+                    while (stderr_limit is not None and
+                           err_size - len(err_data[0]) >= stderr_limit):
+                        err_size -= len(err_data.pop(0))
+                if channel.closed and not err_chunk and not out_chunk:
+                    break
+                if idle_timeout and (out_chunk or err_chunk):
+                    start_time = time.time()
+            exit_status = channel.recv_exit_status()
+        finally:
+            channel.close()
+            self._release_connection(ssh)
+        if 0 != exit_status:
+            strerror = ''.join(err_data)
+            if stderr_limit is not None:
+                strerror = strerror[-stderr_limit:]
+            raise exceptions.SSHExecCommandFailed(
+                command=cmd, exit_status=exit_status, strerror=strerror)
+
     def exec_command(self, cmd):
         """
         Execute the specified command on the server.
 
         Note that this method is reading whole command outputs to memory, thus
-        shouldn't be used for large outputs.
+        shouldn't be used for large outputs, see exec_command_stream.
 
         :returns: data read from standard output of the command.
         :raises: SSHExecCommandFailed if command returns nonzero
                  status. The exception contains command status stderr content.
         """
-        ssh = self._get_ssh_connection()
-        transport = ssh.get_transport()
-        channel = transport.open_session()
-        channel.fileno()  # Register event pipe
-        channel.exec_command(cmd)
-        channel.shutdown_write()
-        out_data = []
-        err_data = []
-        poll = select.poll()
-        poll.register(channel, select.POLLIN)
-        start_time = time.time()
+        return ''.join(self._read_command(cmd, self.buf_size))
 
-        while True:
-            ready = poll.poll(self.channel_timeout)
-            if not any(ready):
-                if not self._is_timed_out(start_time):
-                    continue
-                raise exceptions.TimeoutException(
-                    "Command: '{0}' executed on host '{1}'.".format(
-                        cmd, self.host))
-            if not ready[0]:  # If there is nothing to read.
-                continue
-            out_chunk = err_chunk = None
-            if channel.recv_ready():
-                out_chunk = channel.recv(self.buf_size)
-                out_data += out_chunk,
-            if channel.recv_stderr_ready():
-                err_chunk = channel.recv_stderr(self.buf_size)
-                err_data += err_chunk,
-            if channel.closed and not err_chunk and not out_chunk:
-                break
-        exit_status = channel.recv_exit_status()
-        if 0 != exit_status:
-            raise exceptions.SSHExecCommandFailed(
-                command=cmd, exit_status=exit_status,
-                strerror=''.join(err_data))
-        return ''.join(out_data)
+    def exec_command_stream(self, cmd, buf_size=STREAM_BUF_SIZE):
+        """
+        Execute the specified command on the server and iterate over its
+        standard output as it is read, in chunks of at most buf_size bytes.
+
+        The command times out when it gives no output for timeout seconds,
+        so long running commands can be followed.
+
+        :raises: SSHExecCommandFailed once the output is read, if command
+                 returns nonzero status. The exception contains the end of
+                 the command stderr content.
+        """
+        return self._read_command(cmd, buf_size, stderr_limit=STDERR_LIMIT,
+                                  idle_timeout=True)
+
+    def exec_command_to_file(self, cmd, sink, buf_size=STREAM_BUF_SIZE):
+        """
+        Execute the specified command on the server and write its standard
+        output to the file-like object sink as it is read.
+
+        :returns: the number of bytes written to sink.
+        :raises: SSHExecCommandFailed like exec_command_stream.
+        """
+        size = 0
+        for chunk in self.exec_command_stream(cmd, buf_size):
+            sink.write(chunk)
+            size += len(chunk)
+        return size
 
     def test_connection_auth(self):
         """Raises an exception when we can not connect to server via ssh."""
@@ -10,6 +10,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import atexit
+
 import netaddr
 import re
 import time
@@ -22,6 +24,17 @@ from tempest import exceptions
 
 CONF = config.CONF
 
+# the ssh connections shared by the remote clients of the process
+_connection_cache = None
+
+
+def _get_connection_cache():
+    global _connection_cache
+    if _connection_cache is None:
+        _connection_cache = ssh.ConnectionCache(CONF.compute.ssh_idle_timeout)
+        atexit.register(_connection_cache.close_all)
+    return _connection_cache
+
 
 class RemoteClient():
 
@@ -41,13 +54,29 @@ class RemoteClient():
                     break
             else:
                 raise exceptions.ServerUnreachable()
+        connection_cache = None
+        if CONF.compute.ssh_idle_timeout > 0:
+            connection_cache = _get_connection_cache()
         self.ssh_client = ssh.Client(ip_address, username, password,
                                      ssh_timeout, pkey=pkey,
-                                     channel_timeout=ssh_channel_timeout)
+                                     channel_timeout=ssh_channel_timeout,
+                                     connection_cache=connection_cache)
 
     def exec_command(self, cmd):
         return self.ssh_client.exec_command(cmd)
 
+    def exec_command_stream(self, cmd):
+        return self.ssh_client.exec_command_stream(cmd)
+
+    def exec_command_to_file(self, cmd, sink):
+        return self.ssh_client.exec_command_to_file(cmd, sink)
+
+    def close(self):
+        """Closes the ssh connection to the server, shared with the other
+           remote clients of the server.
+        """
+        self.ssh_client.close()
+
     def validate_authentication(self):
         """Validate ssh connection and authentication
            This method raises an Exception when the validation fails.
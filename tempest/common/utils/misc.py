@@ -13,8 +13,14 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import contextlib
+import functools
 import inspect
 import re
+import sys
+import threading
+
+import six
 
 from tempest.openstack.common import log as logging
 
@@ -32,15 +38,58 @@ def singleton(cls):
     return getinstance
 
 
+_caller_context = threading.local()
+
+
+def get_test_caller():
+    """Return the caller name set for the current thread, if any."""
+    return getattr(_caller_context, 'name', None)
+
+
+def set_test_caller(name):
+    """Set the caller name for the current thread.
+
+    Returns the previous value so that it can be restored by the caller.
+    """
+    previous = get_test_caller()
+    _caller_context.name = name
+    return previous
+
+
+@contextlib.contextmanager
+def caller_context(name):
+    """Context manager attributing the calls made in its block to name."""
+    previous = set_test_caller(name)
+    try:
+        yield
+    finally:
+        set_test_caller(previous)
+
+
+def class_caller_context(func):
+    """Decorate a classmethod to attribute its calls to '<class>:<name>'."""
+    @functools.wraps(func)
+    def wrapper(cls, *args, **kwargs):
+        with caller_context(cls.__name__ + ':' + func.__name__):
+            return func(cls, *args, **kwargs)
+    return wrapper
+
+
 def find_test_caller():
     """Find the caller class and test name.
 
-    Because we know that the interesting things that call us are
+    The name set with set_test_caller or caller_context for the current
+    thread is returned when available, which is what tempest.test does for
+    setUpClass, the test methods and their cleanups.
+
+    Otherwise, because we know that the interesting things that call us are
     test_* methods, and various kinds of setUp / tearDown, we
     can look through the call stack to find appropriate methods,
     and the class we were in when those were called.
     """
-    caller_name = None
+    caller_name = get_test_caller()
+    if caller_name is not None:
+        return caller_name
     names = []
     frame = inspect.currentframe()
     is_cleanup = False
@@ -85,3 +134,44 @@ def find_test_caller():
     if caller_name is None:
         LOG.debug("Sane call name not found in %s" % names)
     return caller_name
+
+
+def run_concurrently(func, items, workers=1):
+    """Calls func on each item, from up to workers threads.
+
+    An item failing does not stop the others: once all of them are done,
+    the first exception raised by func is raised again.
+    """
+    items = list(items or [])
+    errors = []
+    if workers <= 1 or len(items) <= 1:
+        for item in items:
+            try:
+                func(item)
+            except Exception:
+                errors.append(sys.exc_info())
+    else:
+        lock = threading.Lock()
+        pending = iter(items)
+
+        def _worker():
+            while True:
+                with lock:
+                    try:
+                        item = next(pending)
+                    except StopIteration:
+                        return
+                try:
+                    func(item)
+                except Exception:
+                    with lock:
+                        errors.append(sys.exc_info())
+
+        threads = [threading.Thread(target=_worker)
+                   for _ in range(min(workers, len(items)))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    if errors:
+        six.reraise(*errors[0])
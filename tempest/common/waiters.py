@@ -11,8 +11,12 @@
 #    under the License.
 
 
+import sys
 import time
 
+import six
+
+from tempest.common import polling
 from tempest.common.utils import misc as misc_utils
 from tempest import config
 from tempest import exceptions
@@ -35,64 +39,168 @@ def wait_for_server_status(client, server_id, status, ready_wait=True,
     resp, body = client.get_server(server_id)
     old_status = server_status = body['status']
     old_task_state = task_state = _get_task_state(body)
-    start_time = int(time.time())
-    timeout = client.build_timeout + extra_timeout
-    while True:
-        # NOTE(afazekas): Now the BUILD status only reached
-        # between the UNKNOWN->ACTIVE transition.
-        # TODO(afazekas): enumerate and validate the stable status set
-        if status == 'BUILD' and server_status != 'UNKNOWN':
-            return
-        if server_status == status:
-            if ready_wait:
-                if status == 'BUILD':
-                    return
-                # NOTE(afazekas): The instance is in "ready for action state"
-                # when no task in progress
-                # NOTE(afazekas): Converted to string bacuse of the XML
-                # responses
-                if str(task_state) == "None":
-                    # without state api extension 3 sec usually enough
-                    time.sleep(CONF.compute.ready_wait)
-                    return
-            else:
+    policy = polling.PollingPolicy.for_client(client)
+    policy.timeout += extra_timeout
+    with policy.start('wait_for_server_status') as poll:
+        while True:
+            # NOTE(afazekas): Now the BUILD status only reached
+            # between the UNKNOWN->ACTIVE transition.
+            # TODO(afazekas): enumerate and validate the stable status set
+            if status == 'BUILD' and server_status != 'UNKNOWN':
                 return
+            if server_status == status:
+                if ready_wait:
+                    if status == 'BUILD':
+                        return
+                    # NOTE(afazekas): The instance is in "ready for action
+                    # state" when no task in progress
+                    # NOTE(afazekas): Converted to string bacuse of the XML
+                    # responses
+                    if str(task_state) == "None":
+                        break
+                else:
+                    return
+
+            poll.sleep()
+            resp, body = client.get_server(server_id)
+            server_status = body['status']
+            task_state = _get_task_state(body)
+            if (server_status != old_status) or (task_state != old_task_state):
+                LOG.info('State transition "%s" ==> "%s" after %d second wait',
+                         '/'.join((old_status, str(old_task_state))),
+                         '/'.join((server_status, str(task_state))),
+                         poll.elapsed)
+            if (server_status == 'ERROR') and raise_on_error:
+                if 'fault' in body:
+                    raise exceptions.BuildErrorException(body['fault'],
+                                                         server_id=server_id)
+                else:
+                    raise exceptions.BuildErrorException(server_id=server_id)
+
+            if poll.expired():
+                expected_task_state = 'None' if ready_wait else 'n/a'
+                message = ('Server %(server_id)s failed to reach %(status)s '
+                           'status and task state "%(expected_task_state)s" '
+                           'within the required time (%(timeout)s s).' %
+                           {'server_id': server_id,
+                            'status': status,
+                            'expected_task_state': expected_task_state,
+                            'timeout': policy.timeout})
+                message += ' Current status: %s.' % server_status
+                message += ' Current task state: %s.' % task_state
+                caller = misc_utils.find_test_caller()
+                if caller:
+                    message = '(%s) %s' % (caller, message)
+                raise exceptions.TimeoutException(message)
+            old_status = server_status
+            old_task_state = task_state
+    # without state api extension 3 sec usually enough
+    time.sleep(CONF.compute.ready_wait)
+
+
+def wait_for_resources(client, resource_ids, list_resources, check,
+                       description):
+    """Waits for many resources at once, with one list call per interval.
+
+    list_resources() returns a dict of the current resources by id, and
+    check(resource_id, resource) whether a resource is done waiting for.
+    resource is None if it was not listed. check may raise when a resource
+    failed: the others are still waited for, then the first error raised
+    by check is raised again.
+    Returns the ids of the resources, once all of them are done.
+    """
+    pending = set(resource_ids)
+    errors = []
+    policy = polling.PollingPolicy.for_client(client)
+    with policy.start('wait_for_resources') as poll:
+        while True:
+            resources = list_resources()
+            for resource_id in list(pending):
+                try:
+                    if not check(resource_id, resources.get(resource_id)):
+                        continue
+                except Exception as ex:
+                    LOG.error('%s of %s failed: %s' %
+                              (description, resource_id, ex))
+                    errors.append(sys.exc_info())
+                pending.discard(resource_id)
+            if not pending:
+                if errors:
+                    six.reraise(*errors[0])
+                return resource_ids
+
+            if poll.expired():
+                message = ('%(description)s not reached by %(pending)s within '
+                           'the required time (%(timeout)s s).' %
+                           {'description': description,
+                            'pending': ', '.join(sorted(pending)),
+                            'timeout': policy.timeout})
+                caller = misc_utils.find_test_caller()
+                if caller:
+                    message = '(%s) %s' % (caller, message)
+                if errors:
+                    LOG.error(message)
+                    six.reraise(*errors[0])
+                raise exceptions.TimeoutException(message)
+            poll.sleep()
+
+
+def _list_servers(client):
+    _, body = client.list_servers_with_detail()
+    return dict((server['id'], server) for server in body['servers'])
+
 
-        time.sleep(client.build_interval)
-        resp, body = client.get_server(server_id)
-        server_status = body['status']
-        task_state = _get_task_state(body)
-        if (server_status != old_status) or (task_state != old_task_state):
-            LOG.info('State transition "%s" ==> "%s" after %d second wait',
-                     '/'.join((old_status, str(old_task_state))),
-                     '/'.join((server_status, str(task_state))),
-                     time.time() - start_time)
+def wait_for_servers_status(client, server_ids, status, ready_wait=True,
+                            raise_on_error=True):
+    """Waits for several servers to reach a given status.
+
+    Same as wait_for_server_status, for all the servers at once with a
+    single list_servers_with_detail call per build_interval.
+    """
+
+    def _check(server_id, server):
+        if server is None:
+            # not listed yet
+            return False
+        server_status = server['status']
         if (server_status == 'ERROR') and raise_on_error:
-            if 'fault' in body:
-                raise exceptions.BuildErrorException(body['fault'],
+            if 'fault' in server:
+                raise exceptions.BuildErrorException(server['fault'],
                                                      server_id=server_id)
-            else:
-                raise exceptions.BuildErrorException(server_id=server_id)
-
-        timed_out = int(time.time()) - start_time >= timeout
-
-        if timed_out:
-            expected_task_state = 'None' if ready_wait else 'n/a'
-            message = ('Server %(server_id)s failed to reach %(status)s '
-                       'status and task state "%(expected_task_state)s" '
-                       'within the required time (%(timeout)s s).' %
-                       {'server_id': server_id,
-                        'status': status,
-                        'expected_task_state': expected_task_state,
-                        'timeout': timeout})
-            message += ' Current status: %s.' % server_status
-            message += ' Current task state: %s.' % task_state
-            caller = misc_utils.find_test_caller()
-            if caller:
-                message = '(%s) %s' % (caller, message)
-            raise exceptions.TimeoutException(message)
-        old_status = server_status
-        old_task_state = task_state
+            raise exceptions.BuildErrorException(server_id=server_id)
+        if status == 'BUILD':
+            return server_status != 'UNKNOWN'
+        if server_status != status:
+            return False
+        return (not ready_wait or
+                str(server.get('OS-EXT-STS:task_state', None)) == "None")
+
+    wait_for_resources(client, server_ids,
+                       lambda: _list_servers(client), _check,
+                       'Status %s' % status)
+    if ready_wait and status != 'BUILD':
+        # without state api extension 3 sec usually enough
+        time.sleep(CONF.compute.ready_wait)
+
+
+def wait_for_servers_termination(client, server_ids, ignore_error=False):
+    """Waits for several servers to be deleted.
+
+    Same as ServersClientJSON.wait_for_server_termination, for all the
+    servers at once with a single list_servers_with_detail call per
+    build_interval.
+    """
+
+    def _check(server_id, server):
+        if server is None:
+            return True
+        if server['status'] == 'ERROR' and not ignore_error:
+            raise exceptions.BuildErrorException(server_id=server_id)
+        return False
+
+    wait_for_resources(client, server_ids,
+                       lambda: _list_servers(client), _check,
+                       'Termination')
 
 
 def wait_for_image_status(client, image_id, status):
@@ -102,33 +210,33 @@ def wait_for_image_status(client, image_id, status):
     The client should also have build_interval and build_timeout attributes.
     """
     resp, image = client.get_image(image_id)
-    start = int(time.time())
-
-    while image['status'] != status:
-        time.sleep(client.build_interval)
-        resp, image = client.get_image(image_id)
-        status_curr = image['status']
-        if status_curr == 'ERROR':
-            raise exceptions.AddImageException(image_id=image_id)
-
-        # check the status again to avoid a false negative where we hit
-        # the timeout at the same time that the image reached the expected
-        # status
-        if status_curr == status:
-            return
-
-        if int(time.time()) - start >= client.build_timeout:
-            message = ('Image %(image_id)s failed to reach %(status)s state'
-                       '(current state %(status_curr)s) '
-                       'within the required time (%(timeout)s s).' %
-                       {'image_id': image_id,
-                        'status': status,
-                        'status_curr': status_curr,
-                        'timeout': client.build_timeout})
-            caller = misc_utils.find_test_caller()
-            if caller:
-                message = '(%s) %s' % (caller, message)
-            raise exceptions.TimeoutException(message)
+    policy = polling.PollingPolicy.for_client(client)
+    with policy.start('wait_for_image_status') as poll:
+        while image['status'] != status:
+            poll.sleep()
+            resp, image = client.get_image(image_id)
+            status_curr = image['status']
+            if status_curr == 'ERROR':
+                raise exceptions.AddImageException(image_id=image_id)
+
+            # check the status again to avoid a false negative where we hit
+            # the timeout at the same time that the image reached the
+            # expected status
+            if status_curr == status:
+                break
+
+            if poll.expired():
+                message = ('Image %(image_id)s failed to reach %(status)s '
+                           'state(current state %(status_curr)s) '
+                           'within the required time (%(timeout)s s).' %
+                           {'image_id': image_id,
+                            'status': status,
+                            'status_curr': status_curr,
+                            'timeout': policy.timeout})
+                caller = misc_utils.find_test_caller()
+                if caller:
+                    message = '(%s) %s' % (caller, message)
+                raise exceptions.TimeoutException(message)
 
 
 def wait_for_bm_node_status(client, node_id, attr, status):
@@ -137,24 +245,25 @@ def wait_for_bm_node_status(client, node_id, attr, status):
     The client should have a show_node(node_uuid) method to get the node.
     """
     _, node = client.show_node(node_id)
-    start = int(time.time())
-
-    while node[attr] != status:
-        time.sleep(client.build_interval)
-        _, node = client.show_node(node_id)
-        status_curr = node[attr]
-        if status_curr == status:
-            return
-
-        if int(time.time()) - start >= client.build_timeout:
-            message = ('Node %(node_id)s failed to reach %(attr)s=%(status)s '
-                       'within the required time (%(timeout)s s).' %
-                       {'node_id': node_id,
-                        'attr': attr,
-                        'status': status,
-                        'timeout': client.build_timeout})
-            message += ' Current state of %s: %s.' % (attr, status_curr)
-            caller = misc_utils.find_test_caller()
-            if caller:
-                message = '(%s) %s' % (caller, message)
-            raise exceptions.TimeoutException(message)
+    policy = polling.PollingPolicy.for_client(client)
+    with policy.start('wait_for_bm_node_status') as poll:
+        while node[attr] != status:
+            poll.sleep()
+            _, node = client.show_node(node_id)
+            status_curr = node[attr]
+            if status_curr == status:
+                break
+
+            if poll.expired():
+                message = ('Node %(node_id)s failed to reach '
+                           '%(attr)s=%(status)s '
+                           'within the required time (%(timeout)s s).' %
+                           {'node_id': node_id,
+                            'attr': attr,
+                            'status': status,
+                            'timeout': policy.timeout})
+                message += ' Current state of %s: %s.' % (attr, status_curr)
+                caller = misc_utils.find_test_caller()
+                if caller:
+                    message = '(%s) %s' % (caller, message)
+                raise exceptions.TimeoutException(message)
@@ -59,6 +59,19 @@ AuthGroup = [
                      "It requires at least `2 * CONC` distinct accounts "
                      "configured in `test_accounts_file`, with CONC == the "
                      "number of concurrent test processes."),
+    cfg.IntOpt('isolated_creds_pool_size',
+               default=0,
+               help="With tenant isolation, number of isolated credentials, "
+                    "with their network resources, each test process keeps "
+                    "ready in advance for each kind of credentials. The "
+                    "test classes then do not wait for their creation. 0 "
+                    "creates them on demand."),
+    cfg.BoolOpt('defer_isolated_creds_cleanup',
+                default=False,
+                help="With tenant isolation, delete the isolated "
+                     "credentials of the test classes from a background "
+                     "thread, rather than in their tearDownClass. The test "
+                     "processes wait for the deletions at exit."),
 ]
 
 identity_group = cfg.OptGroup(name='identity',
@@ -75,6 +88,32 @@ IdentityGroup = [
                default=None,
                help='Specify a CA bundle file to use in verifying a '
                     'TLS (https) server certificate.'),
+    cfg.BoolOpt('http_keepalive',
+                default=True,
+                help="Reuse HTTP connections between requests made by the "
+                     "rest clients. If False, every request opens a new "
+                     "connection which is closed once the response is "
+                     "received."),
+    cfg.IntOpt('http_pool_size',
+               default=10,
+               help="Maximum number of idle HTTP connections kept open per "
+                    "endpoint when http_keepalive is enabled."),
+    cfg.IntOpt('http_pool_idle_timeout',
+               default=60,
+               help="Time in seconds after which an idle HTTP connection is "
+                    "closed instead of being reused."),
+    cfg.BoolOpt('shared_token_cache',
+                default=True,
+                help="Share tokens and service catalogs between all the "
+                     "auth providers of a process which use the same "
+                     "credentials, instead of authenticating once per "
+                     "auth provider."),
+    cfg.BoolOpt('persistent_token_cache',
+                default=False,
+                help="Also store the shared tokens in files under lock_path, "
+                     "so that concurrent test processes on the same host "
+                     "reuse them. Tokens are stored in clear text. Requires "
+                     "shared_token_cache."),
     cfg.StrOpt('uri',
                help="Full URI of the OpenStack Identity API (Keystone), v2"),
     cfg.StrOpt('uri_v3',
@@ -149,6 +188,25 @@ IdentityFeatureGroup = [
                 help='Is the v3 identity API enabled'),
 ]
 
+# Options of the waiters, in the groups of the services with build_interval
+PollingGroup = [
+    cfg.FloatOpt('polling_initial_interval',
+                 help="Time in seconds between the first two status checks "
+                      "of a waiter. Defaults to build_interval."),
+    cfg.FloatOpt('polling_backoff_factor',
+                 default=1.0,
+                 help="Factor the time between status checks is multiplied "
+                      "by after each check. 1.0 keeps the interval "
+                      "constant."),
+    cfg.FloatOpt('polling_max_interval',
+                 help="Maximum time in seconds between status checks. "
+                      "Defaults to build_interval."),
+    cfg.FloatOpt('polling_jitter',
+                 default=0.0,
+                 help="Random fraction of the interval added or removed at "
+                      "each status check, to spread concurrent waiters."),
+]
+
 compute_group = cfg.OptGroup(name='compute',
                              title='Compute Service Options')
 
@@ -223,6 +281,12 @@ ComputeGroup = [
                default=60,
                help="Timeout in seconds to wait for output from ssh "
                     "channel."),
+    cfg.IntOpt('ssh_idle_timeout',
+               default=60,
+               help="Time in seconds an ssh connection to a server is kept "
+                    "open between commands. The connection is shared by "
+                    "the remote clients of the server. 0 opens a new "
+                    "connection for each command."),
     cfg.StrOpt('fixed_network_name',
                default='private',
                help="Name of the fixed network that is visible to all test "
@@ -271,7 +335,7 @@ ComputeGroup = [
                     'test the floating IP bulk feature for CRUD operation. '
                     'This block must not overlap an existing floating IP '
                     'pool.')
-]
+] + PollingGroup
 
 compute_features_group = cfg.OptGroup(name='compute-feature-enabled',
                                       title="Enabled Compute Service Features")
@@ -442,7 +506,7 @@ NetworkGroup = [
                 default=["8.8.8.8", "8.8.4.4"],
                 help="List of dns servers which should be used"
                      " for subnet creation")
-]
+] + PollingGroup
 
 network_feature_group = cfg.OptGroup(name='network-feature-enabled',
                                      title='Enabled network service features')
@@ -542,7 +606,7 @@ VolumeGroup = [
     cfg.IntOpt('volume_size',
                default=1,
                help='Default size in GB for volumes created by volumes tests'),
-]
+] + PollingGroup
 
 volume_feature_group = cfg.OptGroup(name='volume-feature-enabled',
                                     title='Enabled Cinder Features')
@@ -681,7 +745,7 @@ OrchestrationGroup = [
     cfg.IntOpt('max_resources_per_stack',
                default=1000,
                help="Value must match heat configuration of the same name."),
-]
+] + PollingGroup
 
 
 telemetry_group = cfg.OptGroup(name='telemetry',
@@ -830,7 +894,15 @@ StressGroup = [
                 default=False,
                 help='Allows a full cleaning process after a stress test.'
                      ' Caution : this cleanup will remove every objects of'
-                     ' every tenant.')
+                     ' every tenant.'),
+    cfg.IntOpt('metrics_interval',
+               default=10,
+               help='Time (in seconds) between the reports of the throughput'
+                    ' and latency of each action during a stress test.'),
+    cfg.StrOpt('metrics_file',
+               help='File where the periodic reports of each action are'
+                    ' written, as CSV when its name ends with .csv, as'
+                    ' JSON lines otherwise.')
 ]
 
 
@@ -938,7 +1010,23 @@ Expected values for this field are:
 
 If nothing is specified, this feature is not enabled. To trace everything
 specify .* as the regex.
-""")
+"""),
+    cfg.StrOpt('api_stats_dir',
+               default='',
+               help="Directory where the latency statistics of the API "
+                    "requests are dumped by each process at exit, to be "
+                    "reported with tempest-api-stats. If nothing is "
+                    "specified, no statistics are collected."),
+    cfg.FloatOpt('schema_validation_rate',
+                 default=1.0,
+                 help="Fraction of the responses whose body and headers are "
+                      "validated against their schema, e.g. to reduce the "
+                      "client CPU cost when tempest clients drive a load. "
+                      "The status code is always checked."),
+    cfg.IntOpt('schema_validation_first',
+               default=0,
+               help="Number of responses of each schema validated by each "
+                    "process before schema_validation_rate applies."),
 ]
 
 input_scenario_group = cfg.OptGroup(name="input-scenario",
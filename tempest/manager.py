@@ -14,12 +14,36 @@
 #    under the License.
 
 from tempest import auth
+from tempest.common import rest_client
 from tempest import config
 from tempest import exceptions
 
 CONF = config.CONF
 
 
+class lazy_client(object):
+
+    """
+    Build a client of a Manager on first access
+
+    Decorates a Manager method which builds and returns a client. The
+    client is stored as an instance attribute with the method name, so
+    further accesses do not go through the descriptor.
+    """
+
+    def __init__(self, factory):
+        self.factory = factory
+        self.name = factory.__name__
+        self.__doc__ = factory.__doc__
+
+    def __get__(self, manager, owner):
+        if manager is None:
+            return self
+        client = self.factory(manager)
+        manager.set_client(self.name, client)
+        return client
+
+
 class Manager(object):
 
     """
@@ -45,10 +69,26 @@ class Manager(object):
         # Check if passed or default credentials are valid
         if not self.credentials.is_valid():
             raise exceptions.InvalidCredentials()
+        # One pooled HTTP transport is shared by all the clients of the
+        # manager, so that connections to the same endpoint are reused.
+        # Without keepalive the transport is a plain httplib2.Http, which is
+        # not thread safe, so each client builds its own.
+        self.http_obj = None
+        if CONF.identity.http_keepalive:
+            self.http_obj = rest_client.build_http_obj()
         # Creates an auth provider for the credentials
         self.auth_provider = self.get_auth_provider(self.credentials)
-        # FIXME(andreaf) unused
-        self.client_attr_names = []
+        self.client_attr_names = self.get_client_attr_names()
+
+    @classmethod
+    def get_client_attr_names(cls):
+        """Names of the clients which can be built by the manager"""
+        return sorted(name for name in dir(cls)
+                      if isinstance(getattr(cls, name), lazy_client))
+
+    def instantiated_clients(self):
+        """Names of the clients which have been built so far"""
+        return [name for name in self.client_attr_names if name in vars(self)]
 
     @classmethod
     def get_auth_provider_class(cls, credentials):
@@ -62,6 +102,16 @@ class Manager(object):
             raise exceptions.InvalidCredentials(
                 'Credentials must be specified')
         auth_provider_class = self.get_auth_provider_class(credentials)
-        return auth_provider_class(
+        auth_provider = auth_provider_class(
             interface=getattr(self, 'interface', None),
             credentials=credentials)
+        if self.http_obj is not None:
+            auth_provider.auth_client.http_obj = self.http_obj
+        return auth_provider
+
+    def set_client(self, name, client):
+        """Store a client, making it use the manager's HTTP transport"""
+        # NOTE: only rest clients have an HTTP transport to replace
+        if self.http_obj is not None and hasattr(client, '_http_obj'):
+            client.http_obj = self.http_obj
+        setattr(self, name, client)
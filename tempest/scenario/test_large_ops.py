@@ -15,6 +15,7 @@
 from tempest_lib import exceptions
 
 from tempest.common.utils import data_utils
+from tempest.common import waiters
 from tempest import config
 from tempest.openstack.common import log as logging
 from tempest.scenario import manager
@@ -63,10 +64,11 @@ class TestLargeOpsScenario(manager.ScenarioTest):
         cls._cleanup_resources.append((function, arguments, keywordArguments))
 
     def _wait_for_server_status(self, status):
-        for server in self.servers:
-            # Make sure nova list keeps working throughout the build process
-            self.servers_client.list_servers()
-            self.servers_client.wait_for_server_status(server['id'], status)
+        # Waiting for all the servers at once also makes sure that nova list
+        # keeps working throughout the build process
+        waiters.wait_for_servers_status(
+            self.servers_client, [server['id'] for server in self.servers],
+            status)
 
     def nova_boot(self):
         name = data_utils.rand_name('scenario-server-')
@@ -89,12 +91,11 @@ class TestLargeOpsScenario(manager.ScenarioTest):
         params = {'name': name}
         _, server_list = self.servers_client.list_servers(params)
         self.servers = server_list['servers']
-        for server in self.servers:
-            # after deleting all servers - wait for all servers to clear
-            # before cleanup continues
-            self.addCleanupClass(self.servers_client.
-                                 wait_for_server_termination,
-                                 server['id'])
+        # after deleting all servers - wait for all servers to clear
+        # before cleanup continues
+        self.addCleanupClass(waiters.wait_for_servers_termination,
+                             self.servers_client,
+                             [server['id'] for server in self.servers])
         for server in self.servers:
             self.addCleanupClass(self.servers_client.delete_server,
                                  server['id'])
@@ -23,6 +23,8 @@ class ComputeClient(rest_client.RestClient):
     Base compute client class
     """
 
+    polling_group = 'compute'
+
     def __init__(self, auth_provider,
                  build_interval=None, build_timeout=None):
         if build_interval is None:
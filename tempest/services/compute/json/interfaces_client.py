@@ -14,11 +14,11 @@
 #    under the License.
 
 import json
-import time
 
 from tempest.api_schema.response.compute import interfaces as common_schema
 from tempest.api_schema.response.compute import servers as servers_schema
 from tempest.api_schema.response.compute.v2 import interfaces as schema
+from tempest.common import polling
 from tempest import exceptions
 from tempest.services.compute.json import base
 
@@ -62,21 +62,20 @@ class InterfacesClientJSON(base.ComputeClient):
         """Waits for a interface to reach a given status."""
         resp, body = self.show_interface(server, port_id)
         interface_status = body['port_state']
-        start = int(time.time())
+        policy = polling.PollingPolicy.for_client(self)
+        with policy.start('wait_for_interface_status') as poll:
+            while(interface_status != status):
+                poll.sleep()
+                resp, body = self.show_interface(server, port_id)
+                interface_status = body['port_state']
 
-        while(interface_status != status):
-            time.sleep(self.build_interval)
-            resp, body = self.show_interface(server, port_id)
-            interface_status = body['port_state']
-
-            timed_out = int(time.time()) - start >= self.build_timeout
-
-            if interface_status != status and timed_out:
-                message = ('Interface %s failed to reach %s status '
-                           '(current %s) within the required time (%s s).' %
-                           (port_id, status, interface_status,
-                            self.build_timeout))
-                raise exceptions.TimeoutException(message)
+                if interface_status != status and poll.expired():
+                    message = ('Interface %s failed to reach %s status '
+                               '(current %s) within the required time '
+                               '(%s s).' %
+                               (port_id, status, interface_status,
+                                policy.timeout))
+                    raise exceptions.TimeoutException(message)
 
         return resp, body
 
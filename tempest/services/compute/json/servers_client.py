@@ -15,11 +15,11 @@
 #    under the License.
 
 import json
-import time
 import urllib
 
 from tempest.api_schema.response.compute import servers as common_schema
 from tempest.api_schema.response.compute.v2 import servers as schema
+from tempest.common import polling
 from tempest.common import waiters
 from tempest import config
 from tempest import exceptions
@@ -179,21 +179,22 @@ class ServersClientJSON(base.ComputeClient):
 
     def wait_for_server_termination(self, server_id, ignore_error=False):
         """Waits for server to reach termination."""
-        start_time = int(time.time())
-        while True:
-            try:
-                resp, body = self.get_server(server_id)
-            except exceptions.NotFound:
-                return
-
-            server_status = body['status']
-            if server_status == 'ERROR' and not ignore_error:
-                raise exceptions.BuildErrorException(server_id=server_id)
-
-            if int(time.time()) - start_time >= self.build_timeout:
-                raise exceptions.TimeoutException
-
-            time.sleep(self.build_interval)
+        policy = polling.PollingPolicy.for_client(self)
+        with policy.start('wait_for_server_termination') as poll:
+            while True:
+                try:
+                    resp, body = self.get_server(server_id)
+                except exceptions.NotFound:
+                    return
+
+                server_status = body['status']
+                if server_status == 'ERROR' and not ignore_error:
+                    raise exceptions.BuildErrorException(server_id=server_id)
+
+                if poll.expired():
+                    raise exceptions.TimeoutException
+
+                poll.sleep()
 
     def list_addresses(self, server_id):
         """Lists all addresses for a server."""
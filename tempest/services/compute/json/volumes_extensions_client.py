@@ -14,10 +14,10 @@
 #    under the License.
 
 import json
-import time
 import urllib
 
 from tempest.api_schema.response.compute.v2 import volumes as schema
+from tempest.common import polling
 from tempest import config
 from tempest import exceptions
 from tempest.services.compute.json import base
@@ -27,6 +27,8 @@ CONF = config.CONF
 
 class VolumesExtensionsClientJSON(base.ComputeClient):
 
+    polling_group = 'volume'
+
     def __init__(self, auth_provider):
         super(VolumesExtensionsClientJSON, self).__init__(
             auth_provider,
@@ -92,21 +94,23 @@ class VolumesExtensionsClientJSON(base.ComputeClient):
         """Waits for a Volume to reach a given status."""
         resp, body = self.get_volume(volume_id)
         volume_status = body['status']
-        start = int(time.time())
-
-        while volume_status != status:
-            time.sleep(self.build_interval)
-            resp, body = self.get_volume(volume_id)
-            volume_status = body['status']
-            if volume_status == 'error':
-                raise exceptions.VolumeBuildErrorException(volume_id=volume_id)
-
-            if int(time.time()) - start >= self.build_timeout:
-                message = ('Volume %s failed to reach %s status (current %s) '
-                           'within the required time (%s s).' %
-                           (volume_id, status, volume_status,
-                            self.build_timeout))
-                raise exceptions.TimeoutException(message)
+        policy = polling.PollingPolicy.for_client(self)
+        with policy.start('wait_for_volume_status') as poll:
+            while volume_status != status:
+                poll.sleep()
+                resp, body = self.get_volume(volume_id)
+                volume_status = body['status']
+                if volume_status == 'error':
+                    raise exceptions.VolumeBuildErrorException(
+                        volume_id=volume_id)
+
+                if volume_status != status and poll.expired():
+                    message = ('Volume %s failed to reach %s status '
+                               '(current %s) within the required time '
+                               '(%s s).' %
+                               (volume_id, status, volume_status,
+                                policy.timeout))
+                    raise exceptions.TimeoutException(message)
 
     def is_resource_deleted(self, id):
         try:
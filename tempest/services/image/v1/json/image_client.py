@@ -17,10 +17,10 @@ import copy
 import errno
 import json
 import os
-import time
 import urllib
 
 from tempest.common import glance_http
+from tempest.common import polling
 from tempest.common import rest_client
 from tempest.common.utils import misc as misc_utils
 from tempest import config
@@ -287,30 +287,29 @@ class ImageClientJSON(rest_client.RestClient):
     # NOTE(afazkas): Wait reinvented again. It is not in the correct layer
     def wait_for_image_status(self, image_id, status):
         """Waits for a Image to reach a given status."""
-        start_time = time.time()
-        old_value = value = self._get_image_status(image_id)
-        while True:
-            dtime = time.time() - start_time
-            time.sleep(self.build_interval)
-            if value != old_value:
-                LOG.info('Value transition from "%s" to "%s"'
-                         'in %d second(s).', old_value,
-                         value, dtime)
-            if value == status:
-                return value
-
-            if value == 'killed':
-                raise exceptions.ImageKilledException(image_id=image_id,
-                                                      status=status)
-            if dtime > self.build_timeout:
-                message = ('Time Limit Exceeded! (%ds)'
-                           'while waiting for %s, '
-                           'but we got %s.' %
-                           (self.build_timeout, status, value))
-                caller = misc_utils.find_test_caller()
-                if caller:
-                    message = '(%s) %s' % (caller, message)
-                raise exceptions.TimeoutException(message)
-            time.sleep(self.build_interval)
-            old_value = value
-            value = self._get_image_status(image_id)
+        policy = polling.PollingPolicy.for_client(self)
+        with policy.start('wait_for_image_status') as poll:
+            old_value = value = self._get_image_status(image_id)
+            while True:
+                if value != old_value:
+                    LOG.info('Value transition from "%s" to "%s"'
+                             'in %d second(s).', old_value,
+                             value, poll.elapsed)
+                if value == status:
+                    return value
+
+                if value == 'killed':
+                    raise exceptions.ImageKilledException(image_id=image_id,
+                                                          status=status)
+                if poll.expired():
+                    message = ('Time Limit Exceeded! (%ds)'
+                               'while waiting for %s, '
+                               'but we got %s.' %
+                               (policy.timeout, status, value))
+                    caller = misc_utils.find_test_caller()
+                    if caller:
+                        message = '(%s) %s' % (caller, message)
+                    raise exceptions.TimeoutException(message)
+                poll.sleep()
+                old_value = value
+                value = self._get_image_status(image_id)
@@ -140,6 +140,31 @@ class ImageClientV2JSON(rest_client.RestClient):
         self.expected_success(200, resp.status)
         return resp, body
 
+    def get_image_file_iter(self, image_id):
+        """Returns an iterator over the chunks of the image data, read as
+        they are consumed.
+        """
+        url = 'v2/images/%s/file' % image_id
+        resp, body_iter = self.http.raw_request('GET', url)
+        self._error_checker('GET', url, {}, None, resp, body_iter)
+        self.expected_success(200, resp.status)
+        return resp, body_iter
+
+    def download_image_file(self, image_id, dest):
+        """Writes the image data to the file-like dest as it is read.
+
+        :returns: the response and the md5 checksum of the data, which is
+                  checked against the Content-MD5 header when there is one.
+        """
+        resp, body_iter = self.get_image_file_iter(image_id)
+        _, checksum = glance_http.write_body(body_iter, dest)
+        expected_checksum = resp.getheader('content-md5', None)
+        if expected_checksum and expected_checksum != checksum:
+            msg = ("Checksum of image %s data is %s, expected %s" %
+                   (image_id, checksum, expected_checksum))
+            raise exceptions.InvalidHTTPResponseBody(msg)
+        return resp, checksum
+
     def add_image_tag(self, image_id, tag):
         url = 'v2/images/%s/tags/%s' % (image_id, tag)
         resp, body = self.put(url, body=None)
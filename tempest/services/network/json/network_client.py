@@ -11,9 +11,9 @@
 #    under the License.
 
 import json
-import time
 import urllib
 
+from tempest.common import polling
 from tempest.common import rest_client
 from tempest.common.utils import misc
 from tempest import config
@@ -37,6 +37,8 @@ class NetworkClientJSON(rest_client.RestClient):
     quotas
     """
 
+    polling_group = 'network'
+
     def __init__(self, auth_provider):
         super(NetworkClientJSON, self).__init__(
             auth_provider,
@@ -208,13 +210,14 @@ class NetworkClientJSON(rest_client.RestClient):
 
     def wait_for_resource_deletion(self, resource_type, id):
         """Waits for a resource to be deleted."""
-        start_time = int(time.time())
-        while True:
-            if self.is_resource_deleted(resource_type, id):
-                return
-            if int(time.time()) - start_time >= self.build_timeout:
-                raise exceptions.TimeoutException
-            time.sleep(self.build_interval)
+        policy = polling.PollingPolicy.for_client(self)
+        with policy.start('wait_for_resource_deletion') as poll:
+            while True:
+                if self.is_resource_deleted(resource_type, id):
+                    return
+                if poll.expired():
+                    raise exceptions.TimeoutException
+                poll.sleep()
 
     def is_resource_deleted(self, resource_type, id):
         method = 'show_' + resource_type
@@ -241,27 +244,29 @@ class NetworkClientJSON(rest_client.RestClient):
           to reach the desired status
         @type timeout: Integer
         """
-        if not interval:
-            interval = self.build_interval
-        if not timeout:
-            timeout = self.build_timeout
-        start_time = time.time()
-
-        while time.time() - start_time <= timeout:
-            resource = fetch()
-            if resource['status'] == status:
-                return
-            time.sleep(interval)
-
-        # At this point, the wait has timed out
-        message = 'Resource %s' % (str(resource))
-        message += ' failed to reach status %s' % status
-        message += ' (current: %s)' % resource['status']
-        message += ' within the required time %s' % timeout
-        caller = misc.find_test_caller()
-        if caller:
-            message = '(%s) %s' % (caller, message)
-        raise exceptions.TimeoutException(message)
+        policy = polling.PollingPolicy.for_client(self)
+        if interval:
+            policy.interval = policy.max_interval = interval
+        if timeout:
+            policy.timeout = timeout
+        with policy.start('wait_for_resource_status') as poll:
+            while True:
+                resource = fetch()
+                if resource['status'] == status:
+                    return
+                if poll.expired():
+                    break
+                poll.sleep()
+
+            # At this point, the wait has timed out
+            message = 'Resource %s' % (str(resource))
+            message += ' failed to reach status %s' % status
+            message += ' (current: %s)' % resource['status']
+            message += ' within the required time %s' % policy.timeout
+            caller = misc.find_test_caller()
+            if caller:
+                message = '(%s) %s' % (caller, message)
+            raise exceptions.TimeoutException(message)
 
     def deserialize_single(self, body):
         return json.loads(body)
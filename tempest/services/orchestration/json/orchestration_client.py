@@ -15,9 +15,9 @@
 
 import json
 import re
-import time
 import urllib
 
+from tempest.common import polling
 from tempest.common import rest_client
 from tempest import config
 from tempest import exceptions
@@ -27,6 +27,8 @@ CONF = config.CONF
 
 class OrchestrationClient(rest_client.RestClient):
 
+    polling_group = 'orchestration'
+
     def __init__(self, auth_provider):
         super(OrchestrationClient, self).__init__(
             auth_provider,
@@ -164,68 +166,71 @@ class OrchestrationClient(rest_client.RestClient):
     def wait_for_resource_status(self, stack_identifier, resource_name,
                                  status, failure_pattern='^.*_FAILED$'):
         """Waits for a Resource to reach a given status."""
-        start = int(time.time())
+        policy = polling.PollingPolicy.for_client(self)
         fail_regexp = re.compile(failure_pattern)
-
-        while True:
-            try:
-                resp, body = self.get_resource(
-                    stack_identifier, resource_name)
-            except exceptions.NotFound:
-                # ignore this, as the resource may not have
-                # been created yet
-                pass
-            else:
-                resource_name = body['resource_name']
-                resource_status = body['resource_status']
-                if resource_status == status:
-                    return
-                if fail_regexp.search(resource_status):
-                    raise exceptions.StackResourceBuildErrorException(
-                        resource_name=resource_name,
-                        stack_identifier=stack_identifier,
-                        resource_status=resource_status,
-                        resource_status_reason=body['resource_status_reason'])
-
-            if int(time.time()) - start >= self.build_timeout:
-                message = ('Resource %s failed to reach %s status '
-                           '(current %s) within the required time (%s s).' %
-                           (resource_name,
-                            status,
-                            resource_status,
-                            self.build_timeout))
-                raise exceptions.TimeoutException(message)
-            time.sleep(self.build_interval)
+        with policy.start('wait_for_resource_status') as poll:
+            while True:
+                try:
+                    resp, body = self.get_resource(
+                        stack_identifier, resource_name)
+                except exceptions.NotFound:
+                    # ignore this, as the resource may not have
+                    # been created yet
+                    pass
+                else:
+                    resource_name = body['resource_name']
+                    resource_status = body['resource_status']
+                    if resource_status == status:
+                        return
+                    if fail_regexp.search(resource_status):
+                        raise exceptions.StackResourceBuildErrorException(
+                            resource_name=resource_name,
+                            stack_identifier=stack_identifier,
+                            resource_status=resource_status,
+                            resource_status_reason=body[
+                                'resource_status_reason'])
+
+                if poll.expired():
+                    message = ('Resource %s failed to reach %s status '
+                               '(current %s) within the required time '
+                               '(%s s).' %
+                               (resource_name,
+                                status,
+                                resource_status,
+                                policy.timeout))
+                    raise exceptions.TimeoutException(message)
+                poll.sleep()
 
     def wait_for_stack_status(self, stack_identifier, status,
                               failure_pattern='^.*_FAILED$'):
         """Waits for a Stack to reach a given status."""
-        start = int(time.time())
+        policy = polling.PollingPolicy.for_client(self)
         fail_regexp = re.compile(failure_pattern)
-
-        while True:
-            try:
-                resp, body = self.get_stack(stack_identifier)
-            except exceptions.NotFound:
-                if status == 'DELETE_COMPLETE':
-                    return
-            stack_name = body['stack_name']
-            stack_status = body['stack_status']
-            if stack_status == status:
-                return body
-            if fail_regexp.search(stack_status):
-                raise exceptions.StackBuildErrorException(
-                    stack_identifier=stack_identifier,
-                    stack_status=stack_status,
-                    stack_status_reason=body['stack_status_reason'])
-
-            if int(time.time()) - start >= self.build_timeout:
-                message = ('Stack %s failed to reach %s status (current: %s) '
-                           'within the required time (%s s).' %
-                           (stack_name, status, stack_status,
-                            self.build_timeout))
-                raise exceptions.TimeoutException(message)
-            time.sleep(self.build_interval)
+        with policy.start('wait_for_stack_status') as poll:
+            while True:
+                try:
+                    resp, body = self.get_stack(stack_identifier)
+                except exceptions.NotFound:
+                    if status == 'DELETE_COMPLETE':
+                        return
+                stack_name = body['stack_name']
+                stack_status = body['stack_status']
+                if stack_status == status:
+                    return body
+                if fail_regexp.search(stack_status):
+                    raise exceptions.StackBuildErrorException(
+                        stack_identifier=stack_identifier,
+                        stack_status=stack_status,
+                        stack_status_reason=body['stack_status_reason'])
+
+                if poll.expired():
+                    message = ('Stack %s failed to reach %s status '
+                               '(current: %s) within the required time '
+                               '(%s s).' %
+                               (stack_name, status, stack_status,
+                                policy.timeout))
+                    raise exceptions.TimeoutException(message)
+                poll.sleep()
 
     def show_resource_metadata(self, stack_identifier, resource_name):
         """Returns the resource's metadata."""
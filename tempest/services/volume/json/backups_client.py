@@ -14,8 +14,8 @@
 #    under the License.
 
 import json
-import time
 
+from tempest.common import polling
 from tempest import exceptions
 from tempest.services.volume.json import base
 
@@ -76,21 +76,22 @@ class BaseBackupsClientJSON(base.VolumeClient):
         """Waits for a Backup to reach a given status."""
         resp, body = self.get_backup(backup_id)
         backup_status = body['status']
-        start = int(time.time())
+        policy = polling.PollingPolicy.for_client(self)
+        with policy.start('wait_for_backup_status') as poll:
+            while backup_status != status:
+                poll.sleep()
+                resp, body = self.get_backup(backup_id)
+                backup_status = body['status']
+                if backup_status == 'error':
+                    raise exceptions.VolumeBackupException(backup_id=backup_id)
 
-        while backup_status != status:
-            time.sleep(self.build_interval)
-            resp, body = self.get_backup(backup_id)
-            backup_status = body['status']
-            if backup_status == 'error':
-                raise exceptions.VolumeBackupException(backup_id=backup_id)
-
-            if int(time.time()) - start >= self.build_timeout:
-                message = ('Volume backup %s failed to reach %s status '
-                           '(current %s) within the required time (%s s).' %
-                           (backup_id, status, backup_status,
-                            self.build_timeout))
-                raise exceptions.TimeoutException(message)
+                if backup_status != status and poll.expired():
+                    message = ('Volume backup %s failed to reach %s status '
+                               '(current %s) within the required time '
+                               '(%s s).' %
+                               (backup_id, status, backup_status,
+                                policy.timeout))
+                    raise exceptions.TimeoutException(message)
 
 
 class BackupsClientJSON(BaseBackupsClientJSON):
@@ -23,6 +23,8 @@ class VolumeClient(rest_client.RestClient):
     Base volume client class
     """
 
+    polling_group = 'volume'
+
     def __init__(self, auth_provider):
         super(VolumeClient, self).__init__(
             auth_provider,
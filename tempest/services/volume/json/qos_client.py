@@ -13,8 +13,8 @@
 #    under the License.
 
 import json
-import time
 
+from tempest.common import polling
 from tempest import exceptions
 from tempest.services.volume.json import base
 
@@ -43,30 +43,33 @@ class BaseQosSpecsClientJSON(base.VolumeClient):
         args = volume-type-id disassociated when operation = 'disassociate'
         args = None when operation = 'disassociate-all'
         """
-        start_time = int(time.time())
-        while True:
-            if operation == 'qos-key-unset':
-                resp, body = self.get_qos(qos_id)
-                self.expected_success(200, resp.status)
-                if not any(key in body['specs'] for key in args):
-                    return
-            elif operation == 'disassociate':
-                resp, body = self.get_association_qos(qos_id)
-                self.expected_success(200, resp.status)
-                if not any(args in body[i]['id'] for i in range(0, len(body))):
-                    return
-            elif operation == 'disassociate-all':
-                resp, body = self.get_association_qos(qos_id)
-                self.expected_success(200, resp.status)
-                if not body:
-                    return
-            else:
-                msg = (" operation value is either not defined or incorrect.")
-                raise exceptions.UnprocessableEntity(msg)
-
-            if int(time.time()) - start_time >= self.build_timeout:
-                raise exceptions.TimeoutException
-            time.sleep(self.build_interval)
+        policy = polling.PollingPolicy.for_client(self)
+        with policy.start('wait_for_qos_operations') as poll:
+            while True:
+                if operation == 'qos-key-unset':
+                    resp, body = self.get_qos(qos_id)
+                    self.expected_success(200, resp.status)
+                    if not any(key in body['specs'] for key in args):
+                        return
+                elif operation == 'disassociate':
+                    resp, body = self.get_association_qos(qos_id)
+                    self.expected_success(200, resp.status)
+                    if not any(args in body[i]['id']
+                               for i in range(0, len(body))):
+                        return
+                elif operation == 'disassociate-all':
+                    resp, body = self.get_association_qos(qos_id)
+                    self.expected_success(200, resp.status)
+                    if not body:
+                        return
+                else:
+                    msg = (" operation value is either not defined or "
+                           "incorrect.")
+                    raise exceptions.UnprocessableEntity(msg)
+
+                if poll.expired():
+                    raise exceptions.TimeoutException
+                poll.sleep()
 
     def create_qos(self, name, consumer, **kwargs):
         """Create a QoS Specification.
@@ -11,9 +11,9 @@
 #    under the License.
 
 import json
-import time
 import urllib
 
+from tempest.common import polling
 from tempest import exceptions
 from tempest.openstack.common import log as logging
 from tempest.services.volume.json import base
@@ -96,27 +96,26 @@ class BaseSnapshotsClientJSON(base.VolumeClient):
     # NOTE(afazkas): Wait reinvented again. It is not in the correct layer
     def wait_for_snapshot_status(self, snapshot_id, status):
         """Waits for a Snapshot to reach a given status."""
-        start_time = time.time()
-        old_value = value = self._get_snapshot_status(snapshot_id)
-        while True:
-            dtime = time.time() - start_time
-            time.sleep(self.build_interval)
-            if value != old_value:
-                LOG.info('Value transition from "%s" to "%s"'
-                         'in %d second(s).', old_value,
-                         value, dtime)
-            if (value == status):
-                return value
-
-            if dtime > self.build_timeout:
-                message = ('Time Limit Exceeded! (%ds)'
-                           'while waiting for %s, '
-                           'but we got %s.' %
-                           (self.build_timeout, status, value))
-                raise exceptions.TimeoutException(message)
-            time.sleep(self.build_interval)
-            old_value = value
-            value = self._get_snapshot_status(snapshot_id)
+        policy = polling.PollingPolicy.for_client(self)
+        with policy.start('wait_for_snapshot_status') as poll:
+            old_value = value = self._get_snapshot_status(snapshot_id)
+            while True:
+                if value != old_value:
+                    LOG.info('Value transition from "%s" to "%s"'
+                             'in %d second(s).', old_value,
+                             value, poll.elapsed)
+                if (value == status):
+                    return value
+
+                if poll.expired():
+                    message = ('Time Limit Exceeded! (%ds)'
+                               'while waiting for %s, '
+                               'but we got %s.' %
+                               (policy.timeout, status, value))
+                    raise exceptions.TimeoutException(message)
+                poll.sleep()
+                old_value = value
+                value = self._get_snapshot_status(snapshot_id)
 
     def delete_snapshot(self, snapshot_id):
         """Delete Snapshot."""
@@ -64,6 +64,10 @@ class UnitTest(stressaction.StressAction):
             return self.test_method
         return super(UnitTest, self).action
 
+    @classmethod
+    def action_name(cls, **kwargs):
+        return kwargs['test_method'].split('.')[-1]
+
     def run_core(self):
         res = self.klass(self.test_method).run()
         if res.errors:
@@ -28,6 +28,10 @@ from tempest import exceptions
 from tempest.openstack.common import importutils
 from tempest.openstack.common import log as logging
 from tempest.stress import cleanup
+from tempest.stress import green
+from tempest.stress import logwatcher
+from tempest.stress import metrics
+from tempest.stress import pacing
 
 CONF = config.CONF
 
@@ -64,23 +68,6 @@ def _get_compute_nodes(controller, ssh_user, ssh_key=None):
     return nodes
 
 
-def _has_error_in_logs(logfiles, nodes, ssh_user, ssh_key=None,
-                       stop_on_error=False):
-    """
-    Detect errors in the nova log files on the controller and compute nodes.
-    """
-    grep = 'egrep "ERROR|TRACE" %s' % logfiles
-    ret = False
-    for node in nodes:
-        errors = do_ssh(grep, node, ssh_user, ssh_key)
-        if len(errors) > 0:
-            LOG.error('%s: %s' % (node, errors))
-            ret = True
-            if stop_on_error:
-                break
-    return ret
-
-
 def sigchld_handler(signalnum, frame):
     """
     Signal handler (only active if stop_on_error is True).
@@ -116,6 +103,77 @@ def terminate_all_processes(check_interval=20):
         process['process'].join()
 
 
+def _create_action(test, manager, admin_manager, max_runs, stop_on_error):
+    """
+    Creates and sets up an action of a test description.
+    """
+    if test.get('use_isolated_tenants', False):
+        username = data_utils.rand_name("stress_user")
+        tenant_name = data_utils.rand_name("stress_tenant")
+        password = "pass"
+        identity_client = admin_manager.identity_client
+        _, tenant = identity_client.create_tenant(name=tenant_name)
+        identity_client.create_user(username,
+                                    password,
+                                    tenant['id'],
+                                    "email")
+        creds = auth.get_credentials(username=username,
+                                     password=password,
+                                     tenant_name=tenant_name)
+        manager = clients.Manager(credentials=creds)
+
+    test_obj = importutils.import_class(test['action'])
+    test_run = test_obj(manager, max_runs, stop_on_error)
+
+    kwargs = test.get('kwargs', {})
+    test_run.setUp(**dict(kwargs.iteritems()))
+
+    LOG.debug("calling Target Object %s" %
+              test_run.__class__.__name__)
+    return test_run
+
+
+def _green_action_factory(test, max_runs, stop_on_error):
+    """
+    Returns a function creating the actions of a green process. The
+    managers are created in that process, where eventlet is set up, and
+    shared by its actions.
+    """
+    managers = {}
+
+    def _create_green_action():
+        if not managers:
+            managers['admin'] = clients.AdminManager()
+            if test.get('use_admin', False):
+                managers['action'] = managers['admin']
+            else:
+                managers['action'] = clients.Manager()
+        return _create_action(test, managers['action'], managers['admin'],
+                              max_runs, stop_on_error)
+
+    return _create_green_action
+
+
+def _start_process(target, args, p_number, action, pacer, stress_metrics):
+    shared_statistic = metrics.SharedStatistic()
+
+    recorder = metrics.RunRecorder()
+    stress_metrics.add(action, recorder)
+
+    p = multiprocessing.Process(target=target,
+                                args=args + (shared_statistic, recorder,
+                                             pacer))
+
+    process = {'process': p,
+               'p_number': p_number,
+               'action': action,
+               'statistic': shared_statistic,
+               'recorder': recorder}
+
+    processes.append(process)
+    p.start()
+
+
 def stress_openstack(tests, duration, max_runs=None, stop_on_error=False):
     """
     Workload driver. Executes an action function against a nova-cluster.
@@ -127,56 +185,57 @@ def stress_openstack(tests, duration, max_runs=None, stop_on_error=False):
     logfiles = CONF.stress.target_logfiles
     log_check_interval = int(CONF.stress.log_check_interval)
     default_thread_num = int(CONF.stress.default_thread_number_per_action)
+    stress_metrics = metrics.StressMetrics(CONF.stress.metrics_interval,
+                                           CONF.stress.metrics_file)
     if logfiles:
         controller = CONF.stress.target_controller
         computes = _get_compute_nodes(controller, ssh_user, ssh_key)
         for node in computes:
             do_ssh("rm -f %s" % logfiles, node, ssh_user, ssh_key)
+    pacers = []
     for test in tests:
         if test.get('use_admin', False):
             manager = admin_manager
         else:
             manager = clients.Manager()
-        for p_number in moves.xrange(test.get('threads', default_thread_num)):
-            if test.get('use_isolated_tenants', False):
-                username = data_utils.rand_name("stress_user")
-                tenant_name = data_utils.rand_name("stress_tenant")
-                password = "pass"
-                identity_client = admin_manager.identity_client
-                _, tenant = identity_client.create_tenant(name=tenant_name)
-                identity_client.create_user(username,
-                                            password,
-                                            tenant['id'],
-                                            "email")
-                creds = auth.get_credentials(username=username,
-                                             password=password,
-                                             tenant_name=tenant_name)
-                manager = clients.Manager(credentials=creds)
-
-            test_obj = importutils.import_class(test['action'])
-            test_run = test_obj(manager, max_runs, stop_on_error)
-
-            kwargs = test.get('kwargs', {})
-            test_run.setUp(**dict(kwargs.iteritems()))
-
-            LOG.debug("calling Target Object %s" %
-                      test_run.__class__.__name__)
-
-            mp_manager = multiprocessing.Manager()
-            shared_statistic = mp_manager.dict()
-            shared_statistic['runs'] = 0
-            shared_statistic['fails'] = 0
-
-            p = multiprocessing.Process(target=test_run.execute,
-                                        args=(shared_statistic,))
-
-            process = {'process': p,
-                       'p_number': p_number,
-                       'action': test_run.action,
-                       'statistic': shared_statistic}
-
-            processes.append(process)
-            p.start()
+        # the processes of an open loop action share its schedule
+        pacer = None
+        profile = pacing.RateProfile.from_test(test)
+        if profile is not None:
+            pacer = pacing.Pacer(profile)
+            pacers.append(pacer)
+        workers = test.get('threads', default_thread_num)
+        concurrency = test.get('concurrency', 'process')
+        if concurrency == 'green':
+            green.check_available()
+            action = importutils.import_class(test['action']).action_name(
+                **test.get('kwargs', {}))
+            create_action = _green_action_factory(test, max_runs,
+                                                  stop_on_error)
+            process_num = min(test.get('processes', 1), workers)
+            for p_number in moves.xrange(process_num):
+                # spread the workers evenly over the processes
+                process_workers = (workers // process_num +
+                                   int(p_number < workers % process_num))
+                _start_process(green.execute, (create_action,
+                                               process_workers),
+                               p_number, action, pacer, stress_metrics)
+            continue
+        elif concurrency != 'process':
+            raise ValueError("Unknown concurrency: %s" % concurrency)
+
+        for p_number in moves.xrange(workers):
+            test_run = _create_action(test, manager, admin_manager,
+                                      max_runs, stop_on_error)
+            _start_process(test_run.execute, (), p_number, test_run.action,
+                           pacer, stress_metrics)
+    for pacer in pacers:
+        pacer.start()
+    log_watcher = None
+    if logfiles:
+        log_watcher = logwatcher.LogWatcher(computes, logfiles, ssh_user,
+                                            ssh_key, log_check_interval)
+        log_watcher.start()
     if stop_on_error:
         # NOTE(mkoderer): only the parent should register the handler
         signal.signal(signal.SIGCHLD, sigchld_handler)
@@ -198,24 +257,29 @@ def stress_openstack(tests, duration, max_runs=None, stop_on_error=False):
                 if all_proc_term:
                     break
 
-            time.sleep(min(remaining, log_check_interval))
+            now = time.time()
+            time.sleep(max(0, min(remaining, log_check_interval,
+                                  stress_metrics.next_report - now)))
+            if time.time() >= stress_metrics.next_report:
+                stress_metrics.report()
             if stop_on_error:
                 if any([True for proc in processes
                         if proc['statistic']['fails'] > 0]):
                     break
 
-            if not logfiles:
-                continue
-            if _has_error_in_logs(logfiles, computes, ssh_user, ssh_key,
-                                  stop_on_error):
+            if log_watcher and log_watcher.has_errors:
                 had_errors = True
                 break
     except KeyboardInterrupt:
         LOG.warning("Interrupted, going to print statistics and exit ...")
 
+    if log_watcher:
+        log_watcher.stop()
     if stop_on_error:
         signal.signal(signal.SIGCHLD, signal.SIG_DFL)
     terminate_all_processes()
+    stress_metrics.report()
+    stress_metrics.close()
 
     sum_fails = 0
     sum_runs = 0
@@ -231,6 +295,11 @@ def stress_openstack(tests, duration, max_runs=None, stop_on_error=False):
                   process['action'],
                   process['statistic']['runs'],
                      process['statistic']['fails']))
+    LOG.info("Statistics (per action):")
+    for summary in stress_metrics.summary():
+        LOG.info(" %(action)s: %(ops_per_sec).2f ops/s, error rate "
+                 "%(error_rate).2f, latency p50 %(p50)s p95 %(p95)s "
+                 "p99 %(p99)s" % summary)
     LOG.info("Summary:")
     LOG.info("Run %d actions (%d failed)" %
              (sum_runs, sum_fails))
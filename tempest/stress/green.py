@@ -0,0 +1,98 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Green concurrency of the stress actions.
+
+With "concurrency": "green" in a test description, the "threads" of the
+action are greenthreads shared by "processes" processes (1 by default)
+instead of one process each. The greenthreads of a process share its
+clients, whose pooled HTTP connections they use cooperatively. Each
+greenthread counts its own runs and failures, so max_runs and stop-on-error
+apply to each of them as they do to each action process.
+
+This needs eventlet, which isn't a requirement of tempest.
+"""
+
+import signal
+import sys
+
+from six import moves
+
+from tempest.openstack.common import log as logging
+
+try:
+    import eventlet
+except ImportError:
+    eventlet = None
+
+LOG = logging.getLogger(__name__)
+
+
+def check_available():
+    if eventlet is None:
+        raise ValueError('The "green" concurrency of the stress actions '
+                         'needs eventlet to be installed')
+
+
+class WorkerStatistic(object):
+    """Runs and failures of a greenthread, also added to the statistic
+    shared by the greenthreads of the process.
+    """
+
+    def __init__(self, shared_statistic):
+        self.shared_statistic = shared_statistic
+        self._counters = {'runs': 0, 'fails': 0}
+
+    def __getitem__(self, key):
+        return self._counters[key]
+
+    def __setitem__(self, key, value):
+        self.shared_statistic[key] += value - self._counters[key]
+        self._counters[key] = value
+
+
+def execute(create_action, workers, shared_statistic, recorder=None,
+            pacer=None):
+    """Runs workers actions as greenthreads of the current process.
+
+    This is the target of the green action processes. The standard library
+    is patched by eventlet before create_action is called, from each
+    greenthread, so the clients of the actions are created with green
+    sockets and locks.
+    """
+    eventlet.monkey_patch()
+    actions = []
+
+    def _shutdown_handler(signal, frame):
+        for action in actions:
+            try:
+                action.tearDown()
+            except Exception:
+                LOG.exception("Error while tearDown")
+        sys.exit(0)
+
+    signal.signal(signal.SIGHUP, _shutdown_handler)
+    signal.signal(signal.SIGTERM, _shutdown_handler)
+
+    def _worker():
+        try:
+            action = create_action()
+        except Exception:
+            LOG.exception("Failure in setUp")
+            return
+        actions.append(action)
+        action.run_loop(WorkerStatistic(shared_statistic), recorder, pacer)
+
+    pool = eventlet.GreenPool(workers)
+    for _ in moves.xrange(workers):
+        pool.spawn(_worker)
+    pool.waitall()
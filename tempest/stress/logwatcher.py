@@ -0,0 +1,125 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import pipes
+import threading
+
+from tempest.common import ssh
+from tempest.openstack.common import log as logging
+
+LOG = logging.getLogger(__name__)
+
+ERROR_PATTERN = 'ERROR|TRACE'
+# starts the lines of the scan output giving the name and size of a file
+FILE_MARKER = '==>'
+
+
+class NodeLogs(object):
+    """The log files of a node, each one read from where the last scan
+    stopped, over an ssh connection kept open between the scans.
+    """
+
+    def __init__(self, node, logfiles, ssh_user, ssh_key=None):
+        self.node = node
+        self.logfiles = logfiles
+        self.client = ssh.Client(node, ssh_user, key_filename=ssh_key,
+                                 keep_connection=True)
+        # size of each log file at the last scan
+        self.offsets = {}
+
+    def _command(self):
+        cases = ''.join('%s) offset=%d;; ' % (pipes.quote(path), offset)
+                        for path, offset in sorted(self.offsets.items()))
+        # files smaller than at the last scan were rotated
+        return ('for f in %(logfiles)s; do [ -f "$f" ] || continue; '
+                'size=$(stat -c %%s "$f"); '
+                'case "$f" in %(cases)s*) offset=0;; esac; '
+                '[ "$size" -lt "$offset" ] && offset=0; '
+                'echo "%(marker)s $f $size"; '
+                'tail -c +$((offset + 1)) "$f" | head -c $((size - offset)) '
+                '| egrep "%(pattern)s"; done; true'
+                % {'logfiles': self.logfiles, 'cases': cases,
+                   'marker': FILE_MARKER, 'pattern': ERROR_PATTERN})
+
+    def scan(self):
+        """Returns the error lines written since the last scan."""
+        output = self.client.exec_command(self._command())
+        errors = []
+        for line in output.splitlines():
+            if line.startswith(FILE_MARKER + ' '):
+                path, size = line[len(FILE_MARKER) + 1:].rsplit(' ', 1)
+                self.offsets[path] = int(size)
+            elif line:
+                errors.append(line)
+        return errors
+
+    def close(self):
+        self.client.close()
+
+
+class LogWatcher(object):
+    """Scans the log files of the nodes for new errors.
+
+    Every interval seconds, all the nodes are scanned at once from a
+    background thread, so the driver only has to check has_errors.
+    """
+
+    def __init__(self, nodes, logfiles, ssh_user, ssh_key=None, interval=60):
+        self.nodes = [NodeLogs(node, logfiles, ssh_user, ssh_key)
+                      for node in nodes]
+        self.interval = interval
+        # (node, line) of each error found
+        self.errors = []
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    @property
+    def has_errors(self):
+        return bool(self.errors)
+
+    def _scan_node(self, node_logs):
+        try:
+            errors = node_logs.scan()
+        except Exception as e:
+            LOG.error('Unable to scan the logs of %s: %s' %
+                      (node_logs.node, e))
+            return
+        for line in errors:
+            LOG.error('%s: %s' % (node_logs.node, line))
+        with self._lock:
+            self.errors.extend((node_logs.node, line) for line in errors)
+
+    def scan(self):
+        """Scans all the nodes concurrently."""
+        threads = [threading.Thread(target=self._scan_node, args=(node,))
+                   for node in self.nodes]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def _watch(self):
+        while not self._stopped.wait(self.interval):
+            self.scan()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._watch)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+        for node_logs in self.nodes:
+            node_logs.close()
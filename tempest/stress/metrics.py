@@ -0,0 +1,243 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Latency and throughput of the stress actions, while they run.
+
+Each action process counts its runs and failures in a SharedStatistic and
+records each run in a RunRecorder, which the driver reads every [stress]
+metrics_interval seconds to report the throughput, latency percentiles and
+error rate of each action. The reports are logged and, when [stress]
+metrics_file is set, written to that file as a time series.
+"""
+
+import csv
+import json
+import multiprocessing
+import time
+
+from tempest.common import api_stats
+from tempest.openstack.common import log as logging
+
+LOG = logging.getLogger(__name__)
+
+REPORT_FIELDS = ('time', 'elapsed', 'action', 'runs', 'fails', 'lost',
+                 'ops_per_sec', 'error_rate', 'p50', 'p95', 'p99',
+                 'max_lag')
+
+
+class SharedStatistic(object):
+    """Count of the runs and failures of an action process.
+
+    The counters are in shared memory, updated by the action process only
+    and read by the driver without any IPC. They are accessed like the
+    dict StressAction.execute is given in the unit tests.
+    """
+
+    _INDEXES = {'runs': 0, 'fails': 1}
+
+    def __init__(self):
+        self._counters = multiprocessing.Array('L', len(self._INDEXES),
+                                               lock=False)
+
+    def __getitem__(self, key):
+        return self._counters[self._INDEXES[key]]
+
+    def __setitem__(self, key, value):
+        self._counters[self._INDEXES[key]] = value
+
+
+class RunRecorder(object):
+    """Ring buffer of the last runs of an action process.
+
+    The buffer is in shared memory, written by the action process and read
+    by the driver. A run is written before the count of runs is increased,
+    so neither side needs a lock. The runs which are overwritten before the
+    driver reads them are counted as lost.
+    """
+
+    # end time, latency, failure and start lag of each run
+    FIELDS = 4
+
+    def __init__(self, size=1024):
+        self.size = size
+        self._runs = multiprocessing.Array('d', size * self.FIELDS,
+                                           lock=False)
+        self._count = multiprocessing.Value('L', 0, lock=False)
+        # runs already read by the driver
+        self._read = 0
+
+    def record(self, end, latency, failed, lag=0.0):
+        count = self._count.value
+        offset = (count % self.size) * self.FIELDS
+        self._runs[offset] = end
+        self._runs[offset + 1] = latency
+        self._runs[offset + 2] = 1.0 if failed else 0.0
+        self._runs[offset + 3] = lag
+        self._count.value = count + 1
+
+    def read(self):
+        """Returns the runs recorded since the last read and the number of
+        runs lost, the runs being (end time, latency, failed, lag) tuples.
+        """
+        count = self._count.value
+        # the oldest slot may be being overwritten
+        start = max(self._read, count - self.size + 1)
+        lost = start - self._read
+        runs = []
+        for index in range(start, count):
+            offset = (index % self.size) * self.FIELDS
+            runs.append((self._runs[offset], self._runs[offset + 1],
+                         self._runs[offset + 2] != 0,
+                         self._runs[offset + 3]))
+        self._read = count
+        return runs, lost
+
+
+def summarize(action, runs, lost=0, interval=None):
+    """Throughput, error rate and latency percentiles of a list of runs.
+
+    max_lag is the longest delay of the start of a run in open loop mode.
+    """
+    latencies = sorted(latency for _, latency, _, _ in runs)
+    fails = len([failed for _, _, failed, _ in runs if failed])
+    report = {'action': action,
+              'runs': len(runs),
+              'fails': fails,
+              'lost': lost,
+              'ops_per_sec': (len(runs) + lost) / interval if interval else
+              0.0,
+              'error_rate': float(fails) / len(runs) if runs else 0.0,
+              'max_lag': max([lag for _, _, _, lag in runs] or [0.0])}
+    for percent in api_stats.PERCENTILES:
+        report['p%d' % percent] = api_stats.percentile(latencies, percent)
+    return report
+
+
+class ActionTotals(object):
+    """Running totals of all the runs of an action, for the final summary.
+
+    The latencies are counted in a histogram, so the memory used does not
+    grow with the number of runs.
+    """
+
+    def __init__(self, action):
+        self.action = action
+        self.runs = 0
+        self.fails = 0
+        self.lost = 0
+        self.max_lag = 0.0
+        self.latencies = api_stats.LatencyHistogram()
+
+    def add(self, runs, lost=0):
+        for _, latency, failed, lag in runs:
+            self.latencies.add(latency)
+            if failed:
+                self.fails += 1
+            self.max_lag = max(self.max_lag, lag)
+        self.runs += len(runs)
+        self.lost += lost
+
+    def summarize(self, interval=None):
+        """Same report as summarize, for all the runs added."""
+        report = {'action': self.action,
+                  'runs': self.runs,
+                  'fails': self.fails,
+                  'lost': self.lost,
+                  'ops_per_sec': (self.runs + self.lost) / interval
+                  if interval else 0.0,
+                  'error_rate': float(self.fails) / self.runs if self.runs
+                  else 0.0,
+                  'max_lag': self.max_lag}
+        for percent in api_stats.PERCENTILES:
+            report['p%d' % percent] = self.latencies.percentile(percent)
+        return report
+
+
+class MetricsWriter(object):
+    """Writes the reports to a CSV file when path ends with .csv, as JSON
+    lines otherwise.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'w')
+        self._csv = None
+        if path.endswith('.csv'):
+            self._csv = csv.DictWriter(self._file, REPORT_FIELDS,
+                                       extrasaction='ignore')
+            self._csv.writeheader()
+
+    def write(self, report):
+        if self._csv:
+            self._csv.writerow(report)
+        else:
+            self._file.write(json.dumps(report, sort_keys=True) + '\n')
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class StressMetrics(object):
+    """Aggregates the runs of the action processes in periodic reports."""
+
+    def __init__(self, interval=10, path=None):
+        self.interval = interval
+        self.recorders = []
+        self.start_time = self.last_report = time.time()
+        self.writer = MetricsWriter(path) if path else None
+        # ActionTotals of each action, for the final summary
+        self.totals = {}
+
+    def add(self, action, recorder):
+        self.recorders.append((action, recorder))
+        self.totals.setdefault(action, ActionTotals(action))
+
+    @property
+    def next_report(self):
+        return self.last_report + self.interval
+
+    def report(self):
+        """Reports the runs done since the last report, per action."""
+        now = time.time()
+        interval = now - self.last_report
+        self.last_report = now
+        new_runs = dict((action, []) for action in self.totals)
+        lost_runs = dict((action, 0) for action in self.totals)
+        for action, recorder in self.recorders:
+            runs, lost = recorder.read()
+            new_runs[action].extend(runs)
+            lost_runs[action] += lost
+            self.totals[action].add(runs, lost)
+
+        reports = []
+        for action in sorted(new_runs):
+            report = summarize(action, new_runs[action], lost_runs[action],
+                               interval)
+            report.update(time=now, elapsed=now - self.start_time)
+            LOG.info("%(action)s: %(runs)d runs (%(fails)d failed), "
+                     "%(ops_per_sec).2f ops/s, p50 %(p50)s p95 %(p95)s "
+                     "p99 %(p99)s, max lag %(max_lag).3f" % report)
+            if self.writer:
+                self.writer.write(report)
+            reports.append(report)
+        return reports
+
+    def summary(self):
+        """Summarizes all the runs read so far, per action."""
+        elapsed = time.time() - self.start_time
+        return [totals.summarize(elapsed)
+                for _, totals in sorted(self.totals.items())]
+
+    def close(self):
+        if self.writer:
+            self.writer.close()
@@ -0,0 +1,154 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Open loop mode of the stress driver.
+
+By default the processes of an action do their runs back to back, so the
+load depends on the latency of the APIs. When the test description has a
+"rate" (runs per second) or a "profile", the runs are started at the rate
+of the profile instead, by whichever process of the action is idle. When
+all the processes are busy, the runs start late and the lag is reported.
+
+The profiles are, with their keys:
+
+* step: "rates", "step_duration", each rate lasting step_duration seconds
+* linear: "start_rate", "end_rate", "duration"
+* spike: "rate", "spike_rate", "spike_start", "spike_duration"
+
+The last rate of a profile is kept until the end of the test.
+"""
+
+import math
+import multiprocessing
+import time
+
+INFINITY = float('inf')
+
+
+class RateProfile(object):
+    """Rate of runs over time, made of segments during which the rate goes
+    linearly from a start rate to an end rate.
+    """
+
+    def __init__(self, segments):
+        # (duration, start rate, end rate), the last one lasting forever
+        self.segments = list(segments)
+        if not self.segments:
+            raise ValueError("A rate profile needs at least one rate")
+        self.segments[-1] = (INFINITY, self.segments[-1][2],
+                             self.segments[-1][2])
+        for _, start_rate, end_rate in self.segments:
+            if start_rate < 0 or end_rate < 0:
+                raise ValueError("Rates can't be negative")
+
+    @classmethod
+    def from_test(cls, test):
+        """The profile of a test description, None for a closed loop."""
+        if 'rate' in test:
+            rate = float(test['rate'])
+            return cls([(INFINITY, rate, rate)])
+        profile = test.get('profile')
+        if not profile:
+            return None
+        kind = profile.get('type')
+        try:
+            if kind == 'step':
+                duration = float(profile['step_duration'])
+                return cls([(duration, float(step_rate), float(step_rate))
+                            for step_rate in profile['rates']])
+            elif kind == 'linear':
+                start_rate = float(profile['start_rate'])
+                end_rate = float(profile['end_rate'])
+                return cls([(float(profile['duration']), start_rate,
+                             end_rate),
+                            (INFINITY, end_rate, end_rate)])
+            elif kind == 'spike':
+                rate = float(profile['rate'])
+                spike_rate = float(profile['spike_rate'])
+                return cls([(float(profile['spike_start']), rate, rate),
+                            (float(profile['spike_duration']), spike_rate,
+                             spike_rate),
+                            (INFINITY, rate, rate)])
+        except KeyError as e:
+            raise ValueError("Invalid %s profile, missing %s" % (kind, e))
+        raise ValueError("Unknown profile type: %s" % kind)
+
+    def time_of(self, run):
+        """Seconds after the start when the run-th run (from 0) starts,
+        None if the rate drops to 0 before.
+        """
+        offset = 0.0
+        remaining = float(run)
+        for duration, start_rate, end_rate in self.segments:
+            if duration == INFINITY:
+                slope = 0.0
+            else:
+                slope = (end_rate - start_rate) / duration
+            # runs done after x seconds: start_rate * x + slope * x^2 / 2
+            if slope == 0:
+                elapsed = (remaining / start_rate if start_rate
+                           else INFINITY)
+            else:
+                discriminant = start_rate ** 2 + 2 * slope * remaining
+                if discriminant < 0:
+                    elapsed = INFINITY
+                else:
+                    elapsed = (math.sqrt(discriminant) - start_rate) / slope
+                    if elapsed < 0:
+                        elapsed = INFINITY
+            if elapsed < duration:
+                return offset + elapsed
+            if duration == INFINITY:
+                return None
+            remaining = max(0.0, remaining - start_rate * duration -
+                            slope * duration ** 2 / 2)
+            offset += duration
+
+
+class Pacer(object):
+    """Hands the runs of a RateProfile to the processes of an action.
+
+    The runs are numbered in shared memory. The processes wait for the
+    driver to start the schedule, once all of them are started.
+    """
+
+    def __init__(self, profile):
+        self.profile = profile
+        self._lock = multiprocessing.Lock()
+        self._started = multiprocessing.Event()
+        self._next_run = multiprocessing.Value('L', 0, lock=False)
+        self._start = multiprocessing.Value('d', 0.0, lock=False)
+
+    def start(self):
+        self._start.value = time.time()
+        self._started.set()
+
+    def _take(self):
+        with self._lock:
+            run = self._next_run.value
+            self._next_run.value = run + 1
+            return run
+
+    def wait(self):
+        """Waits for the time of the next run, returns its lag in seconds,
+        None when there are no more runs.
+        """
+        self._started.wait()
+        start = self._start.value
+        run = self._take()
+        offset = self.profile.time_of(run)
+        if offset is None:
+            return None
+        delay = start + offset - time.time()
+        if delay > 0:
+            time.sleep(delay)
+        return max(0.0, time.time() - start - offset)
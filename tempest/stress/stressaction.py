@@ -15,6 +15,7 @@
 import abc
 import signal
 import sys
+import time
 
 import six
 
@@ -45,6 +46,14 @@ class StressAction(object):
         """
         return self.__class__.__name__
 
+    @classmethod
+    def action_name(cls, **kwargs):
+        """This method returns the action of an instance
+        set up with kwargs, before it is created. Overload
+        this along with action.
+        """
+        return cls.__name__
+
     def setUp(self, **kwargs):
         """This method is called before the run method
         to help the test initialize any structures.
@@ -61,26 +70,45 @@ class StressAction(object):
         """
         self.logger.debug("tearDown")
 
-    def execute(self, shared_statistic):
+    def execute(self, shared_statistic, recorder=None, pacer=None):
         """This is the main execution entry point called
         by the driver.   We register a signal handler to
         allow us to tearDown gracefully, and then exit.
-        We also keep track of how many runs we do.
+        We also keep track of how many runs we do, and
+        record the latency of each run in recorder.
+        With a pacer, each run waits for its turn in the
+        open loop schedule.
         """
         signal.signal(signal.SIGHUP, self._shutdown_handler)
         signal.signal(signal.SIGTERM, self._shutdown_handler)
+        self.run_loop(shared_statistic, recorder, pacer)
 
+    def run_loop(self, shared_statistic, recorder=None, pacer=None):
+        """Runs the action until max_runs runs are counted
+        in shared_statistic, or the pacer has no more runs.
+        """
         while self.max_runs is None or (shared_statistic['runs'] <
                                         self.max_runs):
             self.logger.debug("Trigger new run (run %d)" %
                               shared_statistic['runs'])
+            lag = 0.0
+            if pacer is not None:
+                lag = pacer.wait()
+                if lag is None:
+                    break
+            failed = False
+            start = time.time()
             try:
                 self.run()
             except Exception:
+                failed = True
                 shared_statistic['fails'] += 1
                 self.logger.exception("Failure in run")
             finally:
                 shared_statistic['runs'] += 1
+                if recorder is not None:
+                    end = time.time()
+                    recorder.record(end, end - start, failed, lag)
                 if self.stop_on_error and (shared_statistic['fails'] > 1):
                     self.logger.warn("Stop process due to"
                                      "\"stop-on-error\" argument")
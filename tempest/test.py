@@ -24,12 +24,14 @@ import urllib
 import uuid
 
 import fixtures
+import six
 import testscenarios
 import testtools
 
 from tempest import clients
 from tempest.common import credentials
 import tempest.common.generator.valid_generator as valid
+from tempest.common.utils import misc as misc_utils
 from tempest import config
 from tempest import exceptions
 from tempest.openstack.common import importutils
@@ -222,6 +224,24 @@ def validate_tearDownClass():
 atexit.register(validate_tearDownClass)
 
 
+class CallerContextMeta(type):
+    """Attributes the calls made by the class fixtures of a test class to
+    '<class>:setUpClass' and '<class>:tearDownClass'.
+
+    The setUpClass and tearDownClass of each subclass are wrapped, as most
+    of their calls are made after the ones of the base class returned.
+    """
+
+    def __new__(mcs, name, bases, attrs):
+        for fixture in ('setUpClass', 'tearDownClass'):
+            method = attrs.get(fixture)
+            if isinstance(method, classmethod):
+                attrs[fixture] = classmethod(
+                    misc_utils.class_caller_context(method.__func__))
+        return super(CallerContextMeta, mcs).__new__(mcs, name, bases, attrs)
+
+
+@six.add_metaclass(CallerContextMeta)
 class BaseTestCase(testtools.testcase.WithAttributes,
                    testtools.TestCase):
     """The test base class defines Tempest framework for class level fixtures.
@@ -369,6 +389,12 @@ class BaseTestCase(testtools.testcase.WithAttributes,
                                "setUpClass in the "
                                + self.__class__.__name__)
         at_exit_set.add(self.__class__)
+        # Attribute the calls made by this test without walking the stack,
+        # the first cleanup registered is the last one to run.
+        previous_caller = misc_utils.set_test_caller(
+            self.__class__.__name__ + ':' + self._testMethodName)
+        super(BaseTestCase, self).addCleanup(misc_utils.set_test_caller,
+                                             previous_caller)
         test_timeout = os.environ.get('OS_TEST_TIMEOUT', 0)
         try:
             test_timeout = int(test_timeout)
@@ -391,6 +417,14 @@ class BaseTestCase(testtools.testcase.WithAttributes,
                                                    format=self.log_format,
                                                    level=None))
 
+    def addCleanup(self, function, *args, **kwargs):
+        caller_name = self.__class__.__name__ + ':_run_cleanups'
+
+        def cleanup():
+            with misc_utils.caller_context(caller_name):
+                return function(*args, **kwargs)
+        super(BaseTestCase, self).addCleanup(cleanup)
+
     @classmethod
     def get_client_manager(cls, interface=None):
         """
@@ -0,0 +1,300 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import datetime
+import os
+
+import fixtures
+import mock
+
+from tempest.cmd import cleanup
+from tempest.cmd import cleanup_service
+from tempest.tests import base
+
+
+class TestCleanupLevels(base.TestCase):
+
+    def _level_of(self, levels, service):
+        for index, level in enumerate(levels):
+            if service in level:
+                return index
+
+    def test_dependencies_ordered(self):
+        services = [cleanup_service.ServerService,
+                    cleanup_service.KeyPairService,
+                    cleanup_service.SecurityGroupService,
+                    cleanup_service.NetworkRouterService,
+                    cleanup_service.NetworkFloatingIpService,
+                    cleanup_service.NetworkPortService,
+                    cleanup_service.NetworkSubnetService,
+                    cleanup_service.NetworkService,
+                    cleanup_service.SnapshotService,
+                    cleanup_service.VolumeService]
+        levels = cleanup_service.get_cleanup_levels(services)
+        self.assertEqual(sorted(services), sorted(sum(levels, [])))
+        level_of = dict((service, self._level_of(levels, service))
+                        for service in services)
+        # independent services are cleaned up together
+        self.assertEqual(0, level_of[cleanup_service.ServerService])
+        self.assertEqual(0, level_of[cleanup_service.KeyPairService])
+        self.assertEqual(0, level_of[cleanup_service.SnapshotService])
+        for before, after in (('ServerService', 'SecurityGroupService'),
+                              ('ServerService', 'NetworkPortService'),
+                              ('NetworkRouterService', 'NetworkPortService'),
+                              ('NetworkPortService', 'NetworkSubnetService'),
+                              ('NetworkSubnetService', 'NetworkService'),
+                              ('SnapshotService', 'VolumeService')):
+            self.assertTrue(
+                level_of[getattr(cleanup_service, before)] <
+                level_of[getattr(cleanup_service, after)],
+                '%s not cleaned up before %s' % (before, after))
+
+    def test_routers_after_servers_and_floating_ips(self):
+        services = [cleanup_service.NetworkRouterService,
+                    cleanup_service.NetworkFloatingIpService,
+                    cleanup_service.ServerService]
+        levels = cleanup_service.get_cleanup_levels(services)
+        self.assertEqual([[cleanup_service.NetworkFloatingIpService,
+                           cleanup_service.ServerService],
+                          [cleanup_service.NetworkRouterService]], levels)
+
+    def test_stacks_first(self):
+        services = [cleanup_service.ServerService,
+                    cleanup_service.StackService,
+                    cleanup_service.NetworkService]
+        levels = cleanup_service.get_cleanup_levels(services)
+        self.assertEqual([[cleanup_service.StackService],
+                          [cleanup_service.ServerService,
+                           cleanup_service.NetworkService]], levels)
+
+    def test_missing_dependency_ignored(self):
+        levels = cleanup_service.get_cleanup_levels(
+            [cleanup_service.NetworkSubnetService,
+             cleanup_service.NetworkService])
+        self.assertEqual([[cleanup_service.NetworkSubnetService],
+                          [cleanup_service.NetworkService]], levels)
+
+
+class TestServiceDelete(base.TestCase):
+
+    def setUp(self):
+        super(TestServiceDelete, self).setUp()
+        self.manager = mock.Mock()
+        self.client = self.manager.snapshots_client
+        self.client.build_interval = 0
+        self.client.build_timeout = 10
+        self.client.polling_group = None
+
+    def test_delete_waits(self):
+        snaps = [{'id': '1'}, {'id': '2'}]
+        self.client.list_snapshots.side_effect = [
+            (None, snaps), (None, snaps[1:]), (None, [])]
+        svc = cleanup_service.SnapshotService(self.manager, workers=2)
+        svc.delete()
+        self.assertEqual(2, self.client.delete_snapshot.call_count)
+        self.assertEqual(3, self.client.list_snapshots.call_count)
+
+    def test_delete_failure_does_not_stop(self):
+        snaps = [{'id': '1'}, {'id': '2'}]
+        self.client.list_snapshots.side_effect = [
+            (None, snaps), (None, [])]
+        self.client.delete_snapshot.side_effect = [Exception, None]
+        svc = cleanup_service.SnapshotService(self.manager, workers=1)
+        svc.delete()
+        self.assertEqual(2, self.client.delete_snapshot.call_count)
+
+
+class TestServiceSince(base.TestCase):
+
+    def _service(self, resources, since=None):
+        svc = cleanup_service.BaseService({'since': since})
+        svc.list = lambda: resources
+        return svc
+
+    def test_no_since(self):
+        resources = [{'id': '1', 'created_at': '2014-01-01T00:00:00Z'}]
+        self.assertEqual(resources, self._service(resources).list_to_clean())
+
+    def test_since(self):
+        resources = [{'id': '1', 'created_at': '2014-01-01T00:00:00Z'},
+                     {'id': '2', 'created': '2014-03-01T10:00:00+02:00'},
+                     {'id': '3'},
+                     {'id': '4', 'created_at': 'not a date'}]
+        svc = self._service(resources, datetime.datetime(2014, 2, 1))
+        self.assertEqual(['2', '3', '4'],
+                         [r['id'] for r in svc.list_to_clean()])
+
+
+class _PassingService(object):
+
+    def __init__(self, manager, **kwargs):
+        pass
+
+    def run(self):
+        pass
+
+
+class _FailingService(_PassingService):
+
+    def run(self):
+        raise ValueError()
+
+
+class TestJournal(base.TestCase):
+
+    def setUp(self):
+        super(TestJournal, self).setUp()
+        self.path = os.path.join(self.useFixture(fixtures.TempDir()).path,
+                                 'journal.json')
+
+    def test_resume(self):
+        journal = cleanup.Journal(self.path, 'cleanup')
+        self.assertFalse(journal.resumed)
+        journal.mark_done('tenant', cleanup_service.ServerService, ['1'])
+        journal = cleanup.Journal(self.path, 'cleanup')
+        self.assertTrue(journal.resumed)
+        self.assertTrue(journal.is_done('tenant',
+                                        cleanup_service.ServerService))
+        self.assertFalse(journal.is_done('other',
+                                         cleanup_service.ServerService))
+        self.assertFalse(journal.is_done('tenant',
+                                         cleanup_service.VolumeService))
+        self.assertEqual({'tenant': {'ServerService': ['1']}},
+                         journal.data['done'])
+
+    def test_other_mode_not_resumed(self):
+        journal = cleanup.Journal(self.path, 'init_saved_state')
+        journal.saved_state['users'] = {'1': 'admin'}
+        journal.mark_done(cleanup.GLOBAL_SCOPE, cleanup_service.UserService)
+        journal = cleanup.Journal(self.path, 'cleanup')
+        self.assertFalse(journal.resumed)
+        self.assertEqual({}, journal.saved_state)
+        journal = cleanup.Journal(self.path, 'init_saved_state')
+        self.assertEqual({'users': {'1': 'admin'}}, journal.saved_state)
+
+    def test_admin_role_added(self):
+        journal = cleanup.Journal(self.path, 'cleanup')
+        cleaner = cleanup.Cleanup.__new__(cleanup.Cleanup)
+        cleaner.admin_mgr = mock.Mock()
+        cleaner.admin_mgr.identity_client.list_user_roles.return_value = (
+            None, [])
+        cleaner.admin_id = 'admin'
+        cleaner.admin_role_id = 'role'
+        cleaner.admin_role_added = []
+        cleaner.journal = journal
+        cleaner._add_admin('tenant')
+        self.assertEqual(['tenant'], cleaner.admin_role_added)
+        journal = cleanup.Journal(self.path, 'cleanup')
+        self.assertEqual(['tenant'], journal.admin_role_added)
+
+    def test_failed_service_not_done(self):
+        journal = cleanup.Journal(self.path, 'cleanup')
+        cleaner = cleanup.Cleanup.__new__(cleanup.Cleanup)
+        cleaner.journal = journal
+        cleaner.options = mock.Mock(workers=8)
+        self.assertRaises(ValueError, cleaner._run_services,
+                          [_FailingService, _PassingService], None, {},
+                          'tenant')
+        self.assertTrue(journal.is_done('tenant', _PassingService))
+        self.assertFalse(journal.is_done('tenant', _FailingService))
+
+    def test_services_workers(self):
+        cleaner = cleanup.Cleanup.__new__(cleanup.Cleanup)
+        cleaner.journal = None
+        cleaner.options = mock.Mock(workers=1)
+        run_mock = self.patch('tempest.common.utils.misc.run_concurrently')
+        cleaner._run_services([_FailingService, _PassingService], None, {},
+                              'tenant')
+        self.assertEqual(1, run_mock.call_args[0][2])
+
+    def test_remove(self):
+        journal = cleanup.Journal(self.path, 'cleanup')
+        journal.mark_done('tenant', cleanup_service.ServerService)
+        journal.remove()
+        self.assertFalse(os.path.exists(self.path))
+        journal.remove()
+
+
+class TestListPages(base.TestCase):
+
+    def setUp(self):
+        super(TestListPages, self).setUp()
+        self.ports = [{'id': str(i), 'tenant_id': 't%d' % (i % 2)}
+                      for i in range(5)]
+        self.calls = []
+
+    def _paginated(self, limit=None, marker=None, **filters):
+        self.calls.append((limit, marker))
+        start = 0
+        if marker:
+            start = [p['id'] for p in self.ports].index(marker) + 1
+        end = start + limit if limit else None
+        return {'ports': self.ports[start:end]}
+
+    def _not_paginated(self, **filters):
+        self.calls.append(filters)
+        return {'ports': self.ports}
+
+    def test_pages(self):
+        ports = list(cleanup_service.list_pages(self._paginated, 'ports', 2))
+        self.assertEqual(self.ports, ports)
+        self.assertEqual([(2, None), (2, '1'), (2, '3')], self.calls)
+
+    def test_pagination_disabled(self):
+        ports = list(cleanup_service.list_pages(self._not_paginated, 'ports',
+                                                2, tenant_id='t0'))
+        self.assertEqual(self.ports, ports)
+        self.assertEqual([{'limit': 2, 'tenant_id': 't0'}], self.calls)
+
+    def test_no_page_size(self):
+        ports = list(cleanup_service.list_pages(self._not_paginated, 'ports'))
+        self.assertEqual(self.ports, ports)
+        self.assertEqual([{}], self.calls)
+
+    def test_inventory(self):
+        client = mock.Mock()
+        client.list_ports.side_effect = self._paginated
+        inventory = cleanup_service.Inventory(client, page_size=10)
+        self.assertEqual(['0', '2', '4'],
+                         [p['id'] for p in inventory.get('ports', 't0')])
+        self.assertEqual(['1', '3'],
+                         [p['id'] for p in inventory.get('ports', 't1')])
+        self.assertEqual([], inventory.get('ports', 't2'))
+        self.assertEqual(1, client.list_ports.call_count)
+
+    def _network_service(self, service, **kwargs):
+        manager = mock.Mock()
+        manager.network_client.list_ports.side_effect = self._paginated
+        manager.network_client.list_routers.return_value = {'routers': []}
+        return service(manager, is_preserve=False, tenant_id='t1',
+                       **kwargs)
+
+    def test_tenant_filter(self):
+        svc = self._network_service(cleanup_service.NetworkPortService,
+                                    page_size=2)
+        svc.list()
+        svc.client.list_ports.assert_called_with(limit=2, tenant_id='t1',
+                                                 marker='3')
+
+    def test_inventory_used(self):
+        inventory = mock.Mock()
+        inventory.get.return_value = [{'id': '1'}]
+        svc = self._network_service(cleanup_service.NetworkRouterService,
+                                    inventory=inventory)
+        self.assertEqual([{'id': '1'}], svc.list())
+        inventory.get.assert_called_once_with('routers', 't1')
+        self.assertFalse(svc.client.list_routers.called)
+        # ports are never taken from the inventory
+        svc = self._network_service(cleanup_service.NetworkPortService,
+                                    inventory=inventory)
+        svc.list()
+        self.assertEqual(1, inventory.get.call_count)
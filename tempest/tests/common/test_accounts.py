@@ -68,7 +68,7 @@ class TestAccount(base.TestCase):
         return hash_list
 
     def test_get_hash(self):
-        self.stubs.Set(http.ClosingHttp, 'request',
+        self.stubs.Set(http.KeepAliveHttp, 'request',
                        fake_identity._fake_v2_response)
         test_account_class = accounts.Accounts('test_name')
         hash_list = self._get_hash_list(self.test_accounts)
@@ -0,0 +1,146 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+
+import fixtures
+import httplib2
+from oslo.config import cfg
+from oslotest import mockpatch
+
+from tempest.cmd import api_stats as api_stats_cmd
+from tempest.common import api_stats
+from tempest.common import rest_client
+from tempest import config
+from tempest.tests import base
+from tempest.tests import fake_auth_provider
+from tempest.tests import fake_config
+from tempest.tests import fake_http
+
+
+class TestApiStats(base.TestCase):
+
+    def setUp(self):
+        super(TestApiStats, self).setUp()
+        self.collector = api_stats.ApiStatsCollector()
+        self.server = 'http://nova:8774/v2/%s/servers/%s' % (
+            'a' * 32, '2b1cb2f4-3bf2-4c1b-a7b8-4b7a3a9c1f0e')
+
+    def test_url_template(self):
+        self.assertEqual('/v2/{id}/servers/{id}',
+                         api_stats.url_template(self.server + '?detail=1'))
+        self.assertEqual('/v2.0/ports/{id}/os-interface/{id}',
+                         api_stats.url_template(
+                             'http://neutron/v2.0/ports/12/os-interface/3'))
+
+    def test_url_template_object_storage(self):
+        account = 'http://swift:8080/v1/AUTH_%s' % ('a' * 32)
+        self.assertEqual('/v1/{account}', api_stats.url_template(account))
+        self.assertEqual('/v1/{account}/{container}',
+                         api_stats.url_template(account + '/images?limit=2'))
+        self.assertEqual('/v1/{account}/{container}/{object}',
+                         api_stats.url_template(account + '/images/a/b.img'))
+
+    def test_percentile(self):
+        values = range(1, 101)
+        self.assertEqual(50, api_stats.percentile(values, 50))
+        self.assertEqual(95, api_stats.percentile(values, 95))
+        self.assertEqual(100, api_stats.percentile(values, 100))
+        self.assertEqual(7, api_stats.percentile([7], 99))
+        self.assertIsNone(api_stats.percentile([], 50))
+
+    def test_latency_histogram(self):
+        histogram = api_stats.LatencyHistogram()
+        self.assertIsNone(histogram.percentile(50))
+        for secs in range(1, 1001):
+            histogram.add(secs / 1000.0)
+        for percent in (50, 95, 99):
+            self.assertTrue(percent / 100.0 <= histogram.percentile(percent)
+                            <= percent / 100.0 * 1.05)
+        self.assertEqual(1.0, histogram.percentile(100))
+        self.assertTrue(len(histogram.buckets) < 150)
+        histogram.merge(api_stats.LatencyHistogram.from_dict(
+            histogram.to_dict()))
+        self.assertEqual(2000, histogram.count)
+        self.assertEqual(1.0, histogram.max)
+
+    def test_record(self):
+        for secs in (0.1, 0.2, 0.3):
+            self.collector.record('compute', 'GET', self.server, 200, secs,
+                                  response_bytes=10)
+        self.collector.record('compute', 'GET', self.server, 413, 0.4,
+                              retry=1)
+        stats = self.collector.stats[('compute', 'GET',
+                                      '/v2/{id}/servers/{id}')]
+        self.assertEqual(4, stats.count)
+        self.assertEqual({'200': 3, '413': 1}, stats.statuses)
+        self.assertEqual(30, stats.response_bytes)
+        self.assertEqual(1, stats.retries)
+        percentiles = stats.percentiles()
+        self.assertAlmostEqual(0.204, percentiles[50], places=3)
+        self.assertEqual((0.4, 0.4), (percentiles[95], percentiles[99]))
+
+    def test_dump_load_merge(self):
+        self.collector.record('compute', 'GET', self.server, 200, 0.1)
+        path = os.path.join(self.useFixture(fixtures.TempDir()).path,
+                            'stats.json')
+        self.collector.dump(path)
+        merged = api_stats.ApiStatsCollector.load(path)
+        merged.merge(api_stats.ApiStatsCollector.load(path))
+        merged.record('network', 'DELETE', 'http://neutron/v2.0/ports/1',
+                      204, 0.5)
+        self.assertEqual(2, len(merged.stats))
+        stats = merged.stats[('compute', 'GET', '/v2/{id}/servers/{id}')]
+        self.assertEqual(2, stats.count)
+        self.assertEqual(0.1, stats.latencies.max)
+
+    def test_report(self):
+        stats_dir = self.useFixture(fixtures.TempDir()).path
+        self.collector.record('compute', 'GET', self.server, 200, 0.1)
+        self.collector.dump(os.path.join(stats_dir, 'api-stats-1.json'))
+        self.collector.record('compute', 'GET', self.server, 404, 0.3)
+        self.collector.dump(os.path.join(stats_dir, 'api-stats-2.json'))
+        report = api_stats_cmd.format_report(
+            api_stats_cmd.load_stats([stats_dir]), sort='p95')
+        lines = report.splitlines()
+        self.assertEqual(2, len(lines))
+        self.assertEqual(['compute', 'GET', '/v2/{id}/servers/{id}', '3',
+                          '1', '0.103', '0.300', '0.300'], lines[1].split())
+
+
+class TestApiStatsCollection(base.TestCase):
+
+    def setUp(self):
+        super(TestApiStatsCollection, self).setUp()
+        self.useFixture(fake_config.ConfigFixture())
+        self.stubs.Set(config, 'TempestConfigPrivate', fake_config.FakePrivate)
+        self.stubs.Set(httplib2.Http, 'request',
+                       fake_http.fake_httplib2().request)
+        self.addCleanup(api_stats.set_collector, None)
+        self.rest_client = rest_client.RestClient(
+            fake_auth_provider.FakeAuthProvider(), 'compute', None)
+        self.useFixture(mockpatch.PatchObject(self.rest_client,
+                                              '_log_request'))
+
+    def test_disabled(self):
+        self.assertIsNone(api_stats.get_collector())
+
+    def test_rest_client_records(self):
+        cfg.CONF.set_default('api_stats_dir', 'fake_dir', group='debug')
+        self.stubs.Set(api_stats.atexit, 'register', lambda *args: None)
+        collector = api_stats.get_collector()
+        self.assertIs(collector, api_stats.get_collector())
+        self.rest_client.get('fake_endpoint/servers/1')
+        [(key, stats)] = collector.stats.items()
+        self.assertEqual(('compute', 'GET', 'fake_endpoint/servers/{id}'),
+                         key)
+        self.assertEqual(1, stats.count)
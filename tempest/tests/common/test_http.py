@@ -0,0 +1,96 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import time
+
+import httplib2
+import mock
+
+from tempest.common import http
+from tempest.tests import base
+from tempest.tests import fake_http
+
+
+class TestKeepAliveHttp(base.TestCase):
+
+    url = 'http://fake_endpoint:5000/v2.0/tokens'
+
+    def setUp(self):
+        super(TestKeepAliveHttp, self).setUp()
+        self.fake_http = fake_http.fake_httplib2()
+        self.stubs.Set(httplib2.Http, 'request', self.fake_http.request)
+        self.http_obj = http.KeepAliveHttp(pool_size=2, idle_timeout=60)
+
+    def test_request(self):
+        resp, body = self.http_obj.request(self.url, 'POST', body='fake',
+                                           headers={})
+        self.assertEqual('POST', body['method'])
+        self.assertEqual(self.url, body['uri'])
+
+    def test_no_connection_close_header(self):
+        _, body = self.http_obj.request(self.url, 'GET', headers={})
+        self.assertNotIn('connection', body['headers'])
+
+    def test_connection_reused(self):
+        self.http_obj.request(self.url, 'GET', headers={})
+        first = self.http_obj._pools[('http', 'fake_endpoint:5000')][0][0]
+        self.http_obj.request(self.url + '/other', 'GET', headers={})
+        idle = self.http_obj._pools[('http', 'fake_endpoint:5000')]
+        self.assertEqual(1, len(idle))
+        self.assertIs(first, idle[0][0])
+
+    def test_pool_per_endpoint(self):
+        self.http_obj.request(self.url, 'GET', headers={})
+        self.http_obj.request('https://other_endpoint/v2', 'GET',
+                              headers={})
+        self.assertEqual(2, len(self.http_obj._pools))
+
+    def test_pool_size_bounded(self):
+        endpoint = ('http', 'fake_endpoint:5000')
+        held = [self.http_obj._acquire(endpoint) for _ in range(3)]
+        for http_obj in held:
+            self.http_obj._release(endpoint, http_obj)
+        self.assertEqual(2, len(self.http_obj._pools[endpoint]))
+
+    def test_idle_connection_evicted(self):
+        self.http_obj.request(self.url, 'GET', headers={})
+        endpoint = ('http', 'fake_endpoint:5000')
+        stale = self.http_obj._pools[endpoint][0][0]
+        with mock.patch.object(time, 'time',
+                               return_value=time.time() + 120):
+            self.http_obj.request(self.url, 'GET', headers={})
+        self.assertIsNot(stale, self.http_obj._pools[endpoint][0][0])
+
+    def test_connection_dropped_on_error(self):
+        self.stubs.Set(httplib2.Http, 'request',
+                       mock.Mock(side_effect=IOError))
+        self.assertRaises(IOError, self.http_obj.request, self.url, 'GET',
+                          headers={})
+        self.assertEqual({}, self.http_obj._pools)
+
+    def test_close(self):
+        self.http_obj.request(self.url, 'GET', headers={})
+        self.http_obj.close()
+        self.assertEqual({}, self.http_obj._pools)
+
+
+class TestGetHttpObj(base.TestCase):
+
+    def test_keepalive(self):
+        http_obj = http.get_http_obj(pool_size=3, idle_timeout=5)
+        self.assertIsInstance(http_obj, http.KeepAliveHttp)
+        self.assertEqual(3, http_obj.pool_size)
+        self.assertEqual(5, http_obj.idle_timeout)
+
+    def test_no_keepalive(self):
+        http_obj = http.get_http_obj(keepalive=False)
+        self.assertIsInstance(http_obj, http.ClosingHttp)
@@ -0,0 +1,132 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+from oslo.config import cfg
+from oslotest import mockpatch
+
+from tempest.common import polling
+from tempest import config
+from tempest.services.network.json import network_client
+from tempest.tests import base
+from tempest.tests import fake_config
+
+
+class TestPollingPolicy(base.TestCase):
+
+    def setUp(self):
+        super(TestPollingPolicy, self).setUp()
+        self.useFixture(fake_config.ConfigFixture())
+        self.stubs.Set(config, 'TempestConfigPrivate', fake_config.FakePrivate)
+        self.sleep = self.useFixture(mockpatch.Patch('time.sleep')).mock
+        self.atexit = self.useFixture(mockpatch.Patch('atexit.register')).mock
+        self.addCleanup(polling.stats.clear)
+        self.client = mock.Mock(build_interval=4, build_timeout=60,
+                                polling_group=None)
+
+    def _sleeps(self, poll, count):
+        for _ in range(count):
+            poll.sleep()
+        return [call[0][0] for call in self.sleep.call_args_list]
+
+    def test_constant_interval(self):
+        poll = polling.PollingPolicy.for_client(self.client).start('wait')
+        self.assertEqual([4, 4, 4], self._sleeps(poll, 3))
+        self.assertEqual(4, poll.polls)
+
+    def test_backoff(self):
+        policy = polling.PollingPolicy(interval=0.5, factor=2,
+                                       max_interval=3)
+        self.assertEqual([0.5, 1, 2, 3, 3],
+                         self._sleeps(policy.start('wait'), 5))
+
+    def test_jitter(self):
+        policy = polling.PollingPolicy(interval=1, jitter=0.5)
+        for delay in self._sleeps(policy.start('wait'), 10):
+            self.assertTrue(0.5 <= delay <= 1.5)
+
+    def test_sleep_capped_by_deadline(self):
+        policy = polling.PollingPolicy(interval=10, timeout=5)
+        poll = policy.start('wait')
+        self.assertFalse(poll.expired())
+        self.assertTrue(self._sleeps(poll, 1)[0] <= 5)
+
+    def test_expired(self):
+        poll = polling.PollingPolicy(timeout=0).start('wait')
+        self.assertTrue(poll.expired())
+
+    def test_for_client_group(self):
+        cfg.CONF.set_default('polling_initial_interval', 0.25,
+                             group='compute')
+        cfg.CONF.set_default('polling_backoff_factor', 2, group='compute')
+        self.client.polling_group = 'compute'
+        policy = polling.PollingPolicy.for_client(self.client)
+        self.assertEqual(0.25, policy.interval)
+        self.assertEqual(2, policy.factor)
+        # build_interval stays the maximum interval by default
+        self.assertEqual(4, policy.max_interval)
+        self.assertEqual(60, policy.timeout)
+        self.assertEqual([0.25, 0.5, 1, 2, 4, 4],
+                         self._sleeps(policy.start('wait'), 6))
+
+    def test_stats(self):
+        policy = polling.PollingPolicy(group='compute')
+        for polls in (1, 3):
+            with policy.start('wait_for_server_status') as poll:
+                self._sleeps(poll, polls - 1)
+        stats = polling.stats.summary()['compute.wait_for_server_status']
+        self.assertEqual(2, stats['waits'])
+        self.assertEqual(4, stats['polls'])
+        self.assertEqual(3, stats['max_polls'])
+        self.assertEqual(2.0, stats['avg_polls'])
+
+    def test_done_once(self):
+        policy = polling.PollingPolicy()
+
+        def _wait():
+            with policy.start('wait') as poll:
+                poll.sleep()
+                poll.done()
+                raise ValueError()
+        self.assertRaises(ValueError, _wait)
+        stats = polling.stats.summary()['wait']
+        self.assertEqual((1, 2), (stats['waits'], stats['polls']))
+
+    def test_log_summary_at_exit(self):
+        stats = polling.PollingStats()
+        stats.log_summary()
+        self.assertFalse(self.atexit.called)
+        stats.record('wait', 3, 1.5)
+        stats.record('wait', 1, 0.5)
+        self.atexit.assert_called_once_with(stats.log_summary)
+        log = self.useFixture(mockpatch.PatchObject(polling, 'LOG')).mock
+        stats.log_summary()
+        lines = log.info.call_args[0][1].splitlines()
+        self.assertEqual(['wait', '2', '4', '3', '2.0', '2.0'],
+                         lines[1].split())
+
+    def test_client_waiter(self):
+        cfg.CONF.set_default('polling_initial_interval', 0.25,
+                             group='network')
+        cfg.CONF.set_default('polling_backoff_factor', 2, group='network')
+        client = network_client.NetworkClientJSON.__new__(
+            network_client.NetworkClientJSON)
+        client.build_interval = 4
+        client.build_timeout = 60
+        fetch = mock.Mock(side_effect=[{'status': 'BUILD'},
+                                       {'status': 'BUILD'},
+                                       {'status': 'ACTIVE'}])
+        client.wait_for_resource_status(fetch, 'ACTIVE')
+        self.assertEqual([0.25, 0.5],
+                         [call[0][0] for call in self.sleep.call_args_list])
+        stats = polling.stats.summary()['network.wait_for_resource_status']
+        self.assertEqual(3, stats['polls'])
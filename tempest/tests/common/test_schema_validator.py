@@ -0,0 +1,161 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import jsonschema
+import mock
+
+from tempest.common import schema_validator
+from tempest import config
+from tempest.tests import base
+from tempest.tests import fake_config
+
+SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'servers': {
+            'type': 'array',
+            'minItems': 1,
+            'items': {
+                'type': 'object',
+                'properties': {
+                    'id': {'type': 'string', 'pattern': '^[0-9a-f]+$'},
+                    'progress': {'type': 'integer', 'minimum': 0},
+                    'status': {'enum': ['ACTIVE', 'ERROR']},
+                    'image': {'oneOf': [
+                        {'type': 'object',
+                         'properties': {'id': {'type': 'string'}},
+                         'required': ['id']},
+                        {'type': ['string', 'null']}]},
+                    'metadata': {
+                        'type': 'object',
+                        'patternProperties': {
+                            '^[a-z]+$': {'type': 'string'}},
+                        'additionalProperties': False},
+                    'links': {'uniqueItems': True}
+                },
+                'required': ['id', 'status']
+            }
+        }
+    },
+    'additionalProperties': False,
+    'required': ['servers']
+}
+
+VALID = [
+    {'servers': [{'id': 'ab12', 'status': 'ACTIVE'}]},
+    {'servers': [{'id': 'ab12', 'status': 'ERROR', 'progress': 0,
+                  'image': {'id': '1'}, 'metadata': {'key': 'value'},
+                  'links': [1, 2]}]},
+    {'servers': [{'id': 'ab12', 'status': 'ACTIVE', 'image': None}]},
+]
+
+INVALID = [
+    {},
+    {'servers': []},
+    {'servers': [{'id': 'ab12', 'status': 'ACTIVE'}], 'extra': 1},
+    {'servers': [{'id': 'AB12', 'status': 'ACTIVE'}]},
+    {'servers': [{'id': 12, 'status': 'ACTIVE'}]},
+    {'servers': [{'id': 'ab12', 'status': 'BUILD'}]},
+    {'servers': [{'id': 'ab12', 'status': 'ACTIVE', 'progress': -1}]},
+    {'servers': [{'id': 'ab12', 'status': 'ACTIVE', 'progress': True}]},
+    {'servers': [{'id': 'ab12', 'status': 'ACTIVE', 'image': {}}]},
+    {'servers': [{'id': 'ab12', 'status': 'ACTIVE', 'image': 1}]},
+    {'servers': [{'id': 'ab12', 'status': 'ACTIVE',
+                  'metadata': {'key': 1}}]},
+    {'servers': [{'id': 'ab12', 'status': 'ACTIVE',
+                  'metadata': {'KEY': 'value'}}]},
+    {'servers': [{'id': 'ab12', 'status': 'ACTIVE', 'links': [1, 1]}]},
+]
+
+
+class TestSchemaValidator(base.TestCase):
+
+    def test_valid(self):
+        validator = schema_validator.SchemaValidator(SCHEMA)
+        for instance in VALID:
+            self.assertTrue(validator.is_valid(instance))
+            validator.validate(instance)
+
+    def test_invalid(self):
+        validator = schema_validator.SchemaValidator(SCHEMA)
+        for instance in INVALID:
+            self.assertFalse(validator.is_valid(instance))
+            self.assertRaises(jsonschema.ValidationError,
+                              validator.validate, instance)
+
+    def test_same_error(self):
+        validator = schema_validator.SchemaValidator(SCHEMA)
+        for instance in INVALID:
+            try:
+                jsonschema.validate(instance, SCHEMA)
+            except jsonschema.ValidationError as ex:
+                expected = str(ex)
+            try:
+                validator.validate(instance)
+            except jsonschema.ValidationError as ex:
+                self.assertEqual(expected, str(ex))
+
+    def test_not_compiled(self):
+        validator = schema_validator.SchemaValidator(SCHEMA, compiled=False)
+        self.assertEqual(validator.validator.is_valid, validator.is_valid)
+        validator = schema_validator.SchemaValidator(
+            {'definitions': {'id': {'type': 'string'}},
+             'properties': {'id': {'$ref': '#/definitions/id'}}})
+        self.assertEqual(validator.validator.is_valid, validator.is_valid)
+        self.assertRaises(jsonschema.ValidationError,
+                          validator.validate, {'id': 1})
+
+    def test_invalid_schema(self):
+        self.assertRaises(jsonschema.SchemaError,
+                          schema_validator.SchemaValidator,
+                          {'type': 'unknown'})
+
+    def test_get_validator(self):
+        validator = schema_validator.get_validator(SCHEMA)
+        self.assertIs(validator, schema_validator.get_validator(SCHEMA))
+        other_schema = dict(SCHEMA)
+        self.assertIsNot(validator,
+                         schema_validator.get_validator(other_schema))
+
+
+class TestValidationSampler(base.TestCase):
+
+    def test_rate(self):
+        sampler = schema_validator.ValidationSampler(rate=0.5)
+        self.patch('random.random', side_effect=[0.2, 0.7, 0.4])
+        self.assertEqual([True, False, True],
+                         [sampler.sample(SCHEMA) for _ in range(3)])
+        self.assertEqual(2, sampler.validated)
+        self.assertEqual(1, sampler.skipped)
+
+    def test_first(self):
+        sampler = schema_validator.ValidationSampler(rate=0, first=2)
+        other_schema = dict(SCHEMA)
+        self.assertEqual([True, True, False],
+                         [sampler.sample(SCHEMA) for _ in range(3)])
+        self.assertTrue(sampler.sample(other_schema))
+        self.assertEqual(3, sampler.validated)
+        self.assertEqual(1, sampler.skipped)
+
+    def test_get_sampler(self):
+        self.useFixture(fake_config.ConfigFixture())
+        self.stubs.Set(config, 'TempestConfigPrivate', fake_config.FakePrivate)
+        self.patch('tempest.common.schema_validator._sampler', new=None)
+        atexit_mock = self.patch('atexit.register')
+        self.assertIsNone(schema_validator.get_sampler())
+        config.CONF.set_override('schema_validation_rate', 0.1, 'debug')
+        config.CONF.set_override('schema_validation_first', 5, 'debug')
+        sampler = schema_validator.get_sampler()
+        self.assertEqual(0.1, sampler.rate)
+        self.assertEqual(5, sampler.first)
+        self.assertIs(sampler, schema_validator.get_sampler())
+        atexit_mock.assert_called_once_with(mock.ANY, sampler)
@@ -13,8 +13,10 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import threading
 
 from tempest.common.utils import misc
+from tempest import test
 from tempest.tests import base
 
 
@@ -86,3 +88,101 @@ class TestMisc(base.TestCase):
             return misc.find_test_caller()
         self.assertEqual('TestMisc:tearDownClass',
                          tearDownClass(self.__class__))
+
+    def test_find_test_caller_from_context(self):
+        def setUp():
+            return misc.find_test_caller()
+        with misc.caller_context('Foo:test_bar'):
+            self.assertEqual('Foo:test_bar', misc.find_test_caller())
+            self.assertEqual('Foo:test_bar', setUp())
+        self.assertIsNone(misc.get_test_caller())
+        self.assertEqual(':setUp', setUp())
+
+    def test_caller_context_nested(self):
+        with misc.caller_context('Foo:setUpClass'):
+            with misc.caller_context('Foo:tearDownClass'):
+                self.assertEqual('Foo:tearDownClass', misc.find_test_caller())
+            self.assertEqual('Foo:setUpClass', misc.find_test_caller())
+
+    def test_caller_context_thread_local(self):
+        callers = []
+        thread = threading.Thread(
+            target=lambda: callers.append(misc.get_test_caller()))
+        with misc.caller_context('Foo:test_bar'):
+            thread.start()
+            thread.join()
+        self.assertEqual([None], callers)
+
+    def test_class_caller_context(self):
+        class Foo(object):
+            @classmethod
+            @misc.class_caller_context
+            def resource_setup(cls):
+                return misc.get_test_caller()
+        self.assertEqual('Foo:resource_setup', Foo.resource_setup())
+        self.assertIsNone(misc.get_test_caller())
+
+    def test_class_fixture_caller_context(self):
+        callers = []
+
+        class Foo(test.BaseTestCase):
+            @classmethod
+            def setUpClass(cls):
+                callers.append(misc.get_test_caller())
+
+        class Bar(Foo):
+            @classmethod
+            def setUpClass(cls):
+                super(Bar, cls).setUpClass()
+                callers.append(misc.get_test_caller())
+
+            @classmethod
+            def tearDownClass(cls):
+                callers.append(misc.get_test_caller())
+
+        Bar.setUpClass()
+        Bar.tearDownClass()
+        self.assertEqual(['Bar:setUpClass', 'Bar:setUpClass',
+                          'Bar:tearDownClass'], callers)
+        self.assertIsNone(misc.get_test_caller())
+
+
+class TestRunConcurrently(base.TestCase):
+
+    def test_all_items(self):
+        done = []
+        misc.run_concurrently(done.append, range(20), workers=4)
+        self.assertEqual(range(20), sorted(done))
+
+    def test_bounded_workers(self):
+        threads = set()
+
+        def _record(item):
+            threads.add(threading.current_thread())
+        misc.run_concurrently(_record, range(20), workers=3)
+        self.assertTrue(len(threads) <= 3)
+
+    def test_sequential(self):
+        threads = set()
+
+        def _record(item):
+            threads.add(threading.current_thread())
+        misc.run_concurrently(_record, range(5))
+        self.assertEqual(set([threading.current_thread()]), threads)
+
+    def _test_failure(self, workers):
+        done = []
+
+        def _fail_odd(item):
+            if item % 2:
+                raise ValueError(item)
+            done.append(item)
+        self.assertRaises(ValueError, misc.run_concurrently, _fail_odd,
+                          range(10), workers=workers)
+        self.assertEqual([0, 2, 4, 6, 8], sorted(done))
+
+    def test_failure(self):
+        self._test_failure(4)
+
+    def test_sequential_failure(self):
+        self._test_failure(1)
@@ -46,6 +46,8 @@ class ConfigFixture(conf_fixture.Config):
         self.conf.set_default('lock_path',
                               str(os.environ.get('OS_TEST_LOCK_PATH')))
         self.conf.set_default('auth_version', 'v2', group='identity')
+        # Do not share auth data between unit tests
+        self.conf.set_default('shared_token_cache', False, group='identity')
         for config_option in ['username', 'password', 'tenant_name']:
             # Identity group items
             for prefix in ['', 'alt_', 'admin_']:
@@ -66,8 +66,8 @@ class fake_httplib(object):
     def getheaders(self):
         return copy.deepcopy(self.headers).items()
 
-    def getheader(self, key, default):
+    def getheader(self, key, default=None):
         return self.headers.get(key, default)
 
-    def read(self, amt):
+    def read(self, amt=None):
         return self.body.read(amt)
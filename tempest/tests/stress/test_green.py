@@ -0,0 +1,86 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import signal
+
+import mock
+
+from tempest.stress import green
+from tempest.stress import metrics
+from tempest.stress import stressaction
+from tempest.tests import base
+
+
+class FakeStressAction(stressaction.StressAction):
+    def run(self):
+        pass
+
+
+class FakeGreenPool(object):
+    """Runs the spawned functions right away."""
+
+    def __init__(self, size):
+        self.size = size
+
+    def spawn(self, func, *args):
+        func(*args)
+
+    def waitall(self):
+        pass
+
+
+class TestGreen(base.TestCase):
+
+    def setUp(self):
+        super(TestGreen, self).setUp()
+        self.eventlet = mock.Mock(GreenPool=FakeGreenPool)
+        self.patch('tempest.stress.green.eventlet', new=self.eventlet)
+        self.signal = self.patch('signal.signal')
+
+    def test_not_available(self):
+        self.patch('tempest.stress.green.eventlet', new=None)
+        self.assertRaises(ValueError, green.check_available)
+
+    def test_execute(self):
+        actions = []
+
+        def _create_action():
+            action = FakeStressAction(manager=None, max_runs=6)
+            actions.append(action)
+            return action
+        statistic = metrics.SharedStatistic()
+        recorder = metrics.RunRecorder()
+        green.execute(_create_action, 3, statistic, recorder)
+        self.eventlet.monkey_patch.assert_called_once_with()
+        self.assertEqual(3, len(actions))
+        # max_runs applies to each worker, whose runs add up in the
+        # statistic of the process
+        self.assertEqual(18, statistic['runs'])
+        self.assertEqual(18, len(recorder.read()[0]))
+        self.assertEqual([signal.SIGHUP, signal.SIGTERM],
+                         [call[0][0] for call in self.signal.call_args_list])
+
+    def test_worker_statistic(self):
+        statistic = metrics.SharedStatistic()
+        workers = [green.WorkerStatistic(statistic) for _ in range(2)]
+        workers[0]['runs'] += 2
+        workers[1]['runs'] += 1
+        workers[1]['fails'] += 1
+        self.assertEqual((2, 0), (workers[0]['runs'], workers[0]['fails']))
+        self.assertEqual((3, 1), (statistic['runs'], statistic['fails']))
+
+    def test_setup_failure(self):
+        statistic = metrics.SharedStatistic()
+        create_action = mock.Mock(side_effect=Exception)
+        green.execute(create_action, 2, statistic)
+        self.assertEqual(2, create_action.call_count)
+        self.assertEqual(0, statistic['runs'])
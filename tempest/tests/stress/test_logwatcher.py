@@ -0,0 +1,79 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+
+from tempest.stress import logwatcher
+from tempest.tests import base
+
+
+class TestNodeLogs(base.TestCase):
+
+    def setUp(self):
+        super(TestNodeLogs, self).setUp()
+        self.client = mock.Mock()
+        self.patch('tempest.common.ssh.Client', return_value=self.client)
+        self.node_logs = logwatcher.NodeLogs('node1', '/var/log/nova/*.log',
+                                             'root')
+
+    def test_scan(self):
+        self.client.exec_command.return_value = (
+            '==> /var/log/nova/api.log 120\n'
+            '2014 ERROR nova.api boom\n'
+            '==> /var/log/nova/compute.log 0\n')
+        self.assertEqual(['2014 ERROR nova.api boom'], self.node_logs.scan())
+        self.assertEqual({'/var/log/nova/api.log': 120,
+                          '/var/log/nova/compute.log': 0},
+                         self.node_logs.offsets)
+
+    def test_scan_from_offsets(self):
+        self.client.exec_command.return_value = (
+            '==> /var/log/nova/api.log 120\n')
+        self.node_logs.scan()
+        self.assertNotIn('api.log) offset=',
+                         self.client.exec_command.call_args[0][0])
+        self.assertEqual([], self.node_logs.scan())
+        self.assertIn('/var/log/nova/api.log) offset=120;;',
+                      self.client.exec_command.call_args[0][0])
+
+
+class TestLogWatcher(base.TestCase):
+
+    def setUp(self):
+        super(TestLogWatcher, self).setUp()
+        # a client for each node
+        self.patch('tempest.common.ssh.Client',
+                   side_effect=[mock.Mock(), mock.Mock()])
+        self.watcher = logwatcher.LogWatcher(['node1', 'node2'], '*.log',
+                                             'root')
+
+    def test_scan(self):
+        self.watcher.nodes[0].scan = mock.Mock(return_value=[])
+        self.watcher.nodes[1].scan = mock.Mock(return_value=['ERROR boom'])
+        self.assertFalse(self.watcher.has_errors)
+        self.watcher.scan()
+        self.assertTrue(self.watcher.has_errors)
+        self.assertEqual([('node2', 'ERROR boom')], self.watcher.errors)
+
+    def test_scan_failure(self):
+        self.watcher.nodes[0].scan = mock.Mock(side_effect=Exception)
+        self.watcher.nodes[1].scan = mock.Mock(return_value=[])
+        self.watcher.scan()
+        self.assertFalse(self.watcher.has_errors)
+
+    def test_stop(self):
+        self.watcher.start()
+        self.watcher.stop()
+        clients = [node_logs.client for node_logs in self.watcher.nodes]
+        self.assertIsNot(clients[0], clients[1])
+        for client in clients:
+            client.close.assert_called_once_with()
@@ -0,0 +1,132 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import csv
+import json
+import multiprocessing
+import os
+
+import fixtures
+
+from tempest.stress import metrics
+from tempest.tests import base
+
+
+class TestRunRecorder(base.TestCase):
+
+    def test_read(self):
+        recorder = metrics.RunRecorder(size=8)
+        recorder.record(10.0, 0.5, False)
+        recorder.record(11.0, 1.5, True, 0.25)
+        self.assertEqual(([(10.0, 0.5, False, 0.0), (11.0, 1.5, True, 0.25)],
+                          0),
+                         recorder.read())
+        self.assertEqual(([], 0), recorder.read())
+
+    def test_lost(self):
+        recorder = metrics.RunRecorder(size=4)
+        for index in range(10):
+            recorder.record(float(index), 0.1, False)
+        runs, lost = recorder.read()
+        self.assertEqual([7.0, 8.0, 9.0], [run[0] for run in runs])
+        self.assertEqual(7, lost)
+
+
+class TestStressMetrics(base.TestCase):
+
+    def setUp(self):
+        super(TestStressMetrics, self).setUp()
+        self.path = self.useFixture(fixtures.TempDir()).path
+
+    def test_summarize(self):
+        runs = [(0, latency / 10.0, latency == 10, latency / 100.0)
+                for latency in range(1, 11)]
+        report = metrics.summarize('boot', runs, lost=2, interval=4)
+        self.assertEqual(10, report['runs'])
+        self.assertEqual(1, report['fails'])
+        self.assertEqual(3.0, report['ops_per_sec'])
+        self.assertEqual(0.1, report['error_rate'])
+        self.assertEqual(0.1, report['max_lag'])
+        self.assertEqual((0.5, 1.0, 1.0),
+                         (report['p50'], report['p95'], report['p99']))
+
+    def test_action_totals(self):
+        totals = metrics.ActionTotals('boot')
+        for _ in range(100):
+            totals.add([(0, latency / 10.0, latency == 10, latency / 100.0)
+                        for latency in range(1, 11)], lost=1)
+        report = totals.summarize(interval=100)
+        self.assertEqual((1000, 100, 100), (report['runs'], report['fails'],
+                                            report['lost']))
+        self.assertEqual(11.0, report['ops_per_sec'])
+        self.assertEqual(0.1, report['error_rate'])
+        self.assertEqual(0.1, report['max_lag'])
+        self.assertTrue(0.5 <= report['p50'] <= 0.5 * 1.05)
+        self.assertEqual(1.0, report['p99'])
+        self.assertTrue(len(totals.latencies.buckets) <= 10)
+
+    def _run(self, path):
+        stress_metrics = metrics.StressMetrics(path=path)
+        recorders = [metrics.RunRecorder() for _ in range(3)]
+        stress_metrics.add('boot', recorders[0])
+        stress_metrics.add('boot', recorders[1])
+        stress_metrics.add('attach', recorders[2])
+        recorders[0].record(1.0, 0.2, False)
+        recorders[1].record(1.0, 0.4, True)
+        reports = stress_metrics.report()
+        recorders[2].record(2.0, 0.3, False)
+        reports += stress_metrics.report()
+        stress_metrics.close()
+        self.assertEqual([('attach', 0), ('boot', 2), ('attach', 1),
+                          ('boot', 0)],
+                         [(r['action'], r['runs']) for r in reports])
+        summary = dict((r['action'], r) for r in stress_metrics.summary())
+        self.assertEqual(2, summary['boot']['runs'])
+        self.assertEqual(0.5, summary['boot']['error_rate'])
+        return reports
+
+    def test_json_reports(self):
+        path = os.path.join(self.path, 'metrics.json')
+        reports = self._run(path)
+        with open(path) as f:
+            self.assertEqual(reports, [json.loads(line) for line in f])
+
+    def test_csv_reports(self):
+        path = os.path.join(self.path, 'metrics.csv')
+        self._run(path)
+        with open(path) as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(4, len(rows))
+        self.assertEqual(['boot', '2', '1'],
+                         [rows[1]['action'], rows[1]['runs'],
+                          rows[1]['fails']])
+
+
+class TestSharedStatistic(base.TestCase):
+
+    def test_counters(self):
+        statistic = metrics.SharedStatistic()
+        self.assertEqual((0, 0), (statistic['runs'], statistic['fails']))
+        statistic['runs'] += 2
+        statistic['fails'] += 1
+        self.assertEqual((2, 1), (statistic['runs'], statistic['fails']))
+        self.assertRaises(KeyError, statistic.__getitem__, 'other')
+
+    def test_shared_with_process(self):
+        statistic = metrics.SharedStatistic()
+
+        def _count():
+            statistic['runs'] += 3
+        process = multiprocessing.Process(target=_count)
+        process.start()
+        process.join()
+        self.assertEqual(3, statistic['runs'])
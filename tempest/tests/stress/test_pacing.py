@@ -0,0 +1,81 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+
+from tempest.stress import pacing
+from tempest.tests import base
+
+
+class TestRateProfile(base.TestCase):
+
+    def _times(self, test, runs):
+        profile = pacing.RateProfile.from_test(test)
+        return [profile.time_of(run) for run in range(runs)]
+
+    def test_closed_loop(self):
+        self.assertIsNone(pacing.RateProfile.from_test({'threads': 2}))
+
+    def test_rate(self):
+        self.assertEqual([0, 0.5, 1.0, 1.5], self._times({'rate': 2}, 4))
+
+    def test_step(self):
+        test = {'profile': {'type': 'step', 'rates': [1, 4],
+                            'step_duration': 2}}
+        self.assertEqual([0, 1, 2, 2.25, 2.5], self._times(test, 5))
+
+    def test_linear(self):
+        test = {'profile': {'type': 'linear', 'start_rate': 0,
+                            'end_rate': 4, 'duration': 2}}
+        # 1 run after 1s, 4 after 2s, then 4 per second
+        times = self._times(test, 6)
+        self.assertEqual([0, 1, 2], [times[0], times[1], times[4]])
+        self.assertAlmostEqual(2.25, times[5])
+
+    def test_spike(self):
+        test = {'profile': {'type': 'spike', 'rate': 1, 'spike_rate': 10,
+                            'spike_start': 2, 'spike_duration': 0.5}}
+        times = self._times(test, 9)
+        self.assertAlmostEqual(2.4, times[6])
+        self.assertAlmostEqual(3.5, times[8])
+
+    def test_rate_drops_to_zero(self):
+        test = {'profile': {'type': 'step', 'rates': [2, 0],
+                            'step_duration': 1}}
+        self.assertEqual([0, 0.5, None], self._times(test, 3))
+
+    def test_invalid(self):
+        for profile in ({'type': 'linear', 'start_rate': 1},
+                        {'type': 'step', 'rates': [], 'step_duration': 1},
+                        {'type': 'sine'}):
+            self.assertRaises(ValueError, pacing.RateProfile.from_test,
+                              {'profile': profile})
+        self.assertRaises(ValueError, pacing.RateProfile.from_test,
+                          {'rate': -1})
+
+
+class TestPacer(base.TestCase):
+
+    @mock.patch('time.sleep')
+    @mock.patch('time.time')
+    def test_wait(self, time_mock, sleep_mock):
+        pacer = pacing.Pacer(pacing.RateProfile.from_test({'rate': 1}))
+        time_mock.return_value = 100.0
+        pacer.start()
+        self.assertEqual(0, pacer.wait())
+        self.assertFalse(sleep_mock.called)
+        time_mock.return_value = 100.5
+        pacer.wait()
+        sleep_mock.assert_called_once_with(0.5)
+        # the third run is 1.5s late
+        time_mock.return_value = 103.5
+        self.assertEqual(1.5, pacer.wait())
@@ -13,6 +13,9 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from tempest.stress.actions import unit_test
+from tempest.stress import metrics
+from tempest.stress import pacing
 import tempest.stress.stressaction as stressaction
 import tempest.test
 
@@ -61,3 +64,35 @@ class TestStressAction(tempest.test.BaseTestCase):
         stressAction.execute(stats)
         self.assertEqual(stats['runs'], 1)
         self.assertEqual(stats['fails'], 1)
+
+    def testStressTestRunRecorded(self):
+        stressAction = FakeStressActionFailing(manager=None, max_runs=2)
+        recorder = metrics.RunRecorder()
+        stressAction.execute(self._bulid_stats_dict(), recorder)
+        runs, lost = recorder.read()
+        self.assertEqual(2, len(runs))
+        self.assertEqual([True, True], [run[2] for run in runs])
+
+    def testStressTestRunSharedStatistic(self):
+        stressAction = FakeStressActionFailing(manager=None, max_runs=3)
+        stats = metrics.SharedStatistic()
+        stressAction.execute(stats)
+        self.assertEqual(3, stats['runs'])
+        self.assertEqual(3, stats['fails'])
+
+    def testStressTestRunPaced(self):
+        stressAction = FakeStressAction(manager=None)
+        profile = pacing.RateProfile.from_test(
+            {'profile': {'type': 'step', 'rates': [1000, 0],
+                         'step_duration': 0.003}})
+        pacer = pacing.Pacer(profile)
+        pacer.start()
+        stats = self._bulid_stats_dict()
+        stressAction.execute(stats, pacer=pacer)
+        self.assertEqual(3, stats['runs'])
+
+    def testActionName(self):
+        self.assertEqual('FakeStressAction',
+                         FakeStressAction.action_name(foo='bar'))
+        self.assertEqual('test_foo', unit_test.UnitTest.action_name(
+            test_method='tempest.api.fake.FakeTest.test_foo'))
@@ -15,7 +15,11 @@
 
 import copy
 import datetime
+import os
+import shutil
 
+import mock
+from oslo.config import cfg
 from oslotest import mockpatch
 
 from tempest import auth
@@ -45,7 +49,7 @@ class BaseAuthTestsSetUp(base.TestCase):
         self.useFixture(fake_config.ConfigFixture())
         self.stubs.Set(config, 'TempestConfigPrivate', fake_config.FakePrivate)
         self.fake_http = fake_http.fake_httplib2(return_type=200)
-        self.stubs.Set(http.ClosingHttp, 'request', self.fake_http.request)
+        self.stubs.Set(http.KeepAliveHttp, 'request', self.fake_http.request)
         self.stubs.Set(auth, 'get_credentials',
                        fake_auth_provider.get_credentials)
         self.stubs.Set(auth, 'get_default_credentials',
@@ -125,7 +129,7 @@ class TestKeystoneV2AuthProvider(BaseAuthTestsSetUp):
 
     def setUp(self):
         super(TestKeystoneV2AuthProvider, self).setUp()
-        self.stubs.Set(http.ClosingHttp, 'request',
+        self.stubs.Set(http.KeepAliveHttp, 'request',
                        fake_identity._fake_v2_response)
         self.target_url = 'test_api'
 
@@ -319,6 +323,36 @@ class TestKeystoneV2AuthProvider(BaseAuthTestsSetUp):
         expected = 'http://fake_url/'
         self._test_base_url_helper(expected, self.filters)
 
+    def test_base_url_looked_up_once_per_token(self):
+        filters = {
+            'service': 'compute',
+            'endpoint_type': 'publicURL',
+            'region': 'FakeRegion'
+        }
+        get_base_url = self.useFixture(mockpatch.PatchObject(
+            self.auth_provider, '_get_base_url',
+            wraps=self.auth_provider._get_base_url)).mock
+        url = self.auth_provider.base_url(filters)
+        self.assertEqual(url, self.auth_provider.base_url(filters))
+        self.assertEqual(1, get_base_url.call_count)
+        # A new token invalidates the resolved URLs
+        token, auth_data = self.auth_provider.auth_data
+        self.auth_provider.base_url(filters, ('new_token', auth_data))
+        self.assertEqual(2, get_base_url.call_count)
+        self.assertEqual(['new_token'], self.auth_provider._base_urls.keys())
+
+    def test_request_removes_multiple_slashes(self):
+        filters = {
+            'service': 'compute',
+            'endpoint_type': 'publicURL',
+            'region': 'FakeRegion'
+        }
+        url, _, _ = self.auth_provider.auth_request(
+            'GET', '/' + self.target_url + '//path', filters=filters)
+        base_url = self._get_result_url_from_endpoint(
+            self._endpoints[0]['endpoints'][1])
+        self.assertEqual(base_url + '/' + self.target_url + '/path', url)
+
     def test_token_not_expired(self):
         expiry_data = datetime.datetime.utcnow() + datetime.timedelta(days=1)
         auth_data = self._auth_data_with_expiry(
@@ -346,7 +380,7 @@ class TestKeystoneV3AuthProvider(TestKeystoneV2AuthProvider):
 
     def setUp(self):
         super(TestKeystoneV3AuthProvider, self).setUp()
-        self.stubs.Set(http.ClosingHttp, 'request',
+        self.stubs.Set(http.KeepAliveHttp, 'request',
                        fake_identity._fake_v3_response)
 
     def _get_fake_alt_identity(self):
@@ -411,3 +445,84 @@ class TestKeystoneV3AuthProvider(TestKeystoneV2AuthProvider):
         expected = self._get_result_url_from_endpoint(
             self._endpoints[0]['endpoints'][2])
         self._test_base_url_helper(expected, self.filters)
+
+
+class TestSharedTokenCache(BaseAuthTestsSetUp):
+    _auth_provider_class = auth.KeystoneV2AuthProvider
+    credentials = fake_credentials.FakeKeystoneV2Credentials()
+
+    def setUp(self):
+        super(TestSharedTokenCache, self).setUp()
+        cfg.CONF.set_default('shared_token_cache', True, group='identity')
+        self.addCleanup(auth.token_cache.clear)
+        self.auth_calls = mock.Mock(
+            side_effect=fake_identity._fake_v2_response)
+        self.stubs.Set(http.KeepAliveHttp, 'request',
+                       lambda *args, **kwargs: self.auth_calls(*args,
+                                                               **kwargs))
+        self.useFixture(mockpatch.PatchObject(
+            auth.KeystoneV2AuthProvider, 'is_expired', return_value=False))
+
+    def _other_credentials(self):
+        return auth.KeystoneV2Credentials(username='other_user',
+                                          password='other_password',
+                                          tenant_name='other_tenant')
+
+    def test_token_shared(self):
+        other_provider = self._auth(
+            fake_credentials.FakeKeystoneV2Credentials())
+        token = self.auth_provider.get_token()
+        self.assertEqual(token, other_provider.get_token())
+        self.assertEqual(1, self.auth_calls.call_count)
+        self.assertEqual(self.auth_provider.token_cache_key(),
+                         other_provider.token_cache_key())
+
+    def test_token_not_shared_between_credentials(self):
+        other_provider = self._auth(self._other_credentials())
+        self.auth_provider.get_token()
+        other_provider.get_token()
+        self.assertEqual(2, self.auth_calls.call_count)
+        self.assertNotEqual(self.auth_provider.token_cache_key(),
+                            other_provider.token_cache_key())
+
+    def test_expired_token_refreshed(self):
+        self.auth_provider.get_token()
+        self.useFixture(mockpatch.PatchObject(
+            auth.KeystoneV2AuthProvider, 'is_expired', return_value=True))
+        self.auth_provider.get_token()
+        self.assertEqual(2, self.auth_calls.call_count)
+
+    def test_clear_auth_invalidates_shared_token(self):
+        other_provider = self._auth(
+            fake_credentials.FakeKeystoneV2Credentials())
+        self.auth_provider.get_token()
+        other_provider.get_token()
+        self.auth_provider.clear_auth()
+        other_provider.get_token()
+        self.assertEqual(2, self.auth_calls.call_count)
+        self.assertIsNot(other_provider.cache, self.auth_provider.cache)
+
+    def test_shared_token_cache_disabled(self):
+        cfg.CONF.set_default('shared_token_cache', False, group='identity')
+        other_provider = self._auth(
+            fake_credentials.FakeKeystoneV2Credentials())
+        self.auth_provider.get_token()
+        other_provider.get_token()
+        self.assertEqual(2, self.auth_calls.call_count)
+
+    def test_persistent_token_cache(self):
+        cfg.CONF.set_default('persistent_token_cache', True,
+                             group='identity')
+        token = self.auth_provider.get_token()
+        cache_dir = os.path.join(config.CONF.lock_path, 'token_cache')
+        self.addCleanup(shutil.rmtree, cache_dir)
+        cache_files = os.listdir(cache_dir)
+        self.assertEqual(1, len(cache_files))
+        cache_file = os.path.join(cache_dir, cache_files[0])
+        self.assertEqual(0o600, os.stat(cache_file).st_mode & 0o777)
+        # A new process only has the file based cache
+        auth.token_cache.clear()
+        other_provider = self._auth(
+            fake_credentials.FakeKeystoneV2Credentials())
+        self.assertEqual(token, other_provider.get_token())
+        self.assertEqual(1, self.auth_calls.call_count)
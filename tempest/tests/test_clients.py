@@ -0,0 +1,73 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from oslo.config import cfg
+
+from tempest import clients
+from tempest.common import http
+from tempest import config
+from tempest.services.compute.json import servers_client
+from tempest.tests import base
+from tempest.tests import fake_config
+from tempest.tests import fake_credentials
+from tempest.tests import fake_identity
+
+
+class TestManager(base.TestCase):
+
+    def setUp(self):
+        super(TestManager, self).setUp()
+        self.useFixture(fake_config.ConfigFixture())
+        self.stubs.Set(config, 'TempestConfigPrivate', fake_config.FakePrivate)
+        self.stubs.Set(http.KeepAliveHttp, 'request',
+                       fake_identity._fake_v2_response)
+        self.manager = clients.Manager(
+            credentials=fake_credentials.FakeKeystoneV2Credentials())
+
+    def test_no_client_built_on_init(self):
+        self.assertEqual([], self.manager.instantiated_clients())
+        self.assertIn('servers_client', self.manager.client_attr_names)
+
+    def test_client_built_on_first_access(self):
+        client = self.manager.servers_client
+        self.assertIsInstance(client, servers_client.ServersClientJSON)
+        self.assertIs(client, self.manager.servers_client)
+        self.assertEqual(['servers_client'],
+                         self.manager.instantiated_clients())
+
+    def test_clients_share_http_obj(self):
+        self.assertIs(self.manager.http_obj,
+                      self.manager.servers_client.http_obj)
+        self.assertIs(self.manager.http_obj,
+                      self.manager.network_client.http_obj)
+        self.assertIs(self.manager.http_obj,
+                      self.manager.auth_provider.auth_client.http_obj)
+
+    def test_clients_own_http_obj_without_keepalive(self):
+        cfg.CONF.set_default('http_keepalive', False, group='identity')
+        manager = clients.Manager(
+            credentials=fake_credentials.FakeKeystoneV2Credentials())
+        self.assertIsNone(manager.http_obj)
+        servers_http = manager.servers_client.http_obj
+        self.assertIsInstance(servers_http, http.ClosingHttp)
+        self.assertIsNot(servers_http, manager.network_client.http_obj)
+        self.assertIsNot(servers_http,
+                         manager.auth_provider.auth_client.http_obj)
+
+    def test_unavailable_service_client(self):
+        cfg.CONF.set_default('glance', False, group='service_available')
+        self.assertFalse(hasattr(self.manager, 'image_client'))
+        self.assertEqual([], self.manager.instantiated_clients())
+
+    def test_client_override(self):
+        self.manager.servers_client = 'fake_client'
+        self.assertEqual('fake_client', self.manager.servers_client)
@@ -79,7 +79,7 @@ class KeystoneV2CredentialsTests(CredentialsTests):
 
     def setUp(self):
         super(KeystoneV2CredentialsTests, self).setUp()
-        self.stubs.Set(http.ClosingHttp, 'request', self.identity_response)
+        self.stubs.Set(http.KeepAliveHttp, 'request', self.identity_response)
 
     def _verify_credentials(self, credentials_class, filled=True,
                             creds_dict=None):
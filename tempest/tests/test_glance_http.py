@@ -13,18 +13,23 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import hashlib
 import httplib
 import json
 import socket
+import tempfile
 
 import mock
 import six
 
 from tempest.common import glance_http
+from tempest import config
 from tempest import exceptions
 from tempest.openstack.common.fixture import mockpatch
+from tempest.services.image.v2.json import image_client
 from tempest.tests import base
 from tempest.tests import fake_auth_provider
+from tempest.tests import fake_config
 from tempest.tests import fake_http
 
 
@@ -138,6 +143,48 @@ class TestGlanceHTTPClient(base.TestCase):
         self.assertEqual('fake_response_body', body.read())
         httplib.HTTPConnection.send.assert_call_count(req_body.len)
 
+    def test_raw_request_chunked_framing(self):
+        self.useFixture(mockpatch.PatchObject(glance_http,
+                                              'CHUNKSIZE', 4))
+        self.useFixture(mockpatch.PatchObject(httplib.HTTPConnection,
+                        'endheaders'))
+        sent = []
+        self.useFixture(mockpatch.PatchObject(
+            httplib.HTTPConnection, 'send',
+            side_effect=lambda data: sent.append(memoryview(data).tobytes())))
+        self._set_response_fixture({}, 200, 'fake_response_body')
+        req_body = tempfile.TemporaryFile()
+        self.addCleanup(req_body.close)
+        req_body.write('0123456789abcdefghij')
+        req_body.seek(0)
+        self.client.raw_request('PUT', '/images', body=req_body)
+        self.assertEqual('4\r\n0123\r\n4\r\n4567\r\n4\r\n89ab\r\n'
+                         '4\r\ncdef\r\n4\r\nghij\r\n0\r\n\r\n',
+                         ''.join(sent))
+
+    def test_iter_chunks_without_readinto(self):
+        self.useFixture(mockpatch.PatchObject(glance_http,
+                                              'CHUNKSIZE', 16))
+        body = six.StringIO('X' * 20)
+        chunks = [chunk.tobytes() for chunk in glance_http._iter_chunks(body)]
+        self.assertEqual(['10\r\n' + 'X' * 16 + '\r\n', '4\r\nXXXX\r\n'],
+                         chunks)
+
+    def test_raw_request_octet_stream(self):
+        self._set_response_fixture(
+            {'content-type': 'application/octet-stream'}, 200, 'image_data')
+        resp, body = self.client.raw_request('GET', '/images/1/file')
+        self.assertIsInstance(body, glance_http.ResponseBodyIterator)
+        self.assertEqual(['image_data'], list(body))
+
+    def test_write_body(self):
+        dest = six.StringIO()
+        size, checksum = glance_http.write_body(iter(['image', '_data']),
+                                                dest)
+        self.assertEqual('image_data', dest.getvalue())
+        self.assertEqual(10, size)
+        self.assertEqual(hashlib.md5('image_data').hexdigest(), checksum)
+
     def test_get_connection_class_for_https(self):
         conn_class = self.client.get_connection_class('https')
         self.assertEqual(glance_http.VerifiedHTTPSConnection, conn_class)
@@ -202,6 +249,64 @@ class TestGlanceHTTPClient(base.TestCase):
         self.assertEqual(6, len(kwargs.keys()))
 
 
+class TestImageClientV2(base.TestCase):
+
+    def setUp(self):
+        super(TestImageClientV2, self).setUp()
+        self.useFixture(fake_config.ConfigFixture())
+        self.stubs.Set(config, 'TempestConfigPrivate', fake_config.FakePrivate)
+        fake_auth = fake_auth_provider.FakeAuthProvider()
+        fake_auth.base_url = mock.MagicMock(return_value='http://fake_url.com')
+        self.useFixture(mockpatch.PatchObject(httplib.HTTPConnection,
+                                              'request'))
+        self.client = image_client.ImageClientV2JSON(fake_auth)
+        self.client._http = glance_http.HTTPClient(fake_auth, {})
+        self.checksum = hashlib.md5('image_data').hexdigest()
+
+    def _set_response_fixture(self, headers, status=200,
+                              resp_body='image_data'):
+        headers.setdefault('content-type', 'application/octet-stream')
+        resp = fake_http.fake_httplib(headers, status=status,
+                                      body=six.StringIO(resp_body))
+        self.useFixture(mockpatch.PatchObject(httplib.HTTPConnection,
+                        'getresponse', return_value=resp))
+
+    def test_get_image_file_iter(self):
+        self._set_response_fixture({})
+        resp, body_iter = self.client.get_image_file_iter('1')
+        self.assertEqual(200, resp.status)
+        self.assertEqual(['image_data'], list(body_iter))
+        self.assertEqual('v2/images/1/file',
+                         httplib.HTTPConnection.request.call_args[0][1])
+
+    def test_get_image_file_iter_not_found(self):
+        self._set_response_fixture({'content-type': 'text/plain'}, 404,
+                                   'not found')
+        self.assertRaises(exceptions.NotFound,
+                          self.client.get_image_file_iter, '1')
+
+    def test_download_image_file(self):
+        self._set_response_fixture({'content-md5': self.checksum})
+        dest = six.StringIO()
+        resp, checksum = self.client.download_image_file('1', dest)
+        self.assertEqual('image_data', dest.getvalue())
+        self.assertEqual(self.checksum, checksum)
+
+    def test_download_image_file_without_checksum(self):
+        self._set_response_fixture({})
+        dest = six.StringIO()
+        resp, checksum = self.client.download_image_file('1', dest)
+        self.assertEqual('image_data', dest.getvalue())
+        self.assertEqual(self.checksum, checksum)
+
+    def test_download_image_file_checksum_mismatch(self):
+        self._set_response_fixture(
+            {'content-md5': hashlib.md5('other_data').hexdigest()})
+        self.assertRaises(exceptions.InvalidHTTPResponseBody,
+                          self.client.download_image_file, '1',
+                          six.StringIO())
+
+
 class TestResponseBodyIterator(base.TestCase):
 
     def test_iter_default_chunk_size_64k(self):
@@ -15,8 +15,10 @@
 import json
 
 import httplib2
+from oslo.config import cfg
 from oslotest import mockpatch
 
+from tempest.common import http
 from tempest.common import negative_rest_client
 from tempest.common import rest_client
 from tempest import config
@@ -429,6 +431,91 @@ class TestRestClientUtils(BaseRestClientTestClass):
                           '1234')
 
 
+class TestRestClientHttpObj(BaseRestClientTestClass):
+
+    def setUp(self):
+        self.fake_http = fake_http.fake_httplib2()
+        super(TestRestClientHttpObj, self).setUp()
+
+    def test_http_obj_built_on_first_use(self):
+        self.assertIsNone(self.rest_client._http_obj)
+        http_obj = self.rest_client.http_obj
+        self.assertIsInstance(http_obj, http.KeepAliveHttp)
+        self.assertIs(http_obj, self.rest_client.http_obj)
+
+    def test_http_obj_no_keepalive(self):
+        cfg.CONF.set_default('http_keepalive', False, group='identity')
+        self.assertIsInstance(self.rest_client.http_obj, http.ClosingHttp)
+
+    def test_shared_http_obj(self):
+        shared_http = http.KeepAliveHttp()
+        other_client = rest_client.RestClient(
+            fake_auth_provider.FakeAuthProvider(), None, None)
+        self.useFixture(mockpatch.PatchObject(other_client, '_log_request'))
+        self.rest_client.http_obj = shared_http
+        other_client.http_obj = shared_http
+        self.rest_client.get(self.url)
+        other_client.get(self.url)
+        self.assertIs(shared_http, self.rest_client.http_obj)
+        self.assertIs(shared_http, other_client.http_obj)
+        # Both requests went through the same idle connection
+        self.assertEqual(1, len(shared_http._pools.values()[0]))
+
+
+class TestRestClientLogging(base.TestCase):
+
+    def setUp(self):
+        super(TestRestClientLogging, self).setUp()
+        self.useFixture(fake_config.ConfigFixture())
+        self.stubs.Set(config, 'TempestConfigPrivate', fake_config.FakePrivate)
+        self.rest_client = rest_client.RestClient(
+            fake_auth_provider.FakeAuthProvider(), None, None)
+        self.log = self.useFixture(mockpatch.PatchObject(
+            self.rest_client, 'LOG')).mock
+        self.resp = {'status': '200', 'x-compute-request-id': 'req-1'}
+        self.headers = {'X-Auth-Token': 'secret'}
+
+    def _log_request(self):
+        self.rest_client._log_request('GET', 'http://fake/v2', self.resp,
+                                      secs=0.5, req_headers=self.headers,
+                                      req_body='12345', resp_body='body')
+
+    def test_debug_disabled(self):
+        self.log.isEnabledFor.return_value = False
+        self._log_request()
+        self.assertFalse(self.log.debug.called)
+        self.assertEqual(1, self.log.info.call_count)
+
+    def test_debug_enabled(self):
+        self.log.isEnabledFor.return_value = True
+        self._log_request()
+        self.assertFalse(self.log.info.called)
+        message = self.log.debug.call_args[0][0]
+        self.assertIn('<omitted>', message)
+        self.assertNotIn('secret', message)
+        # The headers of the request are left untouched
+        self.assertEqual('secret', self.headers['X-Auth-Token'])
+
+    def test_record_attributes(self):
+        self.log.isEnabledFor.return_value = False
+        self._log_request()
+        extra = self.log.info.call_args[1]['extra']
+        self.assertEqual('req-1', extra['request_id'])
+        self.assertEqual('GET', extra['request_method'])
+        self.assertEqual('200', extra['response_status'])
+        self.assertEqual(0.5, extra['request_time'])
+        self.assertEqual(5, extra['request_body_size'])
+        self.assertEqual(4, extra['response_body_size'])
+
+    def test_safe_body_truncated(self):
+        self.assertEqual('a' * 10, self.rest_client._safe_body('a' * 100,
+                                                               maxlen=10))
+
+    def test_request_start_not_traced(self):
+        self.rest_client._log_request_start('GET', 'http://fake/v2')
+        self.assertFalse(self.log.debug.called)
+
+
 class TestNegativeRestClient(BaseRestClientTestClass):
 
     def setUp(self):
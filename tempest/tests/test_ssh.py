@@ -187,3 +187,171 @@ class TestSshClient(base.TestCase):
         chan_mock.recv_stderr.assert_called_once_with(1024)
         chan_mock.recv_exit_status.assert_called_once_with()
         closed_prop.assert_called_once_with()
+
+    def _set_connection_cache_mocks(self):
+        gsc_mock = self.patch('tempest.common.ssh.Client._get_ssh_connection')
+        client_mock = mock.MagicMock()
+        gsc_mock.return_value = client_mock
+        client_mock.get_transport.return_value.is_active.return_value = True
+        return gsc_mock, client_mock
+
+    def test_connection_cache(self):
+        gsc_mock, client_mock = self._set_connection_cache_mocks()
+        cache = ssh.ConnectionCache()
+        client = ssh.Client('localhost', 'root', connection_cache=cache)
+        other_client = ssh.Client('localhost', 'root', connection_cache=cache)
+
+        self.assertIs(client_mock, client._get_connection())
+        self.assertIs(client_mock, other_client._get_connection())
+        self.assertEqual(1, gsc_mock.call_count)
+        client._release_connection(client_mock)
+        other_client._release_connection(client_mock)
+
+        other_client.close()
+        client_mock.close.assert_called_once_with()
+        client._get_connection()
+        self.assertEqual(2, gsc_mock.call_count)
+
+    def test_connection_cache_idle_timeout(self):
+        gsc_mock, client_mock = self._set_connection_cache_mocks()
+        time_mock = self.patch('time.time')
+        time_mock.return_value = 1000
+        cache = ssh.ConnectionCache(idle_timeout=60)
+        client = ssh.Client('localhost', 'root', connection_cache=cache)
+
+        client._release_connection(client._get_connection())
+        time_mock.return_value = 1060
+        client._release_connection(client._get_connection())
+        self.assertEqual(1, gsc_mock.call_count)
+        time_mock.return_value = 1121
+        client._get_connection()
+        self.assertEqual(2, gsc_mock.call_count)
+        client_mock.close.assert_called_once_with()
+
+    def test_connection_cache_open_channel(self):
+        gsc_mock, client_mock = self._set_connection_cache_mocks()
+        time_mock = self.patch('time.time')
+        time_mock.return_value = 1000
+        cache = ssh.ConnectionCache(idle_timeout=60)
+        client = ssh.Client('localhost', 'root', connection_cache=cache)
+        other_client = ssh.Client('localhost', 'root', connection_cache=cache)
+
+        # a long command keeps the connection in use
+        client._get_connection()
+        time_mock.return_value = 1200
+        other_client._release_connection(other_client._get_connection())
+        self.assertEqual(1, gsc_mock.call_count)
+        time_mock.return_value = 1300
+        client._release_connection(client_mock)
+        time_mock.return_value = 1360
+        client._release_connection(client._get_connection())
+        self.assertEqual(1, gsc_mock.call_count)
+        self.assertFalse(client_mock.close.called)
+
+    def test_connection_cache_close_open_channel(self):
+        gsc_mock, client_mock = self._set_connection_cache_mocks()
+        cache = ssh.ConnectionCache()
+        client = ssh.Client('localhost', 'root', connection_cache=cache)
+        other_client = ssh.Client('localhost', 'root', connection_cache=cache)
+
+        new_client_mock = mock.MagicMock()
+        gsc_mock.side_effect = [client_mock, new_client_mock]
+
+        client._get_connection()
+        other_client.close()
+        self.assertFalse(client_mock.close.called)
+        self.assertIs(new_client_mock, other_client._get_connection())
+        client._release_connection(client_mock)
+        client_mock.close.assert_called_once_with()
+        self.assertFalse(new_client_mock.close.called)
+
+    def test_connection_cache_inactive(self):
+        gsc_mock, client_mock = self._set_connection_cache_mocks()
+        cache = ssh.ConnectionCache()
+        client = ssh.Client('localhost', 'root', connection_cache=cache)
+        other_client = ssh.Client('localhost', 'admin', connection_cache=cache)
+
+        client._get_connection()
+        other_client._get_connection()
+        self.assertEqual(2, gsc_mock.call_count)
+        client_mock.get_transport.return_value.is_active.return_value = False
+        client._get_connection()
+        self.assertEqual(3, gsc_mock.call_count)
+
+    def test_open_session_reconnects(self):
+        gsc_mock, client_mock = self._set_connection_cache_mocks()
+        tran_mock = client_mock.get_transport.return_value
+        tran_mock.open_session.side_effect = [socket.error,
+                                              mock.sentinel.channel]
+        cache = ssh.ConnectionCache()
+        client = ssh.Client('localhost', 'root', connection_cache=cache)
+
+        self.assertEqual((client_mock, mock.sentinel.channel),
+                         client._open_session())
+        self.assertEqual(2, gsc_mock.call_count)
+        client_mock.close.assert_called_once_with()
+
+    def test_open_session_no_reuse(self):
+        gsc_mock, client_mock = self._set_connection_cache_mocks()
+        tran_mock = client_mock.get_transport.return_value
+        tran_mock.open_session.side_effect = socket.error
+        client = ssh.Client('localhost', 'root')
+
+        self.assertRaises(socket.error, client._open_session)
+        self.assertEqual(1, gsc_mock.call_count)
+
+    def _set_exec_command_mocks(self, stdout, stderr, exit_status):
+        poll_mock = self.patch('select.poll').return_value
+        client = ssh.Client('localhost', 'root', timeout=2)
+        chan_mock = mock.MagicMock()
+        self.patch('tempest.common.ssh.Client._open_session',
+                   return_value=(mock.Mock(), chan_mock))
+        poll_mock.poll.return_value = [1]
+        chunks = len(stdout) + len(stderr) + 1
+        stdout = stdout + [''] * (chunks - len(stdout))
+        stderr = stderr + [''] * (chunks - len(stderr))
+        chan_mock.recv.side_effect = stdout
+        chan_mock.recv_stderr.side_effect = stderr
+        type(chan_mock).closed = mock.PropertyMock(
+            side_effect=[False] * (chunks - 1) + [True])
+        chan_mock.recv_exit_status.return_value = exit_status
+        return client, chan_mock
+
+    def test_exec_command_stream(self):
+        client, chan_mock = self._set_exec_command_mocks(
+            ['abc', 'def'], [], 0)
+        stream = client.exec_command_stream("test", buf_size=4096)
+        self.assertEqual(['abc', 'def'], list(stream))
+        chan_mock.recv.assert_called_with(4096)
+        chan_mock.close.assert_called_once_with()
+
+    def test_exec_command_stream_releases_connection(self):
+        client, chan_mock = self._set_exec_command_mocks(['abc'], [], 0)
+        release_mock = self.patch(
+            'tempest.common.ssh.Client._release_connection')
+        ssh_mock = client._open_session.return_value[0]
+        stream = client.exec_command_stream("test")
+        self.assertEqual('abc', next(stream))
+        self.assertFalse(release_mock.called)
+        stream.close()
+        chan_mock.close.assert_called_once_with()
+        release_mock.assert_called_once_with(ssh_mock)
+
+    def test_exec_command_stream_failed(self):
+        self.patch('tempest.common.ssh.STDERR_LIMIT', new=4)
+        client, chan_mock = self._set_exec_command_mocks(
+            ['abc'], ['err1', 'err2'], 1)
+        stream = client.exec_command_stream("test")
+        self.assertEqual('abc', next(stream))
+        exc = self.assertRaises(exceptions.SSHExecCommandFailed, list,
+                                stream)
+        self.assertIn('Error:\nerr2', str(exc))
+        self.assertNotIn('err1', str(exc))
+
+    def test_exec_command_to_file(self):
+        client, chan_mock = self._set_exec_command_mocks(
+            ['abc', 'def'], [], 0)
+        sink = mock.Mock()
+        self.assertEqual(6, client.exec_command_to_file("test", sink))
+        self.assertEqual([mock.call('abc'), mock.call('def')],
+                         sink.write.mock_calls)
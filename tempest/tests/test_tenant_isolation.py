@@ -35,7 +35,7 @@ class TestTenantIsolation(base.TestCase):
         self.useFixture(fake_config.ConfigFixture())
         self.stubs.Set(config, 'TempestConfigPrivate', fake_config.FakePrivate)
         self.fake_http = fake_http.fake_httplib2(return_type=200)
-        self.stubs.Set(http.ClosingHttp, 'request',
+        self.stubs.Set(http.KeepAliveHttp, 'request',
                        fake_identity._fake_v2_response)
         cfg.CONF.set_default('operator_role', 'FakeRole',
                              group='object-storage')
@@ -500,3 +500,179 @@ class TestTenantIsolation(base.TestCase):
         self._mock_tenant_create('1234', 'fake_prim_tenant')
         self.assertRaises(exceptions.InvalidConfiguration,
                           iso_creds.get_primary_creds)
+
+    @mock.patch('tempest.common.rest_client.RestClient')
+    def test_pooled_creds(self, MockRestClient):
+        cfg.CONF.set_default('neutron', False, 'service_available')
+        pool = mock.Mock()
+        pool.get.return_value = (mock.sentinel.creds, None)
+        self.patch('tempest.common.isolated_creds.get_pool',
+                   return_value=pool)
+        iso_creds = isolated_creds.PooledIsolatedCreds(
+            'test class', password='fake_password')
+        self.assertEqual(mock.sentinel.creds, iso_creds.get_primary_creds())
+        self.assertEqual(mock.sentinel.creds, iso_creds.get_primary_creds())
+        pool.get.assert_called_once_with(False, None)
+        self.assertEqual({}, iso_creds.isolated_net_resources)
+
+    @mock.patch('tempest.common.rest_client.RestClient')
+    def test_pooled_creds_not_ready(self, MockRestClient):
+        cfg.CONF.set_default('neutron', False, 'service_available')
+        pool = mock.Mock()
+        pool.get.return_value = None
+        self.patch('tempest.common.isolated_creds.get_pool',
+                   return_value=pool)
+        iso_creds = isolated_creds.PooledIsolatedCreds(
+            'test class', password='fake_password')
+        self._mock_assign_user_role()
+        self._mock_list_roles('1234', 'admin')
+        self._mock_user_create('1234', 'fake_admin_user')
+        self._mock_tenant_create('1234', 'fake_admin_tenant')
+        admin_creds = iso_creds.get_admin_creds()
+        self.assertEqual(admin_creds.username, 'fake_admin_user')
+        pool.get.assert_called_once_with(True, None)
+
+    @mock.patch('tempest.common.rest_client.RestClient')
+    def test_pool_network_failure(self, MockRestClient):
+        self.patch('threading.Thread')
+        self.patch('atexit.register')
+        pool = isolated_creds.CredentialPool(1)
+        self.assertIsNone(pool.get(False))
+        kind = pool._kind(False, None)
+        self._mock_assign_user_role()
+        self._mock_list_role()
+        self._mock_tenant_create('1234', 'fake_prim_tenant')
+        self._mock_user_create('1234', 'fake_prim_user')
+        self.patch('tempest.common.isolated_creds.IsolatedCreds.'
+                   '_create_network_resources',
+                   side_effect=exceptions.ServerFault)
+        self.patch('tempest.common.isolated_creds.IsolatedCreds.'
+                   '_cleanup_default_secgroup')
+        user_mock = self.patch(
+            'tempest.services.identity.json.identity_client.'
+            'IdentityClientJSON.delete_user')
+        tenant_mock = self.patch(
+            'tempest.services.identity.json.identity_client.'
+            'IdentityClientJSON.delete_tenant')
+        self.assertRaises(exceptions.ServerFault, pool._create, kind)
+        # The tenant and the user are not left behind
+        user_mock.assert_called_once_with('1234')
+        tenant_mock.assert_called_once_with('1234')
+        self.assertEqual({}, pool._creators[kind].isolated_creds)
+
+    def _create_primary_and_alt_creds(self, iso_creds):
+        self._mock_assign_user_role()
+        self._mock_list_role()
+        tenant_fix = self._mock_tenant_create('1234', 'fake_prim_tenant')
+        user_fix = self._mock_user_create('1234', 'fake_prim_user')
+        iso_creds.get_primary_creds()
+        tenant_fix.cleanUp()
+        user_fix.cleanUp()
+        self._mock_tenant_create('12345', 'fake_alt_tenant')
+        self._mock_user_create('12345', 'fake_alt_user')
+        iso_creds.get_alt_creds()
+
+    @mock.patch('tempest.common.rest_client.RestClient')
+    def test_cred_cleanup_failure(self, MockRestClient):
+        cfg.CONF.set_default('neutron', False, 'service_available')
+        iso_creds = isolated_creds.IsolatedCreds('test class',
+                                                 password='fake_password')
+        self._create_primary_and_alt_creds(iso_creds)
+
+        def _delete_user(user_id):
+            if user_id == '1234':
+                raise exceptions.ServerFault()
+        self.patch('tempest.services.identity.json.identity_client.'
+                   'IdentityClientJSON.delete_user', side_effect=_delete_user)
+        tenant_mock = self.patch(
+            'tempest.services.identity.json.identity_client.'
+            'IdentityClientJSON.delete_tenant')
+        self.assertRaises(exceptions.ServerFault,
+                          iso_creds.clear_isolated_creds)
+        # The alt credentials are deleted nonetheless
+        tenant_mock.assert_called_once_with('12345')
+
+    @mock.patch('tempest.common.rest_client.RestClient')
+    def test_deferred_cred_cleanup(self, MockRestClient):
+        cfg.CONF.set_default('neutron', False, 'service_available')
+        cfg.CONF.set_override('defer_isolated_creds_cleanup', True, 'auth')
+        reaper = self.patch('tempest.common.isolated_creds._reaper')
+        iso_creds = isolated_creds.IsolatedCreds('test class',
+                                                 password='fake_password')
+        self._create_primary_and_alt_creds(iso_creds)
+        isolated = iso_creds.isolated_creds
+        iso_creds.clear_isolated_creds()
+        reaper.add.assert_called_once_with(iso_creds._clear_credential_sets,
+                                           isolated, {})
+        self.assertEqual(['alt', 'primary'], sorted(isolated))
+        self.assertEqual({}, iso_creds.isolated_creds)
+
+
+class TestReaper(base.TestCase):
+
+    def test_add(self):
+        reaper = isolated_creds.Reaper()
+        done = []
+        self.patch('atexit.register')
+        reaper.add(done.append, 1)
+        reaper.add(mock.Mock(side_effect=Exception))
+        reaper.add(done.append, 2)
+        reaper.wait()
+        self.assertEqual([1, 2], done)
+
+
+class TestCredentialPool(base.TestCase):
+
+    def setUp(self):
+        super(TestCredentialPool, self).setUp()
+        self.thread = self.patch('threading.Thread')
+        self.atexit = self.patch('atexit.register')
+        self.creator = self.patch(
+            'tempest.common.isolated_creds.IsolatedCreds')
+        self.pool = isolated_creds.CredentialPool(2)
+        self.pool.get(False)
+
+    def _fill(self, credential_sets):
+        credential_sets = list(credential_sets)
+
+        def _create(kind):
+            if len(credential_sets) == 1:
+                self.pool._stopped = True
+            return credential_sets.pop(0)
+        self.pool._create = _create
+        self.pool._fill()
+
+    def test_get(self):
+        self.thread.return_value.start.assert_called_once_with()
+        self.atexit.assert_called_once_with(self.pool.close)
+        self._fill([mock.sentinel.set1, mock.sentinel.set2])
+        self.assertEqual(mock.sentinel.set1, self.pool.get(False))
+        self.assertEqual(mock.sentinel.set2, self.pool.get(False))
+        self.assertIsNone(self.pool.get(False))
+        self.assertIsNone(self.pool.get(True))
+        self.assertEqual(1, self.thread.call_count)
+
+    def test_kinds(self):
+        network_resources = {'network': True, 'subnet': False,
+                             'router': False, 'dhcp': False}
+        self.assertIsNone(self.pool.get(False, network_resources))
+        self.creator.assert_called_with('pool',
+                                        network_resources=network_resources)
+        self.assertEqual(2, len(self.pool._creators))
+
+    def test_create_failure(self):
+        def _create(kind):
+            self.pool._stopped = True
+            raise Exception()
+        self.pool._create = _create
+        self.pool._fill()
+        self.assertIsNone(self.pool._next_kind())
+
+    def test_close(self):
+        creds = mock.Mock()
+        self._fill([(creds, None), (creds, mock.sentinel.net)])
+        self.pool.close()
+        creator = self.creator.return_value
+        creator._clear_credential_sets.assert_called_once_with(
+            {0: creds, 1: creds}, {1: mock.sentinel.net})
+        self.assertEqual({}, self.pool._creators)
@@ -15,6 +15,7 @@
 import time
 
 import mock
+from oslotest import mockpatch
 
 from tempest.common import waiters
 from tempest import exceptions
@@ -47,3 +48,70 @@ class TestImageWaiters(base.TestCase):
         self.assertRaises(exceptions.AddImageException,
                           waiters.wait_for_image_status,
                           self.client, 'fake_image_id', 'active')
+
+
+class TestServersWaiters(base.TestCase):
+    def setUp(self):
+        super(TestServersWaiters, self).setUp()
+        self.client = mock.MagicMock()
+        self.client.build_timeout = 1
+        self.client.build_interval = 1
+        self.useFixture(mockpatch.Patch('time.sleep'))
+
+    def _servers(self, *servers):
+        return (None, {'servers': [{'id': server_id, 'status': status}
+                                   for server_id, status in servers]})
+
+    def test_wait_for_servers_status(self):
+        self.client.list_servers_with_detail.side_effect = [
+            self._servers(('1', 'BUILD'), ('2', 'BUILD')),
+            self._servers(('1', 'ACTIVE'), ('2', 'BUILD')),
+            self._servers(('1', 'ACTIVE'), ('2', 'ACTIVE'))]
+        self.client.build_timeout = 10
+        waiters.wait_for_servers_status(self.client, ['1', '2'], 'ACTIVE')
+        # One list call per interval, whatever the number of servers
+        self.assertEqual(3, self.client.list_servers_with_detail.call_count)
+        self.assertFalse(self.client.get_server.called)
+
+    def test_wait_for_servers_status_error(self):
+        self.client.list_servers_with_detail.return_value = self._servers(
+            ('1', 'ACTIVE'), ('2', 'ERROR'))
+        self.assertRaises(exceptions.BuildErrorException,
+                          waiters.wait_for_servers_status,
+                          self.client, ['1', '2'], 'ACTIVE')
+
+    def test_wait_for_servers_status_timeout(self):
+        self.client.build_timeout = 0
+        self.client.list_servers_with_detail.return_value = self._servers(
+            ('1', 'ACTIVE'), ('2', 'BUILD'))
+        exc = self.assertRaises(exceptions.TimeoutException,
+                                waiters.wait_for_servers_status,
+                                self.client, ['1', '2'], 'ACTIVE')
+        self.assertIn('not reached by 2 ', str(exc))
+
+    def test_wait_for_servers_termination(self):
+        self.client.list_servers_with_detail.side_effect = [
+            self._servers(('1', 'ACTIVE'), ('2', 'ACTIVE')),
+            self._servers(('2', 'ACTIVE')),
+            self._servers()]
+        self.client.build_timeout = 10
+        waiters.wait_for_servers_termination(self.client, ['1', '2'])
+        self.assertEqual(3, self.client.list_servers_with_detail.call_count)
+
+    def test_wait_for_servers_termination_error(self):
+        self.client.list_servers_with_detail.return_value = self._servers(
+            ('1', 'ERROR'))
+        self.assertRaises(exceptions.BuildErrorException,
+                          waiters.wait_for_servers_termination,
+                          self.client, ['1'])
+
+    def test_wait_for_servers_termination_error_waits_others(self):
+        self.client.list_servers_with_detail.side_effect = [
+            self._servers(('1', 'ERROR'), ('2', 'ACTIVE')),
+            self._servers(('1', 'ERROR'), ('2', 'ACTIVE')),
+            self._servers(('1', 'ERROR'))]
+        self.client.build_timeout = 10
+        self.assertRaises(exceptions.BuildErrorException,
+                          waiters.wait_for_servers_termination,
+                          self.client, ['1', '2'])
+        self.assertEqual(3, self.client.list_servers_with_detail.call_count)
@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Measure the cost of validating a response against each response schema of
+tempest/api_schema/response, with jsonschema.validate as RestClient used to
+and with the cached validators of tempest.common.schema_validator.
+
+The responses are built from the schemas, with every property set and
+--items items in each list.
+"""
+
+from __future__ import print_function
+
+import argparse
+import pkgutil
+import sys
+import timeit
+
+import jsonschema
+
+from tempest.api_schema import response
+from tempest.common import schema_validator
+from tempest.openstack.common import importutils
+
+
+def get_schemas():
+    """Yields the name and body schema of each response schema."""
+    for _, name, is_pkg in pkgutil.walk_packages(response.__path__,
+                                                 response.__name__ + '.'):
+        if is_pkg:
+            continue
+        module = importutils.import_module(name)
+        for attr, value in sorted(vars(module).items()):
+            if (isinstance(value, dict) and 'status_code' in value and
+                    isinstance(value.get('response_body'), dict)):
+                yield '%s.%s' % (name, attr), value['response_body']
+
+
+def build_instance(schema, items):
+    """Returns an instance of schema, which may not be valid for the
+    keywords it does not handle.
+    """
+    if 'enum' in schema:
+        return schema['enum'][0]
+    for keyword in ('oneOf', 'anyOf'):
+        if keyword in schema:
+            instances = [build_instance(subschema, items)
+                         for subschema in schema[keyword]]
+            valid = [instance for instance in instances
+                     if jsonschema.Draft4Validator(schema).is_valid(instance)]
+            return (valid or instances)[0]
+    schema_type = schema.get('type', 'object')
+    if isinstance(schema_type, list):
+        schema_type = [t for t in schema_type if t != 'null'][0]
+    if schema_type == 'object':
+        return dict((name, build_instance(subschema, items))
+                    for name, subschema in
+                    schema.get('properties', {}).items())
+    if schema_type == 'array':
+        count = max(items, schema.get('minItems', 0))
+        count = min(count, schema.get('maxItems', count))
+        return [build_instance(schema.get('items', {}), items)
+                for _ in range(count)]
+    if schema_type == 'string':
+        return 'value'
+    if schema_type in ('integer', 'number'):
+        return max(schema.get('minimum', 0) + 1, 1)
+    if schema_type == 'boolean':
+        return True
+    return None
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--iterations', type=int, default=200,
+                        help="Number of validations of each response.")
+    parser.add_argument('--items', type=int, default=10,
+                        help="Number of items in the lists of a response.")
+    args = parser.parse_args(argv)
+
+    before = after = 0.0
+    count = 0
+    for name, schema in get_schemas():
+        instance = build_instance(schema, args.items)
+        if not jsonschema.Draft4Validator(schema).is_valid(instance):
+            print("Skipping %s, no valid response built" % name)
+            continue
+        validator = schema_validator.get_validator(schema)
+        before += timeit.timeit(lambda: jsonschema.validate(instance, schema),
+                                number=args.iterations)
+        after += timeit.timeit(lambda: validator.validate(instance),
+                               number=args.iterations)
+        count += 1
+
+    validations = float(count * args.iterations)
+    print("Validated %d response schemas %d times each" %
+          (count, args.iterations))
+    print("jsonschema.validate:  %8.1f us per response" %
+          (before / validations * 1e6))
+    print("cached validators:    %8.1f us per response" %
+          (after / validations * 1e6))
+    print("speedup:              %8.1fx" % (before / after))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])